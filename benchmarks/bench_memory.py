@@ -0,0 +1,54 @@
+"""
+Memory benchmark: bytes per game session, as held by the game server.
+Measures fresh sessions (created and placed in the world) and sessions that have moved
+and played a round, and how many of each fit into 1 GB.
+
+Run from the repository root:  python -m benchmarks.bench_memory [--sessions N]
+"""
+import argparse
+import gc
+import tracemalloc
+
+from modules import classes
+
+GB = 1024 ** 3
+
+
+def new_session(index: int) -> classes.Game:
+    game = classes.Game(f"Player {index}", "story.json", "normal", classes.NullSink(), seed=index)
+    game.create_rooms()
+    return game
+
+
+def played_session(index: int) -> classes.Game:
+    game = new_session(index)
+    game.move_to_room("Slots Room")
+    game.play_current_room_game(5)
+    return game
+
+
+def bytes_per_session(factory, count: int) -> float:
+    # Warm up once so the story, the world template and the interned names are not counted
+    factory(0)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    sessions = [factory(index) for index in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del sessions
+    return (after - before) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes per game session")
+    parser.add_argument("--sessions", type=int, default=10_000)
+    args = parser.parse_args()
+
+    for label, factory in (("new session", new_session), ("after one round", played_session)):
+        size = bytes_per_session(factory, args.sessions)
+        print(f"{label:<16} {size:9,.0f} bytes/session  {GB / size:12,.0f} sessions/GB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark for the shared Story cache.
+Compares building many Game sessions with a cold cache (story re-parsed every time,
+like before the cache existed) against the shared cache, plus room text lookups.
+
+Run from the repository root:  python -m benchmarks.bench_story
+"""
+import time
+
+from modules import classes
+
+SESSIONS = 2000
+LOOKUPS = 200_000
+
+
+def build_sessions(count: int, cold: bool) -> float:
+    started = time.perf_counter()
+    for _ in range(count):
+        if cold:
+            classes.Story._cache.clear()
+        game = classes.Game("Bench", "story.json", "normal", output=classes.NullSink())
+        game.create_rooms()
+    return time.perf_counter() - started
+
+
+def lookups(count: int) -> float:
+    story = classes.Story("story.json")
+    names = list(story.rooms_by_name) + ["Missing Room"]
+    started = time.perf_counter()
+    for index in range(count):
+        story.get_text(names[index % len(names)])
+    return time.perf_counter() - started
+
+
+def main():
+    cold = build_sessions(SESSIONS, cold=True)
+    classes.Story._cache.clear()
+    warm = build_sessions(SESSIONS, cold=False)
+    lookup = lookups(LOOKUPS)
+    print(f"{SESSIONS} sessions, story parsed every time: {cold * 1000:8.1f} ms ({cold / SESSIONS * 1e6:7.1f} us/session)")
+    print(f"{SESSIONS} sessions, shared story cache:      {warm * 1000:8.1f} ms ({warm / SESSIONS * 1e6:7.1f} us/session)")
+    print(f"speed-up: {cold / warm:.1f}x, parsed entries in cache: {len(classes.Story._cache)}")
+    print(f"{LOOKUPS} get_text lookups: {lookup / LOOKUPS * 1e9:.0f} ns/lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+Engine benchmark suite with a tracked JSON baseline.
+
+Run from the repository root:
+    python -m benchmarks.run                          # print results
+    python -m benchmarks.run --save benchmarks/baseline.json
+    python -m benchmarks.run --only poker --only roomgraph --save benchmarks/baseline.json
+    python -m benchmarks.run --compare benchmarks/baseline.json --threshold 0.25
+
+Compare mode compares median times and exits with status 1 if a benchmark got slower than
+the baseline by more than the threshold (0.25 = 25 %) plus its noise floor: NOISE_FLOOR
+times the larger spread of its repeats in either run. Benchmarks faster than GATED_NS are
+microbenchmarks that a busy machine alone moves by more than that, their slowdowns are
+reported but don't fail the comparison. Saving with --only refreshes just the selected entries
+of an existing baseline and keeps the others, so a change re-measures the benchmarks of
+the code it touched. GUI benchmarks only run where customtkinter can open
+a display (e.g. under xvfb-run); elsewhere they are reported as skipped.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from modules import classes, poker
+from modules.history import BetRecord
+
+TARGET_SECONDS = 0.2  # Each timed repeat runs about this long
+REPEATS = 7
+NOISE_FLOOR = 3.0  # Allowed extra slowdown per unit of relative spread of the repeats
+GATED_NS = 1000  # Faster benchmarks never fail a comparison, they are only reported
+
+
+def measure(func: Callable[[], object]) -> dict:
+    """
+    Time func like timeit: calibrate a loop count and repeat. Keeps the fastest repeat,
+    the median one and the noise, the interquartile range of the repeats relative to the median.
+    """
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= TARGET_SECONDS / 10 or loops >= 1 << 24:
+            break
+        loops *= 4
+    loops = max(1, int(loops * (TARGET_SECONDS / max(elapsed, 1e-9))))
+
+    times = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        times.append((time.perf_counter() - started) / loops)
+    median = statistics.median(times)
+    first_quartile, _, third_quartile = statistics.quantiles(times, n=4)
+    return {"ns_per_op": min(times) * 1e9, "median_ns": median * 1e9,
+            "noise": (third_quartile - first_quartile) / median, "loops": loops}
+
+
+def new_game(seed: int = 1) -> classes.Game:
+    game = classes.Game("Bench", "story.json", "normal", classes.NullSink(), seed=seed)
+    game.create_rooms()
+    return game
+
+
+def engine_benchmarks() -> Dict[str, Callable[[], object]]:
+    benchmarks = {}
+
+    player = classes.Player("Bench", starting_money=10 ** 12)
+    rng = random.Random(1)
+    output = classes.NullSink()
+    games = [classes.Slots(), classes.Blackjack(), classes.HorseRace(), classes.Baccarat(), classes.Poker(), classes.Roulette()]
+    choices = {"Horse Race": "Blitz", "Roulette": 17}
+    classes.HorseRace().odds()  # Simulate the horse odds once before timing
+    for game in games:
+        bet = max(game.min_bet, 20)
+        choice = choices.get(game.name)
+        benchmarks[f"play.{game.name}"] = lambda game=game, bet=bet, choice=choice: game.play(player, bet, choice, output, rng)
+
+    hand = random.Random(1).sample(range(52), 7)
+    hands = poker.deal_batch(np.random.default_rng(1), 10_000, 7)
+    poker.tables()  # Load or build the lookup tables before timing
+    benchmarks["poker.evaluate"] = lambda: poker.evaluate(hand)
+    benchmarks["poker.evaluate_batch_10k"] = lambda: poker.evaluate_batch(hands)
+
+    game = new_game()
+    room = game.rooms["Slots Room"]
+    benchmarks["room.get_details"] = room.get_details
+    benchmarks["roomgraph.shortest_path"] = lambda: game.room_graph.shortest_path("Lobby", "VIP Lounge")
+    benchmarks["roomgraph.unlock_plan"] = lambda: game.unlock_plan("VIP Lounge")
+
+    def story_cold_load():
+        classes.Story._cache.clear()
+        return classes.Story("story.json").data
+    benchmarks["story.load_cold"] = story_cold_load
+    benchmarks["story.load_cached"] = lambda: classes.Story("story.json").data
+    story = classes.Story("story.json")
+    benchmarks["story.get_text"] = lambda: story.get_text("Roulette Room")
+
+    def create_rooms():
+        fresh = classes.Game("Bench", "story.json", "normal", classes.NullSink(), seed=1)
+        fresh.create_rooms()
+    benchmarks["game.create_rooms"] = create_rooms
+
+    save_game = new_game()
+    save_game.move_to_room("Slots Room")
+    for _ in range(50):
+        save_game.play_current_room_game(5)
+    save_path = os.path.join(tempfile.mkdtemp(prefix="casino_bench_"), "bench.sav")
+
+    def save_load_round_trip():
+        save_game.save_game(save_path)
+        return classes.Game.load_game(save_path, classes.NullSink())
+    benchmarks["game.save_load_round_trip"] = save_load_round_trip
+    return benchmarks
+
+
+def gui_benchmarks() -> Optional[Dict[str, Callable[[], object]]]:
+    """
+    Benchmarks of the CasinoGUI refresh paths, or None if no display is available.
+    """
+    try:
+        from modules import gui
+        app = gui.CasinoGUI()
+    except Exception as e:  # No customtkinter, no tkinter or no display
+        print(f"Skipping GUI benchmarks: {e}", file=sys.stderr)
+        return None
+    app.withdraw()
+    app.game = new_game()
+    app.player = app.game.player
+    app.create_layout()
+    app.update_room_list()
+
+    rooms = [app.game.rooms["Lobby"], app.game.rooms["Slots Room"]]
+    state = {"index": 0}
+
+    def room_switch():
+        state["index"] ^= 1
+        app.game.current_room = rooms[state["index"]]
+        app.update_room_list()
+        app.update_idletasks()
+
+    def bet_history_append():
+        app.update_bet_history(BetRecord("Slots", 5, 10, 45))
+        app.update_idletasks()
+
+    return {
+        "gui.update_room_list_unchanged": app.update_room_list,
+        "gui.update_room_list_room_switch": room_switch,
+        "gui.update_bet_history": bet_history_append,
+    }
+
+
+def run(only: Optional[List[str]] = None, gui: bool = True) -> dict:
+    benchmarks = engine_benchmarks()
+    if gui:
+        benchmarks.update(gui_benchmarks() or {})
+    results = {}
+    for name, func in benchmarks.items():
+        if only and not any(part in name for part in only):
+            continue
+        results[name] = measure(func)
+        print(f"{name:<36} {results[name]['ns_per_op'] / 1000:12.2f} us/op", file=sys.stderr)
+    return {
+        "meta": {
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def merge_baseline(path: str, results: dict) -> dict:
+    """
+    Put fresh results into the baseline stored at path, keeping the benchmarks that weren't run.
+    The metadata always describes the latest measurement.
+    """
+    if not os.path.exists(path):
+        return results
+    with open(path, "r", encoding="utf-8") as baseline_file:
+        merged = json.load(baseline_file)
+    merged["meta"] = results["meta"]
+    merged["results"].update(results["results"])
+    return merged
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """
+    Return the benchmarks whose median got slower than the baseline by more than threshold
+    plus their noise floor. Microbenchmarks (faster than GATED_NS) are reported only.
+    Baselines saved before medians were kept are compared by their fastest repeat.
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if not base:
+            continue
+        before, after = base.get("median_ns", base["ns_per_op"]), result.get("median_ns", result["ns_per_op"])
+        ratio = after / before
+        allowed = threshold + NOISE_FLOOR * max(base.get("noise", 0.0), result.get("noise", 0.0))
+        if ratio <= 1 + allowed:
+            status = "ok"
+        elif min(before, after) < GATED_NS:
+            status = "slower (microbenchmark, not gated)"
+        else:
+            status = "REGRESSION"
+        print(f"{name:<36} {before / 1000:10.2f} -> {after / 1000:10.2f} us/op  {ratio:6.2f}x  "
+              f"(allowed {1 + allowed:.2f}x)  {status}")
+        if status == "REGRESSION":
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Golden Casino Requiem engine benchmarks")
+    parser.add_argument("--save", help="Write the results as a JSON baseline to this file")
+    parser.add_argument("--compare", help="Compare against a JSON baseline and fail on regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown before a regression is flagged")
+    parser.add_argument("--only", action="append",
+                        help="Only run benchmarks whose name contains this text, can be given several times")
+    parser.add_argument("--no-gui", action="store_true", help="Skip the GUI benchmarks")
+    args = parser.parse_args()
+
+    results = run(args.only, gui=not args.no_gui)
+    if args.save:
+        saved = merge_baseline(args.save, results) if args.only else results
+        with open(args.save, "w", encoding="utf-8") as baseline_file:
+            json.dump(saved, baseline_file, indent=2)
+            baseline_file.write("\n")
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+            raise SystemExit(1)
+    if not args.save and not args.compare:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import hashlib
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Tuple
+
+import customtkinter as ctk
+from PIL import Image
+
+from modules import paths
+
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "images")
+CACHE_DIR = os.path.join(paths.CACHE_DIR, "images")
+
+log = logging.getLogger(__name__)
+
+START_IMAGE = "Start_Image.png"
+START_IMAGE_SIZE = (1100, 500)
+
+# Picture shown next to the controls of each casino game
+GAME_IMAGES = {
+    "Slots": "slotreels.jpeg",
+    "Blackjack": "blackjack_table.jpeg",
+    "Horse Race": "horserace.jpeg",
+    "Baccarat": "baccarat.jpeg",
+    "Poker": "poker.jpeg",
+    "Roulette": "roulette.jpeg",
+}
+GAME_IMAGE_SIZE = (300, 170)
+
+
+class AssetCache:
+    """
+    Image pipeline for the GUI.
+    Images are decoded and resized on background threads, and every resized variant is kept
+    in an on-disk cache keyed by a hash of the source file and the target size, so later
+    starts only decode the small cached file.
+    """
+
+    def __init__(self, image_dir: str = IMAGE_DIR, cache_dir: str = CACHE_DIR, workers: int = 2):
+        self.image_dir = image_dir
+        self.cache_dir = cache_dir
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="assets")
+        self._loaded: Dict[Tuple[str, Tuple[int, int]], Future] = {}
+        self._lock = threading.Lock()
+
+    def load(self, file_name: str, size: Tuple[int, int]) -> Future:
+        """
+        Start loading an image at the given size in the background.
+        Returns a Future of the resized PIL image, repeated calls share the same Future.
+        """
+        key = (file_name, tuple(size))
+        with self._lock:
+            if key not in self._loaded:
+                self._loaded[key] = self._executor.submit(self._load, file_name, tuple(size))
+            return self._loaded[key]
+
+    def preload(self, file_names, size: Tuple[int, int]):
+        """
+        Queue several images so they are ready before the GUI needs them.
+        """
+        for file_name in file_names:
+            self.load(file_name, size)
+
+    def request(self, widget, file_name: str, size: Tuple[int, int], on_ready: Callable[[ctk.CTkImage], None], poll_ms: int = 20):
+        """
+        Load an image in the background and hand a ready-made CTkImage to on_ready
+        on the Tk main thread. The future is polled with widget.after, Tk widgets are
+        never touched from the worker threads.
+        """
+        future = self.load(file_name, size)
+
+        def deliver():
+            if not future.done():
+                widget.after(poll_ms, deliver)
+                return
+            try:
+                image = future.result()
+            except Exception:  # A missing or broken image must not break the GUI
+                log.exception("Could not load image %s", file_name)
+                return
+            on_ready(ctk.CTkImage(light_image=image, dark_image=image, size=size))
+
+        deliver()
+
+    def _load(self, file_name: str, size: Tuple[int, int]) -> Image.Image:
+        source_path = os.path.join(self.image_dir, file_name)
+        with open(source_path, "rb") as source_file:
+            digest = hashlib.sha1(source_file.read()).hexdigest()
+        cached_path = os.path.join(self.cache_dir, f"{digest}_{size[0]}x{size[1]}.png")
+
+        if os.path.exists(cached_path):
+            try:
+                with Image.open(cached_path) as cached:
+                    return cached.convert("RGBA")
+            except OSError:
+                pass  # Broken cache entry, recreate it below
+
+        with Image.open(source_path) as source:
+            image = source.convert("RGBA").resize(size, Image.Resampling.LANCZOS)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f"{cached_path}.{threading.get_ident()}.tmp"
+            image.save(temp_path, "PNG")
+            os.replace(temp_path, cached_path)  # Atomic, a crash never leaves half a file behind
+        except OSError as e:
+            log.warning("Could not cache image %s: %s", file_name, e)
+        return image
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
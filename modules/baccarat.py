@@ -0,0 +1,241 @@
+"""
+Punto banco baccarat engine.
+Eight decks, the shoe is reshuffled once fewer than CUT_CARDS cards are left. Both hands
+follow the fixed drawing rules: the player draws on 0-5, the banker's third card depends
+on the banker's total and the player's third card and is looked up in BANKER_DRAWS.
+Bets on the player pay 1:1, bets on the banker 1:1 less 5 % commission and ties 8:1;
+player and banker bets are refunded on a tie.
+
+Cards are ranks 1-13 (ace to king), their baccarat value is VALUES[rank]. Whole shoes can
+be dealt at once with NumPy, see resolve_shoes().
+
+Run from the repository root to print the house edge of each bet:  python -m modules.baccarat
+"""
+import argparse
+import weakref
+from typing import List, NamedTuple, Tuple
+
+import numpy as np
+
+DECKS = 8
+CUT_CARDS = 16  # Cards left behind the cut card, a coup never needs more than six
+CARD_NAMES = ("", "A", "2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K")
+VALUES = (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 0, 0, 0, 0)
+ONE_DECK = list(range(1, 14)) * 4
+
+PLAYER, BANKER, TIE = "player", "banker", "tie"
+BETS = (PLAYER, BANKER, TIE)
+COMMISSION = 0.05
+# Coins returned per coin staked when the bet wins, stake included
+PAYOUTS = {PLAYER: 2, BANKER: 2 - COMMISSION, TIE: 9}
+
+NO_THIRD_CARD = 10  # Column of BANKER_DRAWS used when the player stood on two cards
+
+
+def _banker_draws(banker_total: int, player_third: int) -> bool:
+    if player_third == NO_THIRD_CARD:
+        return banker_total <= 5
+    if banker_total <= 2:
+        return True
+    if banker_total == 3:
+        return player_third != 8
+    if banker_total == 4:
+        return 2 <= player_third <= 7
+    if banker_total == 5:
+        return 4 <= player_third <= 7
+    if banker_total == 6:
+        return 6 <= player_third <= 7
+    return False
+
+
+# BANKER_DRAWS[banker total][value of the player's third card, or NO_THIRD_CARD]
+BANKER_DRAWS = np.array([[_banker_draws(total, third) for third in range(11)] for total in range(10)], dtype=bool)
+_BANKER_DRAWS = tuple(tuple(bool(draws) for draws in row) for row in BANKER_DRAWS)  # For single coups
+
+
+class Shoe:
+    """
+    An eight-deck shoe dealt from one random stream.
+    The cut card is checked between coups, a coup never runs out of cards.
+    """
+    __slots__ = ("rng", "decks", "cards", "shuffles")
+
+    def __init__(self, rng, decks: int = DECKS):
+        self.rng = rng
+        self.decks = decks
+        self.cards: List[int] = []
+        self.shuffles = 0
+
+    def shuffle(self):
+        self.cards = ONE_DECK * self.decks
+        self.rng.shuffle(self.cards)
+        self.shuffles += 1
+
+    def start_coup(self):
+        if len(self.cards) < CUT_CARDS:
+            self.shuffle()
+
+    def draw(self) -> int:
+        return self.cards.pop()
+
+
+_shoes = weakref.WeakKeyDictionary()
+
+
+def shoe_for(rng) -> Shoe:
+    """
+    The shoe dealt from a random stream, one per session like the blackjack shoe.
+    """
+    shoe = _shoes.get(rng)
+    if shoe is None:
+        shoe = _shoes[rng] = Shoe(rng)
+    return shoe
+
+
+class Coup(NamedTuple):
+    player: List[int]
+    banker: List[int]
+
+    @property
+    def player_total(self) -> int:
+        return sum(VALUES[card] for card in self.player) % 10
+
+    @property
+    def banker_total(self) -> int:
+        return sum(VALUES[card] for card in self.banker) % 10
+
+    @property
+    def winner(self) -> str:
+        player, banker = self.player_total, self.banker_total
+        return PLAYER if player > banker else BANKER if banker > player else TIE
+
+    @property
+    def natural(self) -> bool:
+        return len(self.player) == len(self.banker) == 2 and max(self.player_total, self.banker_total) >= 8
+
+    def returned(self, bet_on: str, bet: int) -> int:
+        """Coins paid back for a bet, stake included, commission rounded in the house's favour."""
+        winner = self.winner
+        if winner == bet_on:
+            return bet * 2 if bet_on == PLAYER else bet + bet * 19 // 20 if bet_on == BANKER else bet * 9
+        if winner == TIE:
+            return bet  # Player and banker bets push on a tie
+        return 0
+
+
+def play_coup(shoe: Shoe) -> Coup:
+    """
+    Deal one coup: player, banker, player, banker, then the third cards by the tableau.
+    """
+    shoe.start_coup()
+    draw = shoe.draw
+    player = [draw()]
+    banker = [draw()]
+    player.append(draw())
+    banker.append(draw())
+    player_total = (VALUES[player[0]] + VALUES[player[1]]) % 10
+    banker_total = (VALUES[banker[0]] + VALUES[banker[1]]) % 10
+    if player_total >= 8 or banker_total >= 8:  # A natural, nobody draws
+        return Coup(player, banker)
+
+    player_third = NO_THIRD_CARD
+    if player_total <= 5:
+        player.append(draw())
+        player_third = VALUES[player[2]]
+    if _BANKER_DRAWS[banker_total][player_third]:
+        banker.append(draw())
+    return Coup(player, banker)
+
+
+def describe_cards(cards) -> str:
+    return f"{' '.join(CARD_NAMES[card] for card in cards)} ({sum(VALUES[card] for card in cards) % 10})"
+
+
+def resolve_coups(cards: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Resolve many coups at once.
+    :param cards: Values of the next six cards of the shoe for every coup, shape (coups, 6),
+                  dealt player, banker, player, banker, then the third cards as needed.
+    :return: Player totals, banker totals and the number of cards each coup used.
+    """
+    player = (cards[:, 0] + cards[:, 2]) % 10
+    banker = (cards[:, 1] + cards[:, 3]) % 10
+    natural = (player >= 8) | (banker >= 8)
+    player_draws = ~natural & (player <= 5)
+    # The player's third card is the fifth card of the coup, the banker's is the next one
+    player_third = np.where(player_draws, cards[:, 4], NO_THIRD_CARD)
+    banker_draws = ~natural & BANKER_DRAWS[banker, player_third]
+    banker_third = np.where(player_draws, cards[:, 5], cards[:, 4])
+
+    player_total = np.where(player_draws, (player + cards[:, 4]) % 10, player)
+    banker_total = np.where(banker_draws, (banker + banker_third) % 10, banker)
+    used = 4 + player_draws + banker_draws
+    return player_total, banker_total, used
+
+
+def resolve_shoes(rng: np.random.Generator, shoes: int, decks: int = DECKS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Shuffle and deal out whole shoes at once, coup by coup until the cut card.
+    Each step resolves the next coup of every shoe with resolve_coups(), so a shoe of
+    about 80 coups takes 80 vectorized steps however many shoes are dealt side by side.
+    :return: Player and banker totals of all dealt coups.
+    """
+    deck = np.array([VALUES[rank] for rank in ONE_DECK] * decks, dtype=np.int8)
+    values = rng.permuted(np.tile(deck, (shoes, 1)), axis=1)
+
+    rows = np.arange(shoes)
+    position = np.zeros(shoes, dtype=np.intp)
+    offsets = np.arange(6)
+    last_start = deck.size - CUT_CARDS
+    players, bankers = [], []
+    while rows.size:
+        player_total, banker_total, used = resolve_coups(values[rows[:, None], position[:, None] + offsets])
+        players.append(player_total)
+        bankers.append(banker_total)
+        position += used
+        dealing = position <= last_start
+        rows, position = rows[dealing], position[dealing]
+    return np.concatenate(players), np.concatenate(bankers)
+
+
+def simulate_coups(rounds: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Player and banker totals of rounds coups, dealt from as many fresh shoes as needed.
+    """
+    shoes = rounds // 75 + 1  # About 79 coups fit into an eight-deck shoe
+    players, bankers = [], []
+    dealt = 0
+    while dealt < rounds:
+        player, banker = resolve_shoes(rng, shoes)
+        players.append(player)
+        bankers.append(banker)
+        dealt += player.size
+    return np.concatenate(players)[:rounds], np.concatenate(bankers)[:rounds]
+
+
+def bet_returns(bet_on: str, player_totals: np.ndarray, banker_totals: np.ndarray) -> np.ndarray:
+    """
+    Coins returned per coin staked on a bet for every coup, stake included.
+    """
+    ties = player_totals == banker_totals
+    if bet_on == TIE:
+        return np.where(ties, PAYOUTS[TIE], 0.0)
+    wins = player_totals > banker_totals if bet_on == PLAYER else banker_totals > player_totals
+    return np.where(wins, PAYOUTS[bet_on], np.where(ties, 1.0, 0.0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="House edge of the punto banco bets")
+    parser.add_argument("--rounds", type=int, default=10_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    player, banker = simulate_coups(args.rounds, np.random.default_rng(args.seed))
+    print(f"{args.rounds:,} coups: player {np.mean(player > banker):.2%}, banker {np.mean(banker > player):.2%}, "
+          f"tie {np.mean(player == banker):.2%}")
+    for bet_on in BETS:
+        print(f"{bet_on:<8} house edge {1 - bet_returns(bet_on, player, banker).mean():7.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import random
+import unittest
+
+import numpy as np
+
+from modules import baccarat
+from modules.baccarat import BANKER, PLAYER, TIE
+
+
+def stacked(*values: int) -> baccarat.Shoe:
+    """
+    A shoe that deals cards of the given values in order (player, banker, player, banker, third cards).
+    """
+    shoe = baccarat.Shoe(random.Random(0))
+    shoe.cards = [13] * baccarat.CUT_CARDS + [value or 10 for value in reversed(values)]
+    return shoe
+
+
+class TableauTest(unittest.TestCase):
+    def test_naturals_stand(self):
+        coup = baccarat.play_coup(stacked(4, 1, 4, 1, 9, 9))
+        self.assertEqual((coup.player_total, coup.banker_total, coup.natural), (8, 2, True))
+        self.assertEqual(coup.winner, PLAYER)
+
+    def test_player_stands_on_six(self):
+        # The banker draws on 0-5 when the player stood
+        coup = baccarat.play_coup(stacked(3, 2, 3, 3, 1))
+        self.assertEqual((len(coup.player), len(coup.banker)), (2, 3))
+        coup = baccarat.play_coup(stacked(3, 3, 3, 3, 1))
+        self.assertEqual((len(coup.player), len(coup.banker)), (2, 2))
+
+    def test_banker_rules(self):
+        # (banker total, player's third card) -> whether the banker draws
+        cases = {(2, 8): True, (3, 8): False, (3, 9): True, (4, 1): False, (4, 2): True, (4, 8): False,
+                 (5, 3): False, (5, 4): True, (5, 7): True, (6, 5): False, (6, 6): True, (6, 8): False, (7, 6): False}
+        for (banker_total, third), draws in cases.items():
+            coup = baccarat.play_coup(stacked(0, 0, 1, banker_total, third, 5))
+            self.assertEqual(len(coup.banker) == 3, draws, (banker_total, third))
+
+    def test_scalar_and_vectorized_agree(self):
+        rng = np.random.default_rng(1)
+        values = rng.integers(0, 10, size=(20_000, 6))
+        player_totals, banker_totals, used = baccarat.resolve_coups(values)
+        for row, player_total, banker_total, count in zip(values.tolist(), player_totals, banker_totals, used):
+            coup = baccarat.play_coup(stacked(*row))
+            self.assertEqual((coup.player_total, coup.banker_total, len(coup.player) + len(coup.banker)),
+                             (player_total, banker_total, count), row)
+
+
+class ReturnsTest(unittest.TestCase):
+    def test_commission_and_pushes(self):
+        banker_win = baccarat.Coup([10, 2], [10, 7])
+        self.assertEqual(banker_win.returned(BANKER, 20), 39)
+        self.assertEqual(banker_win.returned(BANKER, 10), 19)  # Half a coin of commission rounds up
+        self.assertEqual(banker_win.returned(PLAYER, 10), 0)
+        tie = baccarat.Coup([10, 5], [3, 2])
+        self.assertEqual(tie.returned(PLAYER, 10), 10)
+        self.assertEqual(tie.returned(TIE, 10), 90)
+
+
+class FrequencyTest(unittest.TestCase):
+    def test_outcome_frequencies(self):
+        # Eight decks: banker 45.86 %, player 44.62 %, tie 9.52 %
+        player, banker = baccarat.simulate_coups(1_000_000, np.random.default_rng(1))
+        self.assertAlmostEqual(np.mean(banker > player), 0.4586, delta=0.003)
+        self.assertAlmostEqual(np.mean(player > banker), 0.4462, delta=0.003)
+        self.assertAlmostEqual(np.mean(player == banker), 0.0952, delta=0.002)
+
+    def test_house_edges(self):
+        player, banker = baccarat.simulate_coups(1_000_000, np.random.default_rng(2))
+        edges = {bet: 1 - baccarat.bet_returns(bet, player, banker).mean() for bet in baccarat.BETS}
+        self.assertAlmostEqual(edges[BANKER], 0.0106, delta=0.003)
+        self.assertAlmostEqual(edges[PLAYER], 0.0124, delta=0.003)
+        self.assertAlmostEqual(edges[TIE], 0.1436, delta=0.02)
+
+
+if __name__ == "__main__":
+    unittest.main()
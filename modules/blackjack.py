@@ -0,0 +1,321 @@
+"""
+Card-shoe blackjack engine.
+Six decks, a cut card at 75 % penetration (the shoe is reshuffled before the next round once
+it is reached), dealer stands on soft 17 and peeks for blackjack, blackjack pays 3:2,
+double on any two cards and after a split, splits up to four hands, split aces get one card.
+
+Hands are not lists of cards to re-add but a single state number, hard total * 2 + "holds
+an ace", advanced by a precomputed table. Hand totals, softness and the basic strategy
+are table lookups as well, so a whole round is a few dozen indexing operations.
+Cards are their blackjack values: 1 is an ace and 10 stands for every ten and face card.
+"""
+import random
+import weakref
+from typing import Callable, List, NamedTuple, Optional
+
+DECKS = 6
+PENETRATION = 0.75
+MAX_HANDS = 4
+DEALER_STANDS_ON = 17  # Including soft 17
+
+CARD_NAMES = ("", "A", "2", "3", "4", "5", "6", "7", "8", "9", "10")
+ONE_DECK = [1, 2, 3, 4, 5, 6, 7, 8, 9] * 4 + [10] * 16
+
+# Hand states: hard total (aces counted as 1) * 2 + 1 if the hand holds an ace
+STATES = 32 * 2
+EMPTY = 0
+
+
+def _total(state: int) -> int:
+    hard, ace = state >> 1, state & 1
+    return hard + 10 if ace and hard + 10 <= 21 else hard
+
+
+TOTAL = tuple(_total(state) for state in range(STATES))
+SOFT = tuple(bool(state & 1) and (state >> 1) + 10 <= 21 for state in range(STATES))
+# ADD[state * 11 + card] is the state after drawing card; busted hands never draw again
+ADD = tuple(min((state >> 1) + card, 31) * 2 | (state & 1) | (card == 1) if card else state
+            for state in range(STATES) for card in range(11))
+
+# Basic strategy for six decks, S17, double after split, no surrender.
+# Actions: H hit, S stand, D double (else hit), Ds double (else stand), columns are the
+# dealer's up card 2-10 and ace
+HIT, STAND, DOUBLE, DOUBLE_STAND, SPLIT = range(5)
+_ACTIONS = {"H": HIT, "S": STAND, "D": DOUBLE, "Ds": DOUBLE_STAND}
+_HARD = {
+    9:  "H  D  D  D  D  H  H  H  H  H",
+    10: "D  D  D  D  D  D  D  D  H  H",
+    11: "D  D  D  D  D  D  D  D  D  H",
+    12: "H  H  S  S  S  H  H  H  H  H",
+    13: "S  S  S  S  S  H  H  H  H  H",
+    14: "S  S  S  S  S  H  H  H  H  H",
+    15: "S  S  S  S  S  H  H  H  H  H",
+    16: "S  S  S  S  S  H  H  H  H  H",
+}
+_SOFT = {
+    13: "H  H  H  D  D  H  H  H  H  H",
+    14: "H  H  H  D  D  H  H  H  H  H",
+    15: "H  H  D  D  D  H  H  H  H  H",
+    16: "H  H  D  D  D  H  H  H  H  H",
+    17: "H  D  D  D  D  H  H  H  H  H",
+    18: "S  Ds Ds Ds Ds S  S  H  H  H",
+}
+_PAIRS = {  # Y split, anything else is played by its total
+    1:  "Y  Y  Y  Y  Y  Y  Y  Y  Y  Y",
+    2:  "Y  Y  Y  Y  Y  Y  N  N  N  N",
+    3:  "Y  Y  Y  Y  Y  Y  N  N  N  N",
+    4:  "N  N  N  Y  Y  N  N  N  N  N",
+    6:  "Y  Y  Y  Y  Y  N  N  N  N  N",
+    7:  "Y  Y  Y  Y  Y  Y  N  N  N  N",
+    8:  "Y  Y  Y  Y  Y  Y  Y  Y  Y  Y",
+    9:  "Y  Y  Y  Y  Y  N  Y  Y  N  N",
+}
+
+
+def _row(table: dict, total: int, default: str) -> List[str]:
+    row = table.get(total)
+    return row.split() if row else [default] * 10
+
+
+def _strategy_action(state: int, up: int) -> int:
+    total = TOTAL[state]
+    column = 9 if up == 1 else up - 2
+    if SOFT[state]:
+        row = _row(_SOFT, total, "H" if total < 18 else "S")
+    else:
+        row = _row(_HARD, total, "H" if total < 12 else "S")
+    return _ACTIONS[row[column]]
+
+
+# STRATEGY[state * 11 + up] and SPLITS[card * 11 + up]
+STRATEGY = tuple(_strategy_action(state, up) if up else STAND for state in range(STATES) for up in range(11))
+SPLITS = tuple(bool(up) and _row(_PAIRS, card, "N")[9 if up == 1 else up - 2] == "Y"
+               for card in range(11) for up in range(11))
+
+ACTION_NAMES = ("hit", "stand", "double", "double", "split")
+
+
+def hand_state(cards) -> int:
+    state = EMPTY
+    for card in cards:
+        state = ADD[state * 11 + card]
+    return state
+
+
+def hand_total(cards) -> int:
+    return TOTAL[hand_state(cards)]
+
+
+def basic_strategy(cards, up: int, can_double: bool = True, can_split: bool = True) -> str:
+    """
+    The basic strategy decision for a hand against the dealer's up card:
+    "hit", "stand", "double" or "split".
+    """
+    if can_split and len(cards) == 2 and cards[0] == cards[1] and SPLITS[cards[0] * 11 + up]:
+        return "split"
+    action = STRATEGY[hand_state(cards) * 11 + up]
+    if action == DOUBLE_STAND and not (can_double and len(cards) == 2):
+        return "stand"
+    if action == DOUBLE and not (can_double and len(cards) == 2):
+        return "hit"
+    return ACTION_NAMES[action]
+
+
+class Shoe:
+    """
+    A multi-deck shoe dealt from one random stream.
+    The cut card is checked between rounds, a round never runs out of cards.
+    """
+    __slots__ = ("rng", "decks", "cut", "cards", "shuffles")
+
+    def __init__(self, rng, decks: int = DECKS, penetration: float = PENETRATION):
+        self.rng = rng
+        self.decks = decks
+        # Cards left in the shoe when the cut card comes out
+        self.cut = int(decks * 52 * (1 - penetration))
+        self.cards: List[int] = []
+        self.shuffles = 0
+
+    def shuffle(self):
+        self.cards = ONE_DECK * self.decks
+        self.rng.shuffle(self.cards)
+        self.shuffles += 1
+
+    def start_round(self):
+        if len(self.cards) <= self.cut:
+            self.shuffle()
+
+    def draw(self) -> int:
+        return self.cards.pop()
+
+
+_shoes = weakref.WeakKeyDictionary()
+
+
+def shoe_for(rng) -> Shoe:
+    """
+    The shoe dealt from a random stream. Each session draws blackjack from its own stream,
+    so every session gets its own shoe without the (shared) game object holding any state.
+    """
+    shoe = _shoes.get(rng)
+    if shoe is None:
+        shoe = _shoes[rng] = Shoe(rng)
+    return shoe
+
+
+LOSS, PUSH, WIN, BLACKJACK = range(4)
+
+
+class Hand(NamedTuple):
+    cards: List[int]
+    stake: int  # 1, or 2 after doubling
+    outcome: int
+
+
+class Round(NamedTuple):
+    hands: List[Hand]
+    dealer: List[int]
+
+    @property
+    def natural(self) -> bool:
+        return self.hands[0].outcome == BLACKJACK
+
+    @property
+    def staked(self) -> int:
+        """Bets staked in total, counting doubles and splits."""
+        return sum(hand.stake for hand in self.hands)
+
+    def returned(self, bet: int) -> int:
+        """Coins paid back to the player, stakes included."""
+        coins = 0
+        for hand in self.hands:
+            if hand.outcome == BLACKJACK:
+                coins += bet + bet * 3 // 2
+            elif hand.outcome == WIN:
+                coins += 2 * hand.stake * bet
+            elif hand.outcome == PUSH:
+                coins += hand.stake * bet
+        return coins
+
+    @property
+    def multiplier(self) -> float:
+        """Net result in bets plus the initial stake, what simulate() calls the payout multiplier."""
+        returned = 0.0
+        for hand in self.hands:
+            if hand.outcome == BLACKJACK:
+                returned += 2.5
+            elif hand.outcome == WIN:
+                returned += 2 * hand.stake
+            elif hand.outcome == PUSH:
+                returned += hand.stake
+        return returned - self.staked + 1
+
+
+Decision = Callable[[tuple, int, bool, bool], str]
+
+
+def play_round(shoe: Shoe, budget: int = MAX_HANDS * 2, decide: Optional[Decision] = None) -> Round:
+    """
+    Deal and resolve one round.
+    :param budget: Bets the player can stake in total, doubles and splits are only made while it lasts.
+    :param decide: Player decisions as decide(cards, up card, can double, can split) -> action name,
+                   the basic strategy tables are used if omitted.
+    """
+    shoe.start_round()
+    draw = shoe.draw
+    first, up, second, hole = draw(), draw(), draw(), draw()
+    dealer = [up, hole]
+    dealer_state = ADD[ADD[up] * 11 + hole]
+    dealer_natural = TOTAL[dealer_state] == 21
+    player_natural = TOTAL[ADD[ADD[first] * 11 + second]] == 21
+
+    if player_natural or dealer_natural:
+        # The dealer peeks, so a dealer blackjack only ever takes the initial bet
+        outcome = PUSH if player_natural and dealer_natural else BLACKJACK if player_natural else LOSS
+        return Round([Hand([first, second], 1, outcome)], dealer)
+
+    staked = 1
+    aces_split = False  # Split aces get one card each and can't be split again
+    pending = [[first, second]]
+    finished = []  # (cards, stake, state)
+    while pending:
+        cards = pending.pop(0)
+        stake = 1
+        if len(cards) == 1:  # Second card of a split hand
+            cards.append(draw())
+        state = ADD[ADD[cards[0]] * 11 + cards[1]]
+
+        while not aces_split and TOTAL[state] < 21:
+            can_double = len(cards) == 2 and staked < budget
+            can_split = (len(cards) == 2 and cards[0] == cards[1] and staked < budget
+                         and len(finished) + len(pending) + 1 < MAX_HANDS)
+            if decide is None:
+                if can_split and SPLITS[cards[0] * 11 + up]:
+                    action = SPLIT
+                else:
+                    action = STRATEGY[state * 11 + up]
+                    if action == DOUBLE and not can_double:
+                        action = HIT
+                    elif action == DOUBLE_STAND and not can_double:
+                        action = STAND
+            else:
+                decision = decide(tuple(cards), up, can_double, can_split)
+                if decision not in ACTION_NAMES:
+                    raise ValueError(f"Unknown decision {decision!r}, choose one of hit, stand, double or split.")
+                action = ACTION_NAMES.index(decision)
+                if (action == DOUBLE and not can_double) or (action == SPLIT and not can_split):
+                    raise ValueError(f"Decision {ACTION_NAMES[action]!r} is not allowed for this hand.")
+
+            if action == SPLIT:
+                staked += 1
+                pending.insert(0, [cards[1]])
+                cards = [cards[0], draw()]
+                state = ADD[ADD[cards[0]] * 11 + cards[1]]
+                aces_split = cards[0] == 1
+            elif action == STAND:
+                break
+            elif action == HIT:
+                cards.append(draw())
+                state = ADD[state * 11 + cards[-1]]
+            else:  # Double: one more card and stand
+                staked += 1
+                stake = 2
+                cards.append(draw())
+                state = ADD[state * 11 + cards[-1]]
+                break
+        finished.append((cards, stake, state))
+
+    if any(TOTAL[state] <= 21 for _, _, state in finished):
+        while TOTAL[dealer_state] < DEALER_STANDS_ON:
+            dealer.append(draw())
+            dealer_state = ADD[dealer_state * 11 + dealer[-1]]
+    dealer_total = TOTAL[dealer_state]
+
+    hands = []
+    for cards, stake, state in finished:
+        total = TOTAL[state]
+        if total > 21:
+            outcome = LOSS
+        elif dealer_total > 21 or total > dealer_total:
+            outcome = WIN
+        elif total == dealer_total:
+            outcome = PUSH
+        else:
+            outcome = LOSS
+        hands.append(Hand(cards, stake, outcome))
+    return Round(hands, dealer)
+
+
+def describe_cards(cards) -> str:
+    return f"{' '.join(CARD_NAMES[card] for card in cards)} ({hand_total(cards)})"
+
+
+def simulate_rounds(rounds: int, seed: int):
+    """
+    Play rounds with basic strategy on one fresh shoe.
+    Yields the payout multiplier of each round and whether it was a natural blackjack.
+    """
+    shoe = Shoe(random.Random(seed))
+    for _ in range(rounds):
+        result = play_round(shoe)
+        yield result.multiplier, result.natural
@@ -0,0 +1,123 @@
+import random
+import unittest
+
+from modules import blackjack, classes
+from modules.blackjack import BLACKJACK, LOSS, PUSH, WIN
+
+
+def stacked(*cards: int) -> blackjack.Shoe:
+    """
+    A shoe that deals the given cards in order (player, up card, player, hole card, then hits).
+    """
+    shoe = blackjack.Shoe(random.Random(0))
+    shoe.cut = 0
+    shoe.cards = list(reversed(cards))
+    return shoe
+
+
+class HandTotalTest(unittest.TestCase):
+    def test_totals(self):
+        self.assertEqual(blackjack.hand_total([10, 7]), 17)
+        self.assertEqual(blackjack.hand_total([1, 6]), 17)  # Soft 17
+        self.assertEqual(blackjack.hand_total([1, 6, 10]), 17)  # The ace counts one again
+        self.assertEqual(blackjack.hand_total([1, 1, 9]), 21)
+        self.assertEqual(blackjack.hand_total([10, 10, 5]), 25)
+
+
+class BasicStrategyTest(unittest.TestCase):
+    def test_hard_totals(self):
+        self.assertEqual(blackjack.basic_strategy([10, 6], 10), "hit")
+        self.assertEqual(blackjack.basic_strategy([10, 6], 6), "stand")
+        self.assertEqual(blackjack.basic_strategy([10, 2], 2), "hit")
+        self.assertEqual(blackjack.basic_strategy([10, 2], 4), "stand")
+        self.assertEqual(blackjack.basic_strategy([6, 5], 10), "double")
+        self.assertEqual(blackjack.basic_strategy([6, 5], 1), "hit")
+        self.assertEqual(blackjack.basic_strategy([5, 4], 2), "hit")
+        self.assertEqual(blackjack.basic_strategy([5, 4], 3), "double")
+        self.assertEqual(blackjack.basic_strategy([10, 7], 1), "stand")
+
+    def test_soft_totals(self):
+        self.assertEqual(blackjack.basic_strategy([1, 7], 2), "stand")
+        self.assertEqual(blackjack.basic_strategy([1, 7], 3), "double")
+        self.assertEqual(blackjack.basic_strategy([1, 7], 9), "hit")
+        self.assertEqual(blackjack.basic_strategy([1, 6], 3), "double")
+        self.assertEqual(blackjack.basic_strategy([1, 2], 5), "double")
+        self.assertEqual(blackjack.basic_strategy([1, 8], 6), "stand")
+
+    def test_doubles_fall_back_without_two_cards(self):
+        self.assertEqual(blackjack.basic_strategy([3, 3, 5], 6), "hit")
+        self.assertEqual(blackjack.basic_strategy([1, 3, 4], 4), "stand")
+        self.assertEqual(blackjack.basic_strategy([6, 5], 6, can_double=False), "hit")
+
+    def test_pairs(self):
+        self.assertEqual(blackjack.basic_strategy([8, 8], 10), "split")
+        self.assertEqual(blackjack.basic_strategy([1, 1], 1), "split")
+        self.assertEqual(blackjack.basic_strategy([10, 10], 6), "stand")
+        self.assertEqual(blackjack.basic_strategy([5, 5], 6), "double")
+        self.assertEqual(blackjack.basic_strategy([9, 9], 7), "stand")
+        self.assertEqual(blackjack.basic_strategy([9, 9], 8), "split")
+        self.assertEqual(blackjack.basic_strategy([4, 4], 5), "split")
+        self.assertEqual(blackjack.basic_strategy([8, 8], 10, can_split=False), "hit")
+
+
+class PlayRoundTest(unittest.TestCase):
+    def test_natural_pays_three_to_two(self):
+        result = blackjack.play_round(stacked(1, 9, 10, 8))
+        self.assertTrue(result.natural)
+        self.assertEqual(result.hands[0].outcome, BLACKJACK)
+        self.assertEqual(result.returned(10), 25)
+
+    def test_dealer_natural_takes_only_initial_bet(self):
+        result = blackjack.play_round(stacked(10, 1, 6, 10))
+        self.assertEqual([hand.outcome for hand in result.hands], [LOSS])
+        self.assertEqual(result.staked, 1)
+
+    def test_both_naturals_push(self):
+        result = blackjack.play_round(stacked(1, 1, 10, 10))
+        self.assertEqual(result.hands[0].outcome, PUSH)
+
+    def test_double_gets_one_card(self):
+        # 6 + 5 against a 6 doubles, draws a 10, dealer 6 + 10 draws a 10 and busts
+        result = blackjack.play_round(stacked(6, 6, 5, 10, 10, 10))
+        self.assertEqual(result.hands, [blackjack.Hand([6, 5, 10], 2, WIN)])
+        self.assertEqual(result.returned(10), 40)
+
+    def test_split_eights(self):
+        # 8 8 against a 10 splits: the first hand draws a 10 and stands, the second draws a 3
+        # and doubles 11 (double after split) into 20, the dealer stands on 20
+        result = blackjack.play_round(stacked(8, 10, 8, 10, 10, 3, 9))
+        self.assertEqual(result.hands, [blackjack.Hand([8, 10], 1, LOSS), blackjack.Hand([8, 3, 9], 2, PUSH)])
+        self.assertEqual(result.staked, 3)
+        self.assertEqual(result.returned(10), 20)
+
+    def test_custom_decisions_are_checked(self):
+        with self.assertRaises(ValueError):
+            blackjack.play_round(stacked(10, 6, 7, 10), decide=lambda cards, up, can_double, can_split: "split")
+
+    def test_unknown_decision_is_refused(self):
+        with self.assertRaises(ValueError):
+            blackjack.play_round(stacked(10, 6, 7, 10), decide=lambda cards, up, can_double, can_split: "bogus")
+
+    def test_basic_strategy_edge(self):
+        # Six decks, S17, DAS, 3:2: the house edge of basic strategy is about half a percent
+        rounds = 200_000
+        total = sum(multiplier for multiplier, _ in blackjack.simulate_rounds(rounds, seed=1))
+        self.assertAlmostEqual(total / rounds, 0.995, delta=0.01)
+
+
+class BlackjackGameTest(unittest.TestCase):
+    def test_refused_decision_takes_no_money(self):
+        player = classes.Player("Test", starting_money=100)
+        message = classes.Blackjack.shared().play(player, 10, lambda *args: "bogus", classes.NullSink(), random.Random(1))
+        self.assertTrue(message.startswith("Invalid decision."))
+        self.assertEqual(player.money, 100)
+
+    def test_doubles_are_charged(self):
+        player = classes.Player("Test", starting_money=100)
+        classes.Blackjack.shared().play(player, 10, lambda cards, up, can_double, can_split:
+                                        "double" if can_double else "stand", classes.NullSink(), random.Random(1))
+        self.assertIn(player.money, (80, 90, 100, 115, 120))  # Doubled, or a natural on either side
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,331 @@
+"""
+Autoplay bots that drive classes.Game headlessly at full speed.
+A Strategy decides where to go, which rooms to unlock and how much to bet; run_bot plays
+many seeded sessions with it and reports throughput, how often it goes bankrupt or gets
+stuck, and how many rounds it takes to reach the story's win target.
+"""
+import argparse
+import functools
+import statistics
+import time
+from typing import Callable, Dict, List, Optional
+
+from modules import classes
+from modules.history import BetHistory, BetRecord
+from modules.odds import default_choice, odds_for
+
+STORY_FILE = "story.json"
+
+
+@functools.lru_cache(maxsize=None)
+def estimate_returns(game_type: type) -> tuple:
+    """
+    Mean and variance of the payout per coin staked for a game type, see modules/odds.py.
+    They are exact for games that can be enumerated and simulated estimates otherwise.
+    """
+    odds = odds_for(game_type)
+    return odds.rtp, odds.variance
+
+
+class Strategy:
+    """
+    Decides what a bot does before each round.
+    Subclasses implement next_bet and may override choose_room, choice and observe.
+    """
+    name = "strategy"
+    uses_odds = False  # Whether the strategy looks up odds_for(), which samples simulated games first
+
+    def reset(self, game: classes.Game):
+        """
+        Called once before a session starts.
+        """
+
+    def choose_room(self, game: classes.Game) -> Optional[str]:
+        """
+        Return the room to play the next round in. The bot walks there through exits along
+        game.unlock_plan(), paying for locked rooms on the way, see walk_to().
+        By default the bot stays where it is, or goes to the first unlocked room with a game.
+        """
+        if game.current_room and game.current_room.game:
+            return game.current_room.name
+        for name, room in game.rooms.items():
+            if not room.locked and room.game:
+                return name
+        return None
+
+    def next_bet(self, game: classes.Game) -> int:
+        raise NotImplementedError("This method has to be implemented in a subclass.")
+
+    def choice(self, game: classes.Game):
+        return default_choice(game.current_room.game)
+
+    def observe(self, record: BetRecord):
+        """
+        Called after every played round.
+        """
+
+
+class FlatBet(Strategy):
+    """
+    Always bets the same amount (at least the table minimum).
+    """
+    name = "flat"
+
+    def __init__(self, amount: int = 10):
+        self.amount = amount
+
+    def next_bet(self, game: classes.Game) -> int:
+        return max(self.amount, game.current_room.game.min_bet)
+
+
+class Martingale(Strategy):
+    """
+    Doubles the bet after every loss and goes back to the base bet after a win.
+    """
+    name = "martingale"
+
+    def __init__(self, base: int = 5):
+        self.base = base
+        self.bet = base
+
+    def reset(self, game: classes.Game):
+        self.bet = self.base
+
+    def next_bet(self, game: classes.Game) -> int:
+        return max(self.bet, game.current_room.game.min_bet)
+
+    def observe(self, record: BetRecord):
+        self.bet = self.base if record.payout > record.bet else record.bet * 2
+
+
+class Kelly(Strategy):
+    """
+    Bets a fraction of the bankroll sized by the Kelly criterion, using the
+    edge and variance of the current game (small-edge approximation edge / variance).
+    Games without a player edge get the table minimum.
+    """
+    name = "kelly"
+    uses_odds = True
+
+    def __init__(self, fraction: float = 0.5, cap: float = 0.25):
+        """
+        :param fraction: Share of the full Kelly bet to place (half Kelly by default).
+        :param cap: Never bet more than this share of the bankroll.
+        """
+        self.fraction = fraction
+        self.cap = cap
+
+    def next_bet(self, game: classes.Game) -> int:
+        casino_game = game.current_room.game
+        rtp, variance = estimate_returns(type(casino_game))
+        edge = rtp - 1
+        if edge <= 0 or variance <= 0:
+            return casino_game.min_bet
+        share = min(self.cap, self.fraction * edge / variance)
+        return max(casino_game.min_bet, int(game.player.money * share))
+
+
+class UnlockGreedy(Strategy):
+    """
+    Plays the game with the best estimated return among the rooms it can reach, unlocking
+    the rooms on the cheapest route as soon as it can pay for them and still keep a reserve
+    for betting. Rooms without a game are never a goal. Bets are placed by an inner
+    strategy, flat bets by default.
+    """
+    name = "unlock-greedy"
+    uses_odds = True
+
+    def __init__(self, inner: Optional[Strategy] = None, reserve: int = 50):
+        self.inner = inner or FlatBet()
+        self.reserve = reserve
+        self.goals: Dict[tuple, List[tuple]] = {}  # (room, locked rooms) -> (unlock cost, room) by return
+
+    def reset(self, game: classes.Game):
+        self.inner.reset(game)
+
+    def _goals(self, game: classes.Game) -> List[tuple]:
+        goals = []
+        for name, room in game.rooms.items():
+            plan = game.unlock_plan(name) if room.game else None
+            if plan is not None:
+                goals.append((-estimate_returns(type(room.game))[0], plan.cost, name))
+        return [(cost, name) for _, cost, name in sorted(goals)]
+
+    def choose_room(self, game: classes.Game) -> Optional[str]:
+        key = (game.current_room.name, game.world_state.locked)
+        goals = self.goals.get(key)
+        if goals is None:
+            goals = self.goals[key] = self._goals(game)
+        budget = game.player.money - self.reserve
+        for cost, name in goals:
+            if not cost or cost <= budget:
+                return name
+        return None
+
+    def next_bet(self, game: classes.Game) -> int:
+        return self.inner.next_bet(game)
+
+    def observe(self, record: BetRecord):
+        self.inner.observe(record)
+
+
+STRATEGIES: Dict[str, Callable[[], Strategy]] = {
+    "flat": FlatBet,
+    "martingale": Martingale,
+    "kelly": Kelly,
+    "unlock-greedy": UnlockGreedy,
+}
+
+
+class BotReport:
+    """
+    Aggregated outcome of many bot sessions with one strategy.
+    """
+    def __init__(self, strategy: str, sessions: int):
+        self.strategy = strategy
+        self.sessions = sessions
+        self.rounds = 0
+        self.seconds = 0.0
+        self.bankruptcies = 0
+        self.stuck = 0
+        self.rounds_to_target: List[int] = []
+        self.final_money: List[int] = []
+
+    @property
+    def rounds_per_second(self) -> float:
+        return self.rounds / self.seconds if self.seconds else 0.0
+
+    @property
+    def bankruptcy_rate(self) -> float:
+        return self.bankruptcies / self.sessions
+
+    @property
+    def stuck_rate(self) -> float:
+        return self.stuck / self.sessions
+
+    @property
+    def target_rate(self) -> float:
+        return len(self.rounds_to_target) / self.sessions
+
+    def summary(self) -> dict:
+        return {
+            "strategy": self.strategy,
+            "sessions": self.sessions,
+            "rounds": self.rounds,
+            "rounds_per_second": self.rounds_per_second,
+            "bankruptcy_rate": self.bankruptcy_rate,
+            "stuck_rate": self.stuck_rate,
+            "target_rate": self.target_rate,
+            "median_rounds_to_target": statistics.median(self.rounds_to_target) if self.rounds_to_target else None,
+            "median_final_money": statistics.median(self.final_money) if self.final_money else None,
+        }
+
+
+def new_session(seed: int, mode: str = "normal") -> classes.Game:
+    """
+    A headless game for bots: no narration, a minimal in-memory history.
+    """
+    game = classes.Game("Bot", STORY_FILE, mode, classes.NullSink(), BetHistory(capacity=1), seed=seed)
+    game.create_rooms()
+    return game
+
+
+def walk_to(game: classes.Game, room_name: str) -> bool:
+    """
+    Walk through exits to a room along its cheapest unlock plan, unlocking the rooms on the way.
+    Returns whether the player arrived; nothing happens if the plan can't be paid for.
+    """
+    plan = game.unlock_plan(room_name)
+    if plan is None or plan.cost > game.player.money:
+        return False
+    for name in plan.path[1:]:
+        direction = next(direction for direction, room in game.current_room.exits.items() if room.name == name)
+        game.move_player(direction, unlock=True)
+    return game.current_room.name == room_name
+
+
+def play_session(strategy: Strategy, game: classes.Game, max_rounds: int) -> dict:
+    """
+    Let a strategy play one session until it reaches the win target, goes bankrupt, gets
+    stuck or hits max_rounds. Returns the rounds played and how the session ended.
+    Like the console game, a session is bankrupt once the money is gone and easy mode rescues
+    it instead. A session that still has coins but can't bet in the room its strategy picks
+    (no game there, a minimum bet above the money) is stuck.
+    """
+    win_target = game.story.data["game"].get("win_target", 5000)
+    strategy.reset(game)
+    rounds = 0
+    outcome = "max_rounds"
+    while rounds < max_rounds:
+        if game.player.money >= win_target:
+            outcome = "target"
+            break
+        if game.player.money <= 0:
+            if game.mode == "easy":
+                game.give_bonus(50)  # Same rescue as the console game
+                continue
+            outcome = "bankrupt"
+            break
+        room_name = strategy.choose_room(game)
+        if room_name and game.current_room.name != room_name:
+            walk_to(game, room_name)
+        casino_game = game.current_room.game if game.current_room else None
+        if not casino_game or game.player.money < casino_game.min_bet:
+            outcome = "stuck"
+            break
+
+        bet = min(strategy.next_bet(game), game.player.money)
+        recorded = game.bet_history.total
+        game.play_current_room_game(bet, strategy.choice(game))
+        rounds += 1
+        if game.bet_history.total > recorded:
+            strategy.observe(game.bet_history.recent(1)[0])
+    return {"rounds": rounds, "outcome": outcome, "money": game.player.money,
+            "unlocked": sum(1 for room in game.rooms.values() if not room.locked)}
+
+
+def run_bot(strategy_factory: Callable[[], Strategy], sessions: int = 100, max_rounds: int = 10_000,
+            seed: int = 0, mode: str = "normal") -> BotReport:
+    """
+    Play many seeded sessions with a strategy and aggregate the results.
+    The strategy is reset before every session. Session i uses seed + i, so runs are reproducible.
+    """
+    strategy = strategy_factory()
+    report = BotReport(strategy.name, sessions)
+    for index in range(sessions):
+        game = new_session(seed + index, mode)
+        started = time.perf_counter()
+        result = play_session(strategy, game, max_rounds)
+        report.seconds += time.perf_counter() - started
+        report.rounds += result["rounds"]
+        report.final_money.append(result["money"])
+        if result["outcome"] == "bankrupt":
+            report.bankruptcies += 1
+        elif result["outcome"] == "stuck":
+            report.stuck += 1
+        elif result["outcome"] == "target":
+            report.rounds_to_target.append(result["rounds"])
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run autoplay strategy bots against the casino engine")
+    parser.add_argument("--strategy", choices=["all"] + list(STRATEGIES), default="all")
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--max-rounds", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mode", choices=["normal", "easy"], default="normal")
+    args = parser.parse_args()
+
+    names = list(STRATEGIES) if args.strategy == "all" else [args.strategy]
+    print(f"{'strategy':<14} {'rounds/s':>10} {'bankrupt':>9} {'stuck':>7} {'target':>7} {'median rounds to target':>24}")
+    for name in names:
+        report = run_bot(STRATEGIES[name], args.sessions, args.max_rounds, args.seed, args.mode)
+        summary = report.summary()
+        to_target = summary["median_rounds_to_target"]
+        print(f"{name:<14} {summary['rounds_per_second']:>10,.0f} {summary['bankruptcy_rate']:>9.1%} "
+              f"{summary['stuck_rate']:>7.1%} {summary['target_rate']:>7.1%} {to_target if to_target is not None else '-':>24}")
+
+
+if __name__ == "__main__":
+    main()
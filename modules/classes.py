@@ -1,9 +1,19 @@
-import pickle
+import functools
 import json
 import os
 import time
 import random
-from typing import List, Dict
+import sys
+import threading
+from concurrent.futures import Future
+from types import MappingProxyType
+from collections.abc import Mapping as MappingABC
+from typing import Iterator, List, Dict, Mapping, Optional, Tuple
+
+import numpy as np
+
+from modules import baccarat, blackjack, horserace, metrics, poker, roomgraph, roulette
+from modules.history import BetHistory, BetRecord
 
 
 
@@ -15,26 +25,134 @@ class Slowprint:
             time.sleep(delay)
         print()  # Newline after the entire text
 
+class OutputSink:
+    """
+    Receives all narration of the game engine.
+    Subclasses decide where the text goes, the engine itself never prints.
+    """
+    def write(self, text: str):
+        raise NotImplementedError("This method has to be implemented in a subclass.")
+
+class ConsoleSink(OutputSink):
+    """
+    Prints narration to the console with the classic typing effect.
+    A delay of 0 prints every text instantly.
+    """
+    def __init__(self, delay: float = 0.0005):
+        self.delay = delay
+
+    def write(self, text: str):
+        if self.delay > 0:
+            Slowprint.slow_print(text, self.delay)
+        else:
+            print(text, flush=True)
+
+class BufferSink(OutputSink):
+    """
+    Collects narration in memory so a front end (GUI, server) can show it later.
+    """
+    def __init__(self):
+        self.lines: List[str] = []
+
+    def write(self, text: str):
+        self.lines.append(text)
+
+    def drain(self) -> str:
+        """
+        Return everything written since the last drain and clear the buffer.
+        """
+        text = "\n".join(self.lines)
+        self.lines.clear()
+        return text
+
+class NullSink(OutputSink):
+    """
+    Discards all narration, for batch and headless use.
+    """
+    def write(self, text: str):
+        pass
+
+# Used whenever no sink is passed in explicitly
+default_output = ConsoleSink()
+
+def _freeze(value):
+    """
+    Turn parsed JSON into read-only views (dicts become mappingproxies, lists become tuples)
+    so one parsed story can be shared safely by every Game in the process.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
 class Story:
+    """
+    Read-only access to a story file.
+    The file is parsed lazily, once per process, and shared by all Story objects of the same
+    path through a cache keyed by path and modification time. Rooms are indexed by name.
+    """
+    __slots__ = ("file_path", "_entry")
+    _cache: Dict[str, Tuple[int, Mapping, Mapping]] = {}
+    _cache_lock = threading.Lock()
+
     def __init__(self, file_name: str):
-        current_dir = os.path.dirname(__file__)
-        file_path = os.path.join(current_dir, file_name)
-        self.data = self.load_data(file_path)
+        self.file_path = self.path_for(file_name)
+        self._entry: Optional[Tuple[Mapping, Mapping]] = None
+
+    @property
+    def data(self) -> Mapping:
+        if self._entry is None:
+            self._entry = self.cached(self.file_path)
+        return self._entry[0]
+
+    @property
+    def rooms_by_name(self) -> Mapping:
+        if self._entry is None:
+            self._entry = self.cached(self.file_path)
+        return self._entry[1]
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def path_for(file_name: str) -> str:
+        """
+        Absolute path of a story file, one shared string per file name.
+        """
+        return os.path.join(os.path.dirname(__file__), file_name)
+
+    @classmethod
+    def cached(cls, file_path: str) -> Tuple[Mapping, Mapping]:
+        """
+        Return the frozen story data and its room index, parsing the file only if it is
+        not cached yet or has changed on disk since it was parsed.
+        """
+        mtime = os.stat(file_path).st_mtime_ns
+        entry = cls._cache.get(file_path)
+        if entry is None or entry[0] != mtime:
+            with cls._cache_lock:
+                entry = cls._cache.get(file_path)
+                if entry is None or entry[0] != mtime:
+                    data = _freeze(cls.load_data(file_path))
+                    rooms_by_name = MappingProxyType({room["name"]: room for room in data["rooms"]})
+                    entry = (mtime, data, rooms_by_name)
+                    cls._cache[file_path] = entry
+        return entry[1], entry[2]
 
-    def load_data(self, file_path: str) -> dict:
+    @staticmethod
+    def load_data(file_path: str) -> dict:
         with open(file_path, 'r', encoding='utf-8') as file:
             return json.load(file)
 
     def get_text(self, scene: str) -> str:
-        for item in self.data["rooms"]:
-            if item["name"] == scene:
-                return item["description"]
-        return ""
+        room = self.rooms_by_name.get(scene)
+        return room["description"] if room else ""
 
     def get_disclaimer(self) -> str:
         return self.data["game"].get("disclaimer", "")
 
 class Character:
+    __slots__ = ("_name",)
+
     def __init__(self, name: str):
         self._name = name
 
@@ -42,6 +160,8 @@ class Character:
         return self._name
 
 class Player(Character):
+    __slots__ = ("_money", "jackpot_wins")
+
     def __init__(self, name: str, starting_money: int = 40):
         super().__init__(name)
         self._money = starting_money
@@ -74,6 +194,8 @@ class Player(Character):
         self.jackpot_wins += 1
 
 class Room:
+    __slots__ = ("name", "description", "locked", "unlock_cost", "exits", "characters", "game")
+
     def __init__(self, name: str, description: str, locked: bool = False, unlock_cost: int = 0):
         self.name = name
         self.description = description
@@ -104,34 +226,173 @@ class Room:
             details += f"\nYou can play: {self.game.name}"
         return details
 
-    def display_details(self):
-        Slowprint.slow_print(self.get_details())
+    def display_details(self, output: Optional[OutputSink] = None):
+        (output or default_output).write(self.get_details())
+
+class SimulationResult:
+    """
+    Outcome of a batch simulation: the gross payout of every simulated round
+    (stake included, 0 for a lost round) plus summary statistics.
+    """
+    def __init__(self, game_name: str, bet: int, payouts: np.ndarray, jackpots: np.ndarray):
+        self.game_name = game_name
+        self.bet = bet
+        self.payouts = payouts
+        self.jackpots = jackpots
+
+    @property
+    def rounds(self) -> int:
+        return int(self.payouts.size)
+
+    @property
+    def total_staked(self) -> int:
+        return self.rounds * self.bet
+
+    @property
+    def total_returned(self) -> int:
+        return int(self.payouts.sum())
+
+    @property
+    def rtp(self) -> float:
+        """Return to player: coins paid out per coin staked."""
+        return self.total_returned / self.total_staked
+
+    @property
+    def variance(self) -> float:
+        """Variance of the payout per coin staked."""
+        return float(np.var(self.payouts / self.bet))
+
+    @property
+    def win_rate(self) -> float:
+        """Share of rounds that paid out more than the stake."""
+        return float(np.count_nonzero(self.payouts > self.bet)) / self.rounds
+
+    @property
+    def jackpot_frequency(self) -> float:
+        """Share of rounds that would have counted as a jackpot win."""
+        return float(np.count_nonzero(self.jackpots)) / self.rounds
+
+    def summary(self) -> dict:
+        return {
+            "game": self.game_name,
+            "rounds": self.rounds,
+            "bet": self.bet,
+            "rtp": self.rtp,
+            "variance": self.variance,
+            "win_rate": self.win_rate,
+            "jackpot_frequency": self.jackpot_frequency,
+        }
 
 class CasinoGame:
+    """
+    Base class of the casino games. Games keep no state between rounds (the player, the
+    output sink and the random stream are passed to every call), so one shared instance
+    per game type serves every room and session, see shared().
+    """
+    __slots__ = ("name",)
+    min_bet = 1
+    no_money_message = "You don't have enough coins to play."
+    # Games that need a decision from the player (horse, number) set a prompt for console front ends
+    choice_prompt: Optional[str] = None
+    # Rounds resolved per NumPy batch in simulate(), keeps memory flat for huge runs
+    simulation_chunk = 1_000_000
+
     def __init__(self, name: str):
-        self.name = name
+        self.name = sys.intern(name)
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def shared(cls, min_bet: Optional[int] = None) -> 'CasinoGame':
+        """
+        Return the shared instance of this game type.
+        A table with a different minimum bet gets its own shared variant class.
+        """
+        if min_bet is not None and min_bet != cls.min_bet:
+            cls = type(cls.__name__, (cls,), {"__slots__": (), "min_bet": min_bet})
+        return cls()
 
-    def play(self, player: Player, bet: int) -> str:
+    def play(self, player: Player, bet: int, choice=None, output: Optional[OutputSink] = None, rng=None) -> str:
         """
         Play the game with the specified bet.
         This method must be implemented in subclasses.
+        :param choice: The player's decision for games that need one (e.g. the horse to back).
+        :param output: Sink for the narration of the round, defaults to the console.
+        :param rng: A random.Random stream to draw from, defaults to the global random module.
+        """
+        raise NotImplementedError("This method has to be implemented in a subclass.")
+
+    def check_bet(self, player: Player, bet: int, choice=None) -> str:
+        """
+        Return an error message if the bet (and choice) can't be placed, an empty string otherwise.
+        A round whose check passes always takes the stake.
+        """
+        if bet < self.min_bet:
+            return f"The minimum bet for {self.name} is {self.min_bet} coins."
+        if player.money < bet:
+            return self.no_money_message
+        return ""
+
+    def ready(self) -> bool:
+        """
+        Whether a round can be played without waiting. A game that prepares something in the
+        background first (the horse race odds) starts that here and reports False until it is
+        done, so front ends can hold the round back instead of blocking in play().
+        """
+        return True
+
+    def simulate(self, rounds: int, bet: int, rng=None) -> SimulationResult:
+        """
+        Resolve many rounds at once with NumPy, following the same rules as play().
+        No Player is involved, every round is played with the same bet.
+        :param rounds: Number of rounds to simulate.
+        :param bet: The bet placed on every round.
+        :param rng: A numpy Generator or a seed, a fresh generator is used if omitted.
+        """
+        if rounds <= 0:
+            raise ValueError("Number of rounds must be positive.")
+        if bet < self.min_bet:
+            raise ValueError(f"The minimum bet for {self.name} is {self.min_bet} coins.")
+        rng = np.random.default_rng(rng)
+
+        payouts, jackpots = [], []
+        for start in range(0, rounds, self.simulation_chunk):
+            size = min(self.simulation_chunk, rounds - start)
+            multipliers, chunk_jackpots = self._simulate_multipliers(size, rng)
+            if multipliers.dtype.kind == "f":  # Fractional odds (3:2) pay whole coins, rounded down like play()
+                # The epsilon keeps odds like 3.88 (not exact in binary) from rounding down a whole coin
+                payouts.append(np.floor(multipliers * bet + 1e-9).astype(np.int64))
+            else:
+                payouts.append(multipliers.astype(np.int64) * bet)
+            jackpots.append(chunk_jackpots)
+        return SimulationResult(self.name, bet, np.concatenate(payouts), np.concatenate(jackpots))
+
+    def _simulate_multipliers(self, rounds: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the payout multiplier of every round and a mask of the rounds
+        that count as a jackpot win. Implemented in subclasses.
+        Games with extra stakes (doubles, splits) return the net result in bets plus one,
+        the same payout per initial stake that play() records.
         """
         raise NotImplementedError("This method has to be implemented in a subclass.")
 
 class Slots(CasinoGame):
+    __slots__ = ()
+    min_bet = 2
+    no_money_message = "You don't have enough coins to spin the reels."
+
+    reel_symbols = ("🍒", "🍋", "🔔", "⭐", "7️⃣")
+
     def __init__(self):
         super().__init__("Slots")
-        self.reel_symbols = ["🍒", "🍋", "🔔", "⭐", "7️⃣"]
 
-    def play(self, player: Player, bet: int) -> str:
-        min_bet = 2
-        if bet < min_bet:
-            return f"The minimum bet for Slots is {min_bet} coins."
-        if player.money < bet:
-            return "You don't have enough coins to spin the reels."
+    def play(self, player: Player, bet: int, choice=None, output: Optional[OutputSink] = None, rng=None) -> str:
+        error = self.check_bet(player, bet, choice)
+        if error:
+            return error
 
         player.deduct_money(bet)
-        result = [random.choice(self.reel_symbols) for _ in range(5)]
+        rng = rng or random
+        result = [rng.choice(self.reel_symbols) for _ in range(5)]
         reels_display = " | ".join(result)
 
         # Check for at least two matching symbols
@@ -150,295 +411,787 @@ class Slots(CasinoGame):
             return f"The reels are spinning... {reels_display}\n\nYou win! Two symbols matched. You win {winnings} coins!"
         else:  # No matching symbols
             return f"The reels are spinning... {reels_display}\n\nTough luck! Try again - maybe it will work next time."
+
+    def _simulate_multipliers(self, rounds: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        reels = rng.integers(0, len(self.reel_symbols), size=(rounds, 5), dtype=np.int8)
+        reels.sort(axis=1)
+        distinct = 1 + np.count_nonzero(np.diff(reels, axis=1), axis=1)
+        # Same branch order as play(), the first matching condition wins
+        conditions = [distinct <= 3, distinct == 1, distinct == 2]
+        multipliers = np.select(conditions, [2, 10, 5], 0).astype(np.int8)
+        jackpots = np.select(conditions, [False, True, False], False)
+        return multipliers, jackpots
 # Blackjack Game
 class Blackjack(CasinoGame):
+    """
+    Six-deck shoe blackjack, see modules/blackjack.py for the table rules.
+    The hand is played with basic strategy unless a decision function is passed as the
+    choice. Doubles and splits stake further bets as long as the player can afford them.
+    """
+    __slots__ = ()
+    min_bet = 5
+    no_money_message = "You don't have enough coins to play Blackjack."
+    outcome_names = {blackjack.LOSS: "lost", blackjack.PUSH: "push", blackjack.WIN: "won", blackjack.BLACKJACK: "blackjack"}
+
     def __init__(self):
         super().__init__("Blackjack")
 
-    def play(self, player: Player, bet: int) -> str:
-        min_bet = 5
-        if bet < min_bet:
-            return f"The minimum bet for Blackjack is {min_bet} coins."
-        if player.money < bet:
-            return "You don't have enough coins to play Blackjack."
-
-        player.deduct_money(bet)
-        player_score = random.randint(16, 21)
-        dealer_score = random.randint(16, 21)
-        Slowprint.slow_print(f"\nYour score: {player_score}, dealer's score: {dealer_score}")
-
-        if player_score > dealer_score and player_score <= 21:
-            winnings = bet * 2
-            player.add_money(winnings)
+    def play(self, player: Player, bet: int, choice=None, output: Optional[OutputSink] = None, rng=None) -> str:
+        """
+        :param choice: Optional decision function decide(cards, up card, can double, can split) -> action.
+                       Only for direct calls, Game.play_current_room_game() refuses functions.
+        :param rng: The random stream, each stream deals from its own shoe.
+        """
+        error = self.check_bet(player, bet, choice)
+        if error:
+            return error
+
+        budget = player.money // bet
+        try:  # The round is dealt before any money moves, a refused decision costs nothing
+            result = blackjack.play_round(blackjack.shoe_for(rng or random), budget, choice if callable(choice) else None)
+        except ValueError as e:
+            return f"Invalid decision. {e}"
+        player.deduct_money(result.staked * bet)
+        output = output or default_output
+        returned = result.returned(bet)
+        if returned:
+            player.add_money(returned)
+
+        output.write(f"\nDealer: {blackjack.describe_cards(result.dealer)}")
+        for number, hand in enumerate(result.hands, start=1):
+            label = f"Hand {number}" if len(result.hands) > 1 else "Your hand"
+            doubled = ", doubled" if hand.stake > 1 else ""
+            output.write(f"\n{label}: {blackjack.describe_cards(hand.cards)}{doubled} - {self.outcome_names[hand.outcome]}")
+
+        net = returned - result.staked * bet
+        if result.natural:
             player.increment_jackpot_wins()
-            return f"\nBlackjack! You beat the dealer and win {winnings} coins."
-        elif player_score == dealer_score:
-            player.add_money(bet)  
+            return f"\nBlackjack! You win {net} coins."
+        if net > 0:
+            return f"\nYou beat the dealer and win {net} coins."
+        if net == 0:
             return "\nDraw! Your stake will be refunded."
-        return "\nOh no! The dealer won. Try again."
+        return f"\nOh no! The dealer won. You lose {-net} coins."
+
+    def _simulate_multipliers(self, rounds: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        # Rounds depend on the cards left in the shoe, so they are played one after another
+        multipliers = np.empty(rounds, dtype=np.float32)
+        jackpots = np.empty(rounds, dtype=bool)
+        for index, (multiplier, natural) in enumerate(blackjack.simulate_rounds(rounds, int(rng.integers(2 ** 63)))):
+            multipliers[index] = multiplier
+            jackpots[index] = natural
+        return multipliers, jackpots
 
 # Horse Race Game
 class HorseRace(CasinoGame):
+    """
+    A simulated race of the horses in field, see modules/horserace.py for the race model.
+    A winning bet pays the odds of its horse, which are computed once per field.
+    """
+    __slots__ = ()
+    min_bet = 8
+    no_money_message = "You don't have enough coins to take part in the horse races."
+    field = horserace.FIELD
+    horses = tuple(horse.name for horse in field)
+    choice_prompt = f"Available horses: {', '.join(horses)}\nChoose your horse: "
+
     def __init__(self):
         super().__init__("Horse Race")
 
-    def play(self, player: Player, bet: int) -> str:
-        min_bet = 8
-        if bet < min_bet:
-            return f"The minimum bet for Horse Race is {min_bet} coins."
-        if player.money < bet:
-            return "You don't have enough coins to take part in the horse races."
+    def odds(self) -> horserace.FieldOdds:
+        """
+        The odds of the field, simulated on first use (about a second) and then memoized.
+        Front ends wait for ready() first, so a round never computes them itself.
+        """
+        return horserace.odds_for_field(self.field)
 
-        player.deduct_money(bet)
-        horses = ["Blitz", "Donner", "Wind", "Sturm"]
-        print(f"Available horses: {', '.join(horses)}")
-        player_choice = input("Choose your horse: ").strip()
+    def request_odds(self) -> Future:
+        """
+        The odds of the field computed in the background, for front ends that must not block.
+        """
+        return horserace.request_odds(self.field)
 
-        if player_choice not in horses:
-            return "Invalid horse selection. Please try again."
+    def ready(self) -> bool:
+        return self.request_odds().done()
 
-        winning_horse = random.choice(horses)
-        Slowprint.slow_print(f"\nThe horses are running! You chose {player_choice}.")
-        Slowprint.slow_print(f"\nThe winning horse is: {winning_horse}")
+    def check_bet(self, player: Player, bet: int, choice=None) -> str:
+        error = super().check_bet(player, bet, choice)
+        if not error and str(choice or "").strip() not in self.horses:
+            return f"Invalid horse selection. Please choose one of: {', '.join(self.horses)}."
+        return error
 
-        if player_choice == winning_horse:
-            winnings = bet * 3
+    def play(self, player: Player, bet: int, choice=None, output: Optional[OutputSink] = None, rng=None,
+             on_tick=None) -> str:
+        """
+        :param choice: Name of the horse the player backs.
+        :param on_tick: Called with the tick and the distance every horse has run after each
+                        second of the race, e.g. to animate it.
+        """
+        error = self.check_bet(player, bet, choice)
+        if error:
+            return error
+        player_choice = str(choice).strip()
+        index = self.horses.index(player_choice)
+        odds = self.odds()
+
+        player.deduct_money(bet)
+        output = output or default_output
+        # The race itself runs on NumPy, seeded from the session's stream so replays match
+        race_rng = np.random.default_rng((rng or random).getrandbits(64))
+        race = horserace.run_race(self.field, race_rng, on_tick)
+        output.write(f"\nThe horses are running! You chose {player_choice} at odds of {odds.decimal_odds[index]:.2f}.")
+        output.write(f"\nThe winning horse is: {race.winner.name}")
+
+        if race.order[0] == index:
+            winnings = odds.payout(index, bet)
             player.add_money(winnings)
             return f"\nCongratulations! Your horse has won. You will receive {winnings} coins."
         return "\nUnfortunately your horse didn't win. Good luck next time."
 
+    def _simulate_multipliers(self, rounds: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        # Always backs the first horse, like default_choice() in modules/odds.py
+        winners = horserace.winners(self.field, rounds, rng)
+        multipliers = np.where(winners == 0, self.odds().decimal_odds[0], 0.0)
+        return multipliers, np.zeros(rounds, dtype=bool)
+
 # Baccarat Game
 class Baccarat(CasinoGame):
+    """
+    Punto banco from an eight-deck shoe, see modules/baccarat.py for the drawing rules.
+    The player bets on the player hand (the default), the banker hand or a tie.
+    """
+    __slots__ = ()
+    min_bet = 10
+    no_money_message = "You don't have enough coins to play baccarat."
+    choice_prompt = "Bet on player, banker or tie (default player): "
+
     def __init__(self):
         super().__init__("Baccarat")
 
-    def play(self, player: Player, bet: int) -> str:
-        min_bet = 10
-        if bet < min_bet:
-            return f"The minimum bet for Baccarat is {min_bet} coins."
-        if player.money < bet:
-            return "You don't have enough coins to play baccarat."
+    @staticmethod
+    def bet_on(choice) -> str:
+        return str(choice or baccarat.PLAYER).strip().lower() or baccarat.PLAYER
+
+    def check_bet(self, player: Player, bet: int, choice=None) -> str:
+        error = super().check_bet(player, bet, choice)
+        if not error and self.bet_on(choice) not in baccarat.BETS:
+            return f"Invalid bet. Please bet on one of: {', '.join(baccarat.BETS)}."
+        return error
+
+    def play(self, player: Player, bet: int, choice=None, output: Optional[OutputSink] = None, rng=None) -> str:
+        """
+        :param choice: "player", "banker" or "tie", the player hand if omitted.
+        :param rng: The random stream, each stream deals from its own shoe.
+        """
+        error = self.check_bet(player, bet, choice)
+        if error:
+            return error
+        bet_on = self.bet_on(choice)
 
         player.deduct_money(bet)
-        player_score = random.randint(1, 9)
-        banker_score = random.randint(1, 9)
-        Slowprint.slow_print(f"\nYour card: {player_score}, bank card: {banker_score}")
+        coup = baccarat.play_coup(baccarat.shoe_for(rng or random))
+        (output or default_output).write(f"\nPlayer: {baccarat.describe_cards(coup.player)}, "
+                                         f"banker: {baccarat.describe_cards(coup.banker)}")
 
-        if player_score > banker_score:
-            winnings = bet * 2
+        winnings = coup.returned(bet_on, bet)
+        if winnings:
             player.add_money(winnings)
-            return f"\nYou won! Your reward: {winnings} coins."
-        elif player_score == banker_score:
-            player.add_money(bet)  
+        if coup.winner == bet_on:
+            commission = " after commission" if bet_on == baccarat.BANKER else ""
+            return f"\nYou won! Your reward: {winnings} coins{commission}."
+        elif winnings:
             return "\nDraw! Your stake will be refunded."
-        return "\nThe bank won. Try again."
+        elif coup.winner == baccarat.BANKER:
+            return "\nThe bank won. Try again."
+        elif coup.winner == baccarat.PLAYER:
+            return "\nThe player hand won. Try again."
+        return "\nIt's a tie, your bet is lost. Try again."
+
+    def _simulate_multipliers(self, rounds: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        # Simulates the default bet on the player hand
+        player_totals, banker_totals = baccarat.simulate_coups(rounds, rng)
+        multipliers = np.where(player_totals > banker_totals, 2, np.where(player_totals == banker_totals, 1, 0)).astype(np.int8)
+        return multipliers, np.zeros(rounds, dtype=bool)
 
 # Poker Game
 class Poker(CasinoGame):
+    """
+    Texas hold'em against the dealer: two hole cards each and a shared five-card board,
+    the better seven-card hand wins. Hands are valued with the lookup tables of modules/poker.py.
+    """
+    __slots__ = ()
+    min_bet = 15
+    no_money_message = "You don't have enough coins to play poker."
+    simulation_chunk = 100_000  # A deck per round is shuffled in memory, smaller batches stay in the cache
+
     def __init__(self):
         super().__init__("Poker")
 
-    def play(self, player: Player, bet: int) -> str:
-        min_bet = 15
-        if bet < min_bet:
-            return f"The minimum bet for Poker is {min_bet} coins."
-        if player.money < bet:
-            return "You don't have enough coins to play poker."
+    def play(self, player: Player, bet: int, choice=None, output: Optional[OutputSink] = None, rng=None) -> str:
+        error = self.check_bet(player, bet, choice)
+        if error:
+            return error
 
         player.deduct_money(bet)
-        player_hand = random.randint(1, 100)
-        dealer_hand = random.randint(1, 100)
-        Slowprint.slow_print(f"\nYour hand: {player_hand}, dealer's hand: {dealer_hand}")
-
-        if player_hand > dealer_hand:
+        output = output or default_output
+        showdown = poker.deal_showdown(rng or random)
+        output.write(f"\nYour cards: {poker.describe_cards(showdown.player)}, dealer's cards: {poker.describe_cards(showdown.dealer)}")
+        output.write(f"\nBoard: {poker.describe_cards(showdown.board)}")
+        output.write(f"\nYou have {poker.describe_value(showdown.player_value)}, "
+                     f"the dealer has {poker.describe_value(showdown.dealer_value)}.")
+
+        if showdown.player_value > showdown.dealer_value:
             winnings = bet * 4
             player.add_money(winnings)
             return f"\nYou won! Your reward: {winnings} coins."
-        elif player_hand == dealer_hand:
+        elif showdown.player_value == showdown.dealer_value:
             player.add_money(bet)  
             return "\nDraw! Your stake will be refunded."
         return "\nThe dealer hand was better. Try again."
 
+    def _simulate_multipliers(self, rounds: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        player_hands, dealer_hands = poker.showdown_batch(rng, rounds)
+        multipliers = np.where(player_hands > dealer_hands, 4, np.where(player_hands == dealer_hands, 1, 0)).astype(np.int8)
+        return multipliers, np.zeros(rounds, dtype=bool)
+
 # Roulette Game
 class Roulette(CasinoGame):
+    """
+    Single-zero roulette with a whole bet slip per spin, see modules/roulette.py for the bets.
+    """
+    __slots__ = ()
+    min_bet = 12
+    no_money_message = "You don't have enough coins to play roulette."
+    choice_prompt = "Place your bets (a number, red, dozen 2 or '10 on red, 5 on split 17-18'): "
+
     def __init__(self):
         super().__init__("Roulette")
 
-    def play(self, player: Player, bet: int) -> str:
-        min_bet = 12
-        if bet < min_bet:
-            return f"The minimum bet for Roulette is {min_bet} coins."
-        if player.money < bet:
-            return "You don't have enough coins to play roulette."
+    @staticmethod
+    def bet_slip(bet: int, choice) -> roulette.BetSlip:
+        if isinstance(choice, (list, tuple)):  # (selection, chips) pairs, e.g. from JSON
+            choice = tuple((str(selection), int(chips)) for selection, chips in choice)
+        return roulette.parse_slip(choice if choice is not None else "", bet)
+
+    def check_bet(self, player: Player, bet: int, choice=None) -> str:
+        error = super().check_bet(player, bet, choice)
+        if error:
+            return error
+        try:
+            self.bet_slip(bet, choice)
+        except (ValueError, TypeError) as e:
+            return f"Invalid input. {e}"
+        return ""
+
+    def play(self, player: Player, bet: int, choice=None, output: Optional[OutputSink] = None, rng=None) -> str:
+        """
+        :param choice: The bet slip: a selection such as 17 or "red" for the whole bet, or
+                       several selections with their chips, e.g. "10 on red, 5 on 17".
+        """
+        error = super().check_bet(player, bet, choice)
+        if error:
+            return error
+        try:  # Parsed once here instead of in check_bet() and again for the round
+            slip = self.bet_slip(bet, choice)
+        except (ValueError, TypeError) as e:
+            return f"Invalid input. {e}"
 
         player.deduct_money(bet)
-        try:
-            player_choice = int(input("Choose a number between 0 and 36: ").strip())
-        except ValueError:
-            return "Invalid input. Please enter a number between 0 and 36."
+        output = output or default_output
+        winning_number = (rng or random).randint(0, 36)
+        output.write(f"\nThe ball is rolling... You bet on {slip.describe()}.")
+        output.write(f"\nThe ball lands on: {winning_number} {roulette.colour(winning_number)}")
+
+        winnings = slip.settle(winning_number)
+        if not winnings:
+            return "\nUnfortunately no match. Try again."
+        player.add_money(winnings)
+        winning_bets = slip.winning_bets(winning_number)
+        if len(slip.bets) == 1 and winning_bets[0][0].payout == roulette.PAYOUTS["straight"]:
+            return f"\nJackpot! Your number was hit. You win {winnings} coins."
+        return f"\nYou win {winnings} coins on {', '.join(bet.name for bet, _ in winning_bets)}."
+
+    def _simulate_multipliers(self, rounds: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        # Every number is equally likely, so a straight bet on 0 is representative
+        multipliers = roulette.simulate_slip(roulette.parse_slip("0", 1), rounds, rng).astype(np.int8)
+        return multipliers, np.zeros(rounds, dtype=bool)
+
+
+class WorldState:
+    """
+    The mutable part of a world, one per session: a bitmask of the locked rooms (bit i is
+    room i of the template) and the index of the current room. Room views are created
+    lazily and kept so the same room is always the same object within a session.
+    """
+    __slots__ = ("world", "locked", "current", "_views")
+
+    def __init__(self, world: 'WorldTemplate'):
+        self.world = world
+        self.locked = world.locked_mask
+        self.current: Optional[int] = world.start
+        self._views: Optional[List[Optional['RoomView']]] = None
+
+    def view(self, index: int) -> 'RoomView':
+        if self._views is None:
+            self._views = [None] * len(self.world.names)
+        view = self._views[index]
+        if view is None:
+            view = self._views[index] = RoomView(self, index)
+        return view
+
+
+class RoomView(Room):
+    """
+    A room of a world template as seen by one session.
+    Name, texts, cost and game are references into the shared template, only the locked
+    flag is read from and written to the session's WorldState.
+    """
+    __slots__ = ("_state", "_index", "_exits")
+    characters = ()
+
+    def __init__(self, state: WorldState, index: int):
+        world = state.world
+        self._state = state
+        self._index = index
+        self._exits: Optional[Dict[str, 'RoomView']] = None
+        self.name = world.names[index]
+        self.description = world.descriptions[index]
+        self.unlock_cost = world.unlock_costs[index]
+        self.game = world.games[index]
 
-        if player_choice < 0 or player_choice > 36:
-            return "Invalid number. Please choose a number between 0 and 36."
+    @property
+    def exits(self) -> Dict[str, 'RoomView']:
+        # The neighbouring views are only created when the exits are first asked for
+        if self._exits is None:
+            self._exits = {direction: self._state.view(target) for direction, target in self._state.world.exits[self._index].items()}
+        return self._exits
 
-        winning_number = random.randint(0, 36)
-        Slowprint.slow_print(f"\nThe ball is rolling... You bet on {player_choice}.")
-        Slowprint.slow_print(f"\nThe ball lands on: {winning_number}")
+    @property
+    def locked(self) -> bool:
+        return bool(self._state.locked >> self._index & 1)
 
-        if player_choice == winning_number:
-            winnings = bet * 20
-            player.add_money(winnings)
-            return f"\nJackpot! Your number was hit. You win {winnings} coins."
-        return "\nUnfortunately no match. Try again."
+    @locked.setter
+    def locked(self, locked: bool):
+        if locked:
+            self._state.locked |= 1 << self._index
+        else:
+            self._state.locked &= ~(1 << self._index)
+
+    def add_exit(self, direction: str, room: Room):
+        raise TypeError("Rooms of a world template can't be changed, edit the story file instead.")
+
+    add_character = add_game = add_exit
+
+    def get_details(self) -> str:
+        return self._state.world.details[self._index][self.locked]
+
+
+class WorldRooms(MappingABC):
+    """
+    Read-only name -> RoomView mapping over one session's world state.
+    """
+    __slots__ = ("_state",)
+
+    def __init__(self, state: WorldState):
+        self._state = state
+
+    def __getitem__(self, name: str) -> RoomView:
+        return self._state.view(self._state.world.index[name])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._state.world.names)
+
+    def __len__(self) -> int:
+        return len(self._state.world.names)
+
+
+class WorldTemplate:
+    """
+    Immutable world compiled from the rooms of a story file: names, texts, unlock costs,
+    exits, games and the room graph index. It is compiled and validated once per story and
+    shared by every session, the games are stateless and shared as well. A session only
+    adds a WorldState.
+    """
+    GAME_TYPES = {game_type().name: game_type for game_type in (Slots, Blackjack, HorseRace, Baccarat, Poker, Roulette)}
+    _cache: Dict[str, Tuple[Mapping, 'WorldTemplate']] = {}
+
+    def __init__(self, data: Mapping):
+        rooms = data["rooms"]
+        self.names: Tuple[str, ...] = tuple(sys.intern(room["name"]) for room in rooms)
+        self.index: Mapping[str, int] = MappingProxyType({name: number for number, name in enumerate(self.names)})
+        if len(self.index) != len(self.names):
+            raise ValueError("Room names in the story must be unique.")
+        self.descriptions = tuple(room.get("description", "") for room in rooms)
+        self.unlock_costs = tuple(int(room.get("unlock_cost", 0)) for room in rooms)
+        self.locked_mask = sum(1 << number for number, room in enumerate(rooms) if room.get("locked", False))
+        self.start = self.index.get(data["game"].get("start_room", self.names[0]))
+        if self.start is None:
+            raise ValueError(f"Start room {data['game']['start_room']!r} is not a room of the story.")
+        self.start_money = int(data["game"].get("start_money", 40))
+        self.games = tuple(self._create_game(room) for room in rooms)
+
+        # Exits to rooms that don't exist are kept as None for the graph validation to report
+        graph_exits = tuple(tuple((exit_["direction"], self.index.get(exit_["room"])) for exit_ in room.get("exits", ()))
+                            for room in rooms)
+        self.graph = roomgraph.RoomGraph(self.names, self.unlock_costs, graph_exits, self.names[self.start])
+        self.graph.validate()
+        self.exits: Tuple[Mapping[str, int], ...] = tuple(MappingProxyType(dict(room_exits)) for room_exits in graph_exits)
+        # Room details only depend on the lock state, so both texts of every room are built here
+        self.details: Tuple[Tuple[str, str], ...] = tuple(
+            (self._details(number, False), self._details(number, True)) for number in range(len(self.names)))
+
+    def _details(self, number: int, locked: bool) -> str:
+        details = f"\n--- {self.names[number]} ---\n{self.descriptions[number]}\n"
+        if locked:
+            details += f"\nThis area is locked! Unlock cost: {self.unlock_costs[number]} coins."
+        if self.exits[number]:
+            details += f"\nAvailable exits: {', '.join(self.exits[number].keys())}"
+        if self.games[number]:
+            details += f"\nYou can play: {self.games[number].name}"
+        return details
+
+    def _create_game(self, room: Mapping) -> Optional[CasinoGame]:
+        spec = room.get("game")
+        if not spec or not spec.get("available", True):
+            return None
+        game_type = self.GAME_TYPES.get(spec["type"])
+        if game_type is None:
+            raise ValueError(f"{room['name']}: unknown game type {spec['type']!r}.")
+        return game_type.shared(spec.get("min_bet"))
+
+    @classmethod
+    def for_story(cls, story: Story) -> 'WorldTemplate':
+        """
+        Return the compiled world of a story, compiling it only when the story was (re)parsed.
+        """
+        data = story.data
+        entry = cls._cache.get(story.file_path)
+        if entry is None or entry[0] is not data:
+            # Two threads may compile the same world at once, both results are equivalent
+            entry = (data, cls(data))
+            cls._cache[story.file_path] = entry
+        return entry[1]
+
+    def locked_for(self, unlocked) -> int:
+        """
+        Locked mask with every room locked except the given room names.
+        """
+        mask = (1 << len(self.names)) - 1
+        for name in unlocked:
+            if name in self.index:
+                mask &= ~(1 << self.index[name])
+        return mask
+
+    def unlocked_names(self, locked: int) -> List[str]:
+        return [name for number, name in enumerate(self.names) if not locked >> number & 1]
 
 
 class Game:
-    def __init__(self, player_name: str, story_file: str, mode: str):
+    # A server holds many sessions, so sessions carry no per-instance __dict__
+    __slots__ = ("player", "rooms", "world", "world_state", "story_file", "story", "mode", "output",
+                 "bet_history", "seed", "rngs", "actions", "_start")
+    SAVE_FORMAT = "golden-casino-save"
+    SAVE_VERSION = 1
+    ACTION_LOG_LIMIT = 10_000  # A longer action log is checkpointed, see checkpoint()
+
+    def __init__(self, player_name: str, story_file: str, mode: str, output: Optional[OutputSink] = None,
+                 history: Optional[BetHistory] = None, seed: Optional[int] = None):
         self.player = Player(name=player_name)
-        self.rooms: Dict[str, Room] = {}
-        self.current_room = None
+        self.rooms: Mapping[str, Room] = {}
+        self.world: Optional[WorldTemplate] = None
+        self.world_state: Optional[WorldState] = None
+        self.story_file = story_file
         self.story = Story(story_file)
         self.mode = mode
+        self.output = output or default_output
+        self.bet_history = history if history is not None else BetHistory()
+        # Every game type draws from its own stream derived from the session seed, so a
+        # session can be reproduced from its seed and action log (see modules/replay.py)
+        self.seed = seed if seed is not None else random.randrange(2 ** 63)
+        self.rngs: Dict[str, random.Random] = {}
+        self.actions: List[tuple] = []
+        self._start: Optional[tuple] = None
 
     def create_rooms(self):
-        lobby = Room("Lobby", self.story.get_text("Lobby"))
-        slots_room = Room("Slots Room", self.story.get_text("Slots Room"), locked=False)
-        blackjack_room = Room("Blackjack Room", self.story.get_text("Blackjack Room"), locked=True, unlock_cost=50)
-        horse_race_room = Room("Horse Race Room", self.story.get_text("Horse Race Room"), locked=True, unlock_cost=100)
-        baccarat_room = Room("Baccarat Room", self.story.get_text("Baccarat Room"), locked=True, unlock_cost=120)
-        poker_room = Room("Poker Room", self.story.get_text("Poker Room"), locked=True, unlock_cost=150)
-        roulette_room = Room("Roulette Room", self.story.get_text("Roulette Room"), locked=True, unlock_cost=175)
-        vip_room = Room("VIP Lounge", self.story.get_text("VIP Lounge"), locked=True, unlock_cost=999)
-
-        lobby.add_exit("slots", slots_room)
-        slots_room.add_exit("lobby", lobby)
-        slots_room.add_exit("blackjack", blackjack_room)
-        blackjack_room.add_exit("slots", slots_room)
-        blackjack_room.add_exit("horse_race", horse_race_room)
-        horse_race_room.add_exit("blackjack", blackjack_room)
-        horse_race_room.add_exit("baccarat", baccarat_room)
-        baccarat_room.add_exit("horse_race", baccarat_room)
-        baccarat_room.add_exit("poker", poker_room)
-        poker_room.add_exit("baccarat", baccarat_room)
-        poker_room.add_exit("roulette", roulette_room)
-        roulette_room.add_exit("poker", poker_room)
-        roulette_room.add_exit("vip", vip_room)
-        vip_room.add_exit("horse_race", horse_race_room)
-
-        slots_room.add_game(Slots())
-        blackjack_room.add_game(Blackjack())
-
-        self.rooms = {
-            "Lobby": lobby,
-            "Slots Room": slots_room,
-            "Blackjack Room": blackjack_room,
-            "Horse Race Room": horse_race_room,
-            "Baccarat Room": baccarat_room,
-            "Poker Room": poker_room,
-            "Roulette Room": roulette_room,
-            "VIP Lounge": vip_room,
+        """
+        Enter the world of the story: the compiled template is shared, only the locks and
+        the current room belong to this session.
+        """
+        self.world = WorldTemplate.for_story(self.story)
+        self.world_state = WorldState(self.world)
+        self.rooms = WorldRooms(self.world_state)
+        self.player.money = self.world.start_money
+        self.start_state = self.get_state()
+
+    @property
+    def room_graph(self) -> Optional[roomgraph.RoomGraph]:
+        return self.world.graph if self.world else None
+
+    @property
+    def current_room(self) -> Optional[Room]:
+        state = self.world_state
+        if state is None or state.current is None:
+            return None
+        return state.view(state.current)
+
+    @current_room.setter
+    def current_room(self, room: Optional[Room]):
+        self.world_state.current = None if room is None else self.world.index[room.name]
+
+    def unlock_plan(self, room_name: str) -> Optional[roomgraph.UnlockPlan]:
+        """
+        Cheapest way to walk from the current room to a room, given what is unlocked now.
+        """
+        return self.world.graph.unlock_plan(self.current_room.name, room_name, self.world_state.locked)
+
+    @property
+    def start_state(self) -> Optional[dict]:
+        """
+        The state the session started from (where a replay begins), in get_state form.
+        It is kept packed as (money, jackpot wins, mode, room, locked mask).
+        """
+        if self._start is None:
+            return None
+        money, jackpot_wins, mode, room, locked = self._start
+        return {
+            "player": self.player.get_name(),
+            "money": money,
+            "jackpot_wins": jackpot_wins,
+            "mode": mode,
+            "story": self.story_file,
+            "room": room,
+            "unlocked": self.world.unlocked_names(locked),
         }
-        self.current_room = lobby
+
+    @start_state.setter
+    def start_state(self, state: Optional[dict]):
+        self._start = None if state is None else (
+            state["money"], state["jackpot_wins"], state["mode"], state["room"], self.world.locked_for(state["unlocked"]))
+
+    def rng_for(self, game_name: str) -> random.Random:
+        """
+        Return the seeded random stream of one game type.
+        """
+        if game_name not in self.rngs:
+            self.rngs[game_name] = random.Random(f"{self.seed}:{game_name}")
+        return self.rngs[game_name]
+
+    def get_state(self) -> dict:
+        """
+        Snapshot of the mutable state of the session (what a save file stores).
+        """
+        return {
+            "player": self.player.get_name(),
+            "money": self.player.money,
+            "jackpot_wins": self.player.jackpot_wins,
+            "mode": self.mode,
+            "story": self.story_file,
+            "room": self.current_room.name if self.current_room else None,
+            "unlocked": self.world.unlocked_names(self.world_state.locked),
+        }
+
+    def apply_state(self, state: dict):
+        """
+        Restore a snapshot taken with get_state on a game whose rooms were created.
+        """
+        self.player.money = state["money"]
+        self.player.jackpot_wins = state["jackpot_wins"]
+        self.mode = state["mode"]
+        self.world_state.locked = self.world.locked_for(state["unlocked"])
+        if state["room"] in self.rooms:
+            self.current_room = self.rooms[state["room"]]
+        self.start_state = self.get_state()
+        self.actions.clear()
+
+    def _log(self, action: tuple):
+        if len(self.actions) >= self.ACTION_LOG_LIMIT:
+            self.checkpoint()
+        self.actions.append(action)
+
+    def checkpoint(self):
+        """
+        Start a new replay segment at the current state, so the action log stays bounded.
+        The current state becomes the start state, the log is emptied and the random streams
+        restart from a new seed drawn from the old one. A replay of the log from here (see
+        modules/replay.py) reproduces the rest of the session.
+        """
+        self.seed = self.rng_for("checkpoint").randrange(2 ** 63)
+        self.rngs.clear()
+        self.start_state = self.get_state()
+        self.actions.clear()
 
     def display_current_room(self):
         if self.current_room:
-            self.current_room.display_details()
+            self.current_room.display_details(self.output)
 
-    def move_player(self, direction: str):
+    @metrics.timed("move_player")
+    def move_player(self, direction: str, unlock: bool = False):
+        """
+        Move the player through an exit of the current room.
+        :param unlock: Whether the player agreed to pay for a locked room behind the exit.
+        """
+        self._log(("go", direction, unlock))
         if self.current_room and direction in self.current_room.exits:
             next_room = self.current_room.exits[direction]
             if next_room.locked:
-                if self.player.money >= next_room.unlock_cost:
-                    choice = input(f"This room is locked and costs {next_room.unlock_cost} coins to unlock. Do you want to unlock it? (yes/no): ").strip().lower()
-                    if choice == "yes":
-                        self.player.deduct_money(next_room.unlock_cost)
-                        next_room.locked = False
-                        print(f"You have successfully unlocked {next_room.name}!")
-                    else:
-                        print("You chose not to unlock the room.")
-                        return
-                else:
-                    print("You don't have enough coins to unlock this room.")
+                if self.player.money < next_room.unlock_cost:
+                    self.output.write("You don't have enough coins to unlock this room.")
+                    return
+                if not unlock:
+                    self.output.write("You chose not to unlock the room.")
                     return
+                self.player.deduct_money(next_room.unlock_cost)
+                next_room.locked = False
+                self.output.write(f"You have successfully unlocked {next_room.name}!")
 
             self.current_room = next_room
-            print(f"You move to the {direction}.")
+            self.output.write(f"You move to the {direction}.")
             self.display_current_room()  # Display the room details after moving
         else:
-            print("You can't go that way.")
+            self.output.write("You can't go that way.")
 
     def play_game(self):
-        if self.current_room and self.current_room.game:
-            print(self.current_room.game.play(self.player))
-        else:
-            print("There is no game to play here.")
+        """
+        Console front end for a round: asks for the bet (and choice) and plays it.
+        """
+        if not (self.current_room and self.current_room.game):
+            self.output.write("There is no game to play here.")
+            return
+        game = self.current_room.game
+        try:
+            bet = int(input(f"Place your bet (minimum {game.min_bet} coins): ").strip())
+        except ValueError:
+            self.output.write("Invalid bet! Please enter a number.")
+            return
+        choice = input(game.choice_prompt).strip() if game.choice_prompt else None
+        self.output.write(self.play_current_room_game(bet, choice))
 
-    def save_game(self, filename: str = "casino_save.pkl"):
+    @metrics.timed("save")
+    def save_game(self, filename: str = "casino_save.sav"):
+        """
+        Save the mutable state of the game as JSON lines: a format header, the state
+        and then one line per bet history record. Rooms and texts are rebuilt from
+        the story on load, so they are not stored. A successful save checkpoints the
+        action log.
+        """
+        header = {"format": self.SAVE_FORMAT, "version": self.SAVE_VERSION}
+        lines = [header, self.get_state()] + [list(record) for record in self.bet_history]
         try:
-            with open(filename, "wb") as save_file:
-                pickle.dump(self, save_file)
-            Slowprint.slow_print("Game saved successfully!")
+            with open(filename, "w", encoding="utf-8") as save_file:
+                save_file.write("\n".join(json.dumps(line, ensure_ascii=False, separators=(",", ":")) for line in lines))
+                save_file.write("\n")
+            self.checkpoint()
+            self.output.write("Game saved successfully!")
         except Exception as e:
-            Slowprint.slow_print(f"Error saving game: {e}")
+            self.output.write(f"Error saving game: {e}")
 
     @staticmethod
-    def load_game(filename: str = "casino_save.pkl") -> 'Game':
+    @metrics.timed("load")
+    def load_game(filename: str = "casino_save.sav", output: Optional[OutputSink] = None) -> 'Game':
+        output = output or default_output
         try:
-            with open(filename, "rb") as save_file:
-                game = pickle.load(save_file)
-            Slowprint.slow_print("Game loaded successfully!")
+            with open(filename, "r", encoding="utf-8") as save_file:
+                lines = [json.loads(line) for line in save_file if line.strip()]
+            header, state = lines[0], lines[1]
+            if header.get("format") != Game.SAVE_FORMAT:
+                raise ValueError("Not a Golden Casino save file.")
+            if header.get("version") != Game.SAVE_VERSION:
+                raise ValueError(f"Unsupported save version {header.get('version')}.")
+
+            game = Game(state["player"], state["story"], state["mode"], output)
+            game.create_rooms()
+            game.apply_state(state)
+            game.bet_history.extend(BetRecord(*record) for record in lines[2:])
+            output.write("Game loaded successfully!")
             return game
         except FileNotFoundError:
-            Slowprint.slow_print("No saved game found.")
+            output.write("No saved game found.")
         except Exception as e:
-            print(f"Error loading game: {e}")
+            output.write(f"Error loading game: {e}")
         return None
 
     def start(self):
+        """
+        Interactive console loop. This is the only place that reads from input().
+        """
         welcome_message = self.story.data["game"].get("welcome", "Welcome to the Casino Game!")
-        Slowprint.slow_print(welcome_message)
+        self.output.write(welcome_message)
         casino_tour = self.story.data["game"].get("casino_tour", "")
         casino_tour_rooms = self.story.data["game"].get("casino_tour_rooms", [])
         if casino_tour:
-            Slowprint.slow_print(casino_tour)
+            self.output.write(casino_tour)
             for room in casino_tour_rooms:
-                Slowprint.slow_print(room)
+                self.output.write(room)
         self.display_current_room()
 
         while True:
             if self.player.money <= 0:
                 if self.mode == "easy":
-                    print("You have run out of money. A stranger in the casino gives you some money to continue playing.")
-                    self.player.add_money(50)  # Give the player some money to continue
+                    self.output.write("You have run out of money. A stranger in the casino gives you some money to continue playing.")
+                    self.give_bonus(50)  # Give the player some money to continue
                 else:
-                    print("You have run out of money. You are being kicked out of the casino. Game over.")
+                    self.output.write("You have run out of money. You are being kicked out of the casino. Game over.")
                     break
 
-            Slowprint.slow_print("\nWhat would you like to do? (e.g., 'slots' to enter the Slots Room, 'exit' to leave, 'play' to play a game, 'purse' to check your money, 'save' to save the game, 'load' to load a game): ")
+            self.output.write("\nWhat would you like to do? (e.g., 'slots' to enter the Slots Room, 'exit' to leave, 'play' to play a game, 'purse' to check your money, 'save' to save the game, 'load' to load a game): ")
             action = input().strip().lower()
             if action == "exit":
-                print("You leave the game.")
+                self.output.write("You leave the game.")
                 break
             elif action == "purse":
-                print(f"You have {self.player.money} coins.")
+                self.output.write(f"You have {self.player.money} coins.")
             elif action == "save":
                 self.save_game()
             elif action == "load":
-                loaded_game = self.load_game()
+                loaded_game = self.load_game(output=self.output)
                 if loaded_game:
-                    self.__dict__.update(loaded_game.__dict__)
+                    for attribute in Game.__slots__:
+                        setattr(self, attribute, getattr(loaded_game, attribute))
                     self.display_current_room()
             elif action in self.current_room.exits:
-                self.move_player(action)
+                next_room = self.current_room.exits[action]
+                unlock = False
+                if next_room.locked and self.player.money >= next_room.unlock_cost:
+                    choice = input(f"This room is locked and costs {next_room.unlock_cost} coins to unlock. Do you want to unlock it? (yes/no): ").strip().lower()
+                    unlock = choice == "yes"
+                self.move_player(action, unlock)
             elif action == "play":
                 self.play_game()
             else:
-                print("Unknown action. Please try again.")
+                self.output.write("Unknown action. Please try again.")
 
+    def give_bonus(self, amount: int):
+        """
+        Give the player free coins (easy mode rescue).
+        """
+        self._log(("bonus", amount))
+        self.player.add_money(amount)
+
+    @metrics.timed("unlock")
+    def unlock_room(self, room_name: str) -> str:
+        """
+        Unlock a room by paying its unlock cost.
+        Returns a message indicating success or failure.
+        """
+        self._log(("unlock", room_name))
+        room = self.rooms.get(room_name)
+        if not room:
+            return "Room not found."
+        if not room.locked:
+            return f"{room_name} is already unlocked."
+        if self.player.money < room.unlock_cost:
+            return "Not enough coins to unlock this room!"
+        self.player.deduct_money(room.unlock_cost)
+        room.locked = False
+        return f"{room_name} unlocked!"
+
+    @metrics.timed("move")
     def move_to_room(self, room_name: str) -> str:
         """
         Move the player to a specified room if it's unlocked.
         Returns a message indicating success or failure.
         """
+        self._log(("move", room_name))
         if room_name in self.rooms:
             room = self.rooms[room_name]
             if room.locked:
@@ -447,15 +1200,32 @@ class Game:
             return f"You moved to {room_name}."
         return "Room not found."
 
-    def play_current_room_game(self, bet: int) -> str:
+    @metrics.timed("round")
+    def play_current_room_game(self, bet: int, choice=None) -> str:
         """
         Play the game in the current room with the specified bet.
+        Narration of the round goes to the game's output sink.
+        :param choice: The player's decision for games that need one (horse, roulette number).
+                       Decision functions (see Blackjack.play) can only be passed to a game's
+                       play() directly: a session must be replayable from its logged actions.
         Returns the result of the game.
         """
+        if callable(choice):
+            return "Decision functions can't be logged, pass them to the game's play() directly."
+        self._log(("play", bet, choice))
         if self.current_room and self.current_room.game:
             if bet > self.player.money:
                 return "You don't have enough coins to place this bet."
-            return self.current_room.game.play(self.player, bet)
+            game = self.current_room.game
+            error = game.check_bet(self.player, bet, choice)
+            if error:
+                return error
+            stake_left = self.player.money - bet
+            result = game.play(self.player, bet, choice, self.output, self.rng_for(game.name))
+            payout = self.player.money - stake_left
+            self.bet_history.append(BetRecord(game.name, bet, payout, self.player.money))
+            metrics.registry.record_round(game.name, bet, payout)
+            return result
         return "No game available in this room."
 
     def get_current_room_details(self) -> str:
@@ -493,7 +1263,7 @@ class Main:
 
         load_choice = input("Do you want to load a game or create a new one? (load/new): ").strip().lower()
         if load_choice == "load":
-            loaded_game = Game.load_game("casino_save.pkl")
+            loaded_game = Game.load_game()
             if loaded_game:
                 self.game = loaded_game
                 self.game.mode = mode_choice
@@ -1,33 +1,49 @@
 import customtkinter as ctk  
 from modules import classes  
-import threading  # For running tasks in separate threads
+from modules import assets  # Background image decoding and on-disk resize cache
+from modules.typewriter import Typewriter  # Frame-based typing effect
+from modules.workers import RoundWorkerPool  # Resolves game rounds off the UI thread
+from modules.history import BetHistory, rotate_archive  # Bounded bet history with an on-disk archive
+from modules import metrics  # Counters and timers, off unless CASINO_METRICS is set
+from modules import odds  # Win probability and return to player of each game, exact or estimated
+from modules import stats  # SQLite player stats and leaderboards, written on a background thread
+from modules.paths import DATA_DIR  # Player data directory, shared with the stats store
+import sqlite3
+import logging
+import os
 import sys 
-from PIL import Image, ImageTk 
+import traceback
+
+# Older bets of the session are written here once they leave the in-memory history,
+# the previous session's archive is kept next to it as casino_history.jsonl.1
+HISTORY_FILE = os.path.join(DATA_DIR, "casino_history.jsonl")
+HISTORY_LINES = 10  # Number of bets shown in the History tab
 
 # Fix for charmap encoding issue in the console
 sys.stdout.reconfigure(encoding='utf-8')
 
+log = logging.getLogger(__name__)
+
 class CasinoGUI(ctk.CTk):
     """
     Main GUI class for the Golden Casino Requiem game.
     Handles the user interface and interactions.
     """
 
-    def slow_print(self, text, textbox, delay=25):
+    def slow_print(self, text, textbox, delay=25, start_delay=0):
         """
         Print text slowly into the given textbox, simulating a typing effect.
+        The text is typed frame by frame in chunks, so long texts need a few Tk callbacks
+        per second instead of one per character. Starting a new text cancels the previous one.
         :param text: The text to display.
         :param textbox: The textbox widget where the text will be displayed.
         :param delay: Delay in milliseconds between each character.
+        :param start_delay: Delay in milliseconds before typing starts.
         """
-        def type_character(index=0):
-            if index < len(text):
-                textbox.insert(ctk.END, text[index])  # Insert one character at a time
-                textbox.see(ctk.END)  # Scroll to the end of the textbox
-                self.after(delay, type_character, index + 1)  # Schedule the next character
-
-        textbox.delete("1.0", ctk.END)  # Clear the textbox
-        type_character()  # Start typing characters
+        if self.typewriter:
+            self.typewriter.cancel()
+        self.typewriter = Typewriter(self, textbox, chars_per_second=1000 / delay)
+        self.typewriter.start(text, start_delay_ms=start_delay)  # Clears the textbox and starts typing
 
     def __init__(self):
         """
@@ -46,8 +62,22 @@ class CasinoGUI(ctk.CTk):
         # Initialize game-related variables
         self.player = None
         self.game = None
-        self.bet_history = []
+        self.history_lines = 0  # Lines currently shown in the History tab
         self.difficulty = "normal"
+        self.typewriter = None  # Typing effect of the loading screen
+        self.stats = None  # Stats store, opened when the first game starts
+        self.stats_session = None  # Id of this game in the stats store
+        self.leaderboard_future = None  # Leaderboard query running on the stats reader thread
+        self.leaderboard_stale = False  # Whether the leaderboard changed while the query was running
+
+        # Game rounds run on a small worker pool, the UI thread collects their results
+        self.rounds = RoundWorkerPool(workers=2, max_pending=8)
+        self.after(20, self.poll_round_results)
+
+        # Start decoding images in the background right away, the start screen shows them when ready
+        self.assets = assets.AssetCache()
+        self.assets.load(assets.START_IMAGE, assets.START_IMAGE_SIZE)
+        self.assets.preload(assets.GAME_IMAGES.values(), assets.GAME_IMAGE_SIZE)
 
         # Create frames for different screens
         self.start_screen = ctk.CTkFrame(self, fg_color="#1b1b1b")
@@ -65,13 +95,10 @@ class CasinoGUI(ctk.CTk):
         """
         self.start_screen.pack(fill="both", expand=True)
 
-        # Load and display the background image
-        bg_image = Image.open(r"images\Start_Image.png")
-        bg_image = bg_image.resize((1100, 500), Image.Resampling.LANCZOS)  # Resize to fit the top portion of the screen
-        self.bg_image_tk = ImageTk.PhotoImage(bg_image)
-
-        bg_label = ctk.CTkLabel(self.start_screen, image=self.bg_image_tk, text="")
+        # Display the background image, it is decoded and resized off the UI thread and filled in when ready
+        bg_label = ctk.CTkLabel(self.start_screen, text="", height=assets.START_IMAGE_SIZE[1])
         bg_label.pack(fill="x", pady=10)  # Place the image at the top
+        self.assets.request(self, assets.START_IMAGE, assets.START_IMAGE_SIZE, lambda image: self.show_image(bg_label, image))
 
         # Create a frame for the inputs below the image
         input_frame = ctk.CTkFrame(self.start_screen, fg_color="#1b1b1b", corner_radius=10)
@@ -111,6 +138,16 @@ class CasinoGUI(ctk.CTk):
         )
         start_button.pack(pady=20)
 
+    def show_image(self, label, image):
+        """
+        Put a loaded image into a label, unless the label was destroyed in the meantime.
+        :param label: The label widget that displays the image.
+        :param image: The CTkImage delivered by the asset cache.
+        """
+        if label.winfo_exists():
+            label.configure(image=image)
+            label.image = image  # Keep a reference so the image isn't garbage collected
+
     def toggle_difficulty(self):
         """
         Toggle the difficulty between 'easy' and 'normal' based on the state of the difficulty switch.
@@ -142,9 +179,13 @@ class CasinoGUI(ctk.CTk):
         history_textbox = ctk.CTkTextbox(self.quit_screen, width=800, height=300, wrap="word", font=("Arial", 14), fg_color="#222222", text_color="white")
         history_textbox.pack(pady=10, fill="both", expand=True)
 
-        # Populate the history textbox
-        for bet in self.bet_history:
-            history_textbox.insert(ctk.END, f"{bet}\n")
+        # Populate the history textbox with one insert, older bets are only counted
+        with self.rounds.session_lock(self.game):  # The history may be appended to by a running round
+            history = self.game.bet_history
+            lines = [record.describe() for record in history]
+            if history.archived:
+                lines.insert(0, f"... {history.archived} earlier bets of this session archived in {history.archive_path or 'nowhere'}")
+        history_textbox.insert(ctk.END, "\n".join(lines))
 
         # Add buttons to confirm quit or return to the game
         button_frame = ctk.CTkFrame(self.quit_screen, fg_color="#1b1b1b")
@@ -168,10 +209,12 @@ class CasinoGUI(ctk.CTk):
         
         self.error_label.configure(text="")
 
-        # Initialize the player and game
-        self.player = classes.Player(player_name)
-        self.game = classes.Game(player_name, "story.json", "normal")
+        # Initialize the game and use its player, so the GUI and the game share one balance
+        self.game = classes.Game(player_name, "story.json", "normal", output=classes.BufferSink(),  # Narration is shown in the GUI, not printed
+                                 history=BetHistory(archive_path=rotate_archive(HISTORY_FILE)))
         self.game.create_rooms()
+        self.player = self.game.player
+        self.start_stats_session(player_name)
 
         # Switch to the loading screen
         self.start_screen.pack_forget()
@@ -181,6 +224,20 @@ class CasinoGUI(ctk.CTk):
                         self.game.story.data["game"].get("casino_tour", "") + "\n\n" + \
                         "\n".join(self.game.story.data["game"].get("casino_tour_rooms", [])), callback=self.create_main_game_screen)
 
+    def start_stats_session(self, player_name):
+        """
+        Register the new game in the stats store. The game runs without stats if the
+        database can't be opened.
+        :param player_name: The name the player entered.
+        """
+        try:
+            if self.stats is None:
+                self.stats = stats.StatsStore(stats.STATS_FILE)
+            self.stats_session = self.stats.start_session(player_name, self.game.mode, self.player.money, self.game.seed)
+        except (sqlite3.Error, OSError) as e:
+            log.warning("Stats are not recorded: %s", e)
+            self.stats = None
+
     def create_loading_screen(self, story_text=None, callback=None):
         """
         Create the loading screen to display story text with a typing effect.
@@ -190,6 +247,10 @@ class CasinoGUI(ctk.CTk):
         """
         self.loading_screen.pack(fill="both", expand=True)
 
+        # Stop typing into the old textbox before it is destroyed
+        if self.typewriter:
+            self.typewriter.cancel()
+
         # Clear the loading screen and add the loading label
         for widget in self.loading_screen.winfo_children():
             widget.destroy()
@@ -202,14 +263,13 @@ class CasinoGUI(ctk.CTk):
         story_label = ctk.CTkLabel(decorative_frame, text="Loading...", font=("Arial", 28, "bold"), text_color="gold")
         story_label.pack(pady=20)
 
-        # Textbox to display the story text
-        self.story_textbox = ctk.CTkTextbox(decorative_frame, width=800, height=400, wrap="word", font=("Arial", 16), fg_color="#222222", text_color="white", corner_radius=10)
-        self.story_textbox.pack(pady=10, fill="both", expand=True)
+        # Textbox to display the story text (separate from the story tab of the main screen)
+        self.loading_textbox = ctk.CTkTextbox(decorative_frame, width=800, height=400, wrap="word", font=("Arial", 16), fg_color="#222222", text_color="white", corner_radius=10)
+        self.loading_textbox.pack(pady=10, fill="both", expand=True)
 
         # Display the story text with a slow print effect
         if story_text:
-            self.story_textbox.delete("1.0", ctk.END)  # Clear any existing text
-            self.after(500, lambda: self.slow_print(story_text, self.story_textbox))  # Add a slight delay before slow print
+            self.slow_print(story_text, self.loading_textbox, start_delay=500)  # Add a slight delay before slow print
 
         # "Continue" button to proceed
         continue_button = ctk.CTkButton(
@@ -225,9 +285,14 @@ class CasinoGUI(ctk.CTk):
     def proceed_from_loading(self, callback):
         """
         Proceed from the loading screen to the next screen.
+        If the story text is still being typed, the first click shows the whole text instead.
         Calls the provided callback function to determine the next screen.
         :param callback: The function to call to load the next screen.
         """
+        if self.typewriter and self.typewriter.running:
+            self.typewriter.skip_to_end()  # Show the full text, the next click continues
+            return
+
         self.loading_screen.pack_forget()  # Hide the loading screen
         if callback:
             callback()  # Execute the callback to load the next screen
@@ -277,22 +342,32 @@ class CasinoGUI(ctk.CTk):
         self.room_listbox = ctk.CTkFrame(self.room_frame, fg_color="#444444", corner_radius=10)
         self.room_listbox.pack(pady=5, fill='both', expand=True)
 
-        self.room_buttons = []
+        self.room_rows = {}  # One retained row of widgets per room, see update_room_list
 
         # Center Panel (Game Controls)
         self.center_frame = ctk.CTkFrame(self.main_frame, fg_color="#444444", corner_radius=10)
         self.center_frame.pack(expand=1, fill='both', padx=10, pady=10)
 
+        # Picture of the game in the current room
+        self.game_image_label = ctk.CTkLabel(self.center_frame, text="")
+        self.game_image_label.pack(pady=5)
+
         self.bet_label = ctk.CTkLabel(self.center_frame, text="Place Your Bet:", font=("Arial", 14, "bold"), text_color="gold")
         self.bet_label.pack(pady=5)
         
         self.bet_entry = ctk.CTkEntry(self.center_frame, width=200)
         self.bet_entry.pack(pady=5)
+        self.bet_entry.bind("<KeyRelease>", lambda event: self.update_odds_label())  # Slip odds depend on the bet
         
         self.game_buttons_frame = ctk.CTkFrame(self.center_frame, fg_color="#555555", corner_radius=10)
         self.game_buttons_frame.pack(fill='x', padx=10, pady=10)
         
-        self.game_buttons = []
+        self.game_button = None  # Created once, reconfigured for the game of each room
+        self.choice_label = None  # Prompt and entry for games that need a choice (horse, bet slip)
+        self.choice_entry = None
+        self.odds_label = None  # Odds of the current game, shown next to the Play button
+        self.odds_poll = None  # Pending after() id while the odds are still being computed
+        self.round_wait = None  # Pending after() id of a round waiting for its game to be ready
 
         # Add a label to display game results
         self.result_label = ctk.CTkLabel(self.center_frame, text="", font=("Arial", 14, "bold"), text_color="white")
@@ -311,54 +386,83 @@ class CasinoGUI(ctk.CTk):
         self.history_tab = self.story_tabview.add("History")
         self.history_listbox = ctk.CTkTextbox(self.history_tab, width=300, height=150, wrap="word", font=("Arial", 12))
         self.history_listbox.pack(pady=10, fill="both", expand=True)
+
+        # Add a leaderboard tab, read from the stats store after every round
+        self.leaderboard_tab = self.story_tabview.add("Leaderboard")
+        self.leaderboard_textbox = ctk.CTkTextbox(self.leaderboard_tab, width=300, height=150, wrap="word", font=("Arial", 12))
+        self.leaderboard_textbox.pack(pady=10, fill="both", expand=True)
+        self.update_leaderboard()
         
         # Inside the create_layout method, add this to the header frame
         quit_button = ctk.CTkButton(self.header_frame, text="Quit", font=("Arial", 14, "bold"), fg_color="red", hover_color="darkred", text_color="white", command=self.create_quit_screen)
         quit_button.pack(side="right", padx=10, pady=10)
 
+    @metrics.timed("gui_update_room_list")
     def update_room_list(self):
         """
         Update the room list with buttons for each room.
         Displays locked rooms with an unlock button and unlocked rooms with a checkmark.
+        The widgets of a room are created once and afterwards only reconfigured when the
+        room's state (locked, current room) changes, so refreshing costs almost nothing.
         """
-        # Clear all existing widgets in the room_listbox
-        for widget in self.room_listbox.winfo_children():
-            widget.destroy()
+        current_room = self.game.current_room
+        for room_name, room in self.game.rooms.items():
+            row = self.room_rows.get(room_name)
+            if row is None:
+                row = self.create_room_row(room_name, room)
+                self.room_rows[room_name] = row
 
-        self.room_buttons.clear()  # Clear the room_buttons list
+            state = (room.locked, room is current_room)
+            if row["state"] == state:
+                continue  # Nothing changed for this room
+            row["state"] = state
 
-        # Iterate through all rooms in the game
-        for room_name, room in self.game.rooms.items():
             status = "✅" if not room.locked else "🔒"  # Show a lock or checkmark based on room status
-            room_frame = ctk.CTkFrame(self.room_listbox, fg_color="#555555", corner_radius=10)
-            room_frame.pack(fill='x', pady=2)
-
-            # Create a button for the room
-            room_button = ctk.CTkButton(
-                room_frame,
+            row["room_button"].configure(
                 text=f"{status} {room_name}",
-                command=lambda rn=room_name: self.move_to_room(rn),  # Move to the room when clicked
-                fg_color="#555555",
-                hover_color="#777777",
-                width=200
+                fg_color="#2e7d32" if room is current_room else "#555555"  # Highlight the current room
             )
-            room_button.pack(side="left", padx=5, pady=2)
-            self.room_buttons.append(room_button)
 
-            # If the room is locked, add an unlock button
+            # Only locked rooms show their unlock button
             if room.locked:
-                unlock_button = ctk.CTkButton(
-                    room_frame,
-                    text=f"Unlock ({room.unlock_cost} coins)",
-                    command=lambda rn=room_name: self.unlock_room(rn),  # Unlock the room when clicked
-                    fg_color="gold",
-                    hover_color="darkred",
-                    text_color="black",
-                    width=150
-                )
-                unlock_button.pack(side="right", padx=5, pady=2)
-                self.room_buttons.append(unlock_button)
+                row["unlock_button"].pack(side="right", padx=5, pady=2)
+            else:
+                row["unlock_button"].pack_forget()
+
+    def create_room_row(self, room_name, room):
+        """
+        Create the retained widgets for one room in the room list.
+        :param room_name: The name of the room.
+        :param room: The room object.
+        :return: A dict with the row's widgets and the state they currently show.
+        """
+        room_frame = ctk.CTkFrame(self.room_listbox, fg_color="#555555", corner_radius=10)
+        room_frame.pack(fill='x', pady=2)
+
+        # Create a button for the room
+        room_button = ctk.CTkButton(
+            room_frame,
+            text=room_name,
+            command=lambda rn=room_name: self.move_to_room(rn),  # Move to the room when clicked
+            fg_color="#555555",
+            hover_color="#777777",
+            width=200
+        )
+        room_button.pack(side="left", padx=5, pady=2)
 
+        # Unlock button, packed only while the room is locked
+        unlock_button = ctk.CTkButton(
+            room_frame,
+            text=f"Unlock ({room.unlock_cost} coins)",
+            command=lambda rn=room_name: self.unlock_room(rn),  # Unlock the room when clicked
+            fg_color="gold",
+            hover_color="darkred",
+            text_color="black",
+            width=150
+        )
+        return {"frame": room_frame, "room_button": room_button, "unlock_button": unlock_button, "state": None}
+
+    @metrics.timed("gui_unlock")
     def unlock_room(self, room_name):
         """
         Unlock a room if the player has enough coins.
@@ -367,12 +471,14 @@ class CasinoGUI(ctk.CTk):
         """
         room = self.game.rooms.get(room_name)  # Get the room object
         if room and room.locked:
-            if self.player.money >= room.unlock_cost:  # Check if the player has enough coins
-                self.player.deduct_money(room.unlock_cost)  # Deduct the unlock cost
-                room.locked = False  # Unlock the room
+            with self.rounds.session_lock(self.game):  # Don't race with a round that is being played
+                message = self.game.unlock_room(room_name)  # Deducts the unlock cost if the player has enough coins
+            if not room.locked:
+                if self.stats:
+                    self.stats.record_unlock(self.stats_session, room_name, room.unlock_cost, self.player.money)
                 self.update_money_display()  # Update the money display
                 self.update_room_list()  # Refresh the room list
-                self.result_label.configure(text=f"{room_name} unlocked!", text_color="green")
+                self.result_label.configure(text=message, text_color="green")
 
                 # Show the loading screen after unlocking the room
                 self.create_loading_screen(
@@ -380,8 +486,19 @@ class CasinoGUI(ctk.CTk):
                     callback=lambda: self.enter_room(room)  # Enter the room after unlocking
                 )
             else:
-                self.result_label.configure(text="Not enough coins to unlock this room!", text_color="red")
+                self.result_label.configure(text=f"{message}\n{self.unlock_route_text(room_name)}", text_color="red")
+
+    def unlock_route_text(self, room_name):
+        """
+        Describe the cheapest walk from the current room to a room, with the unlocks it needs.
+        :param room_name: The name of the room to reach.
+        """
+        plan = self.game.unlock_plan(room_name)
+        if plan is None:
+            return f"{room_name} cannot be reached from here."
+        return f"Cheapest route: {' → '.join(plan.path)} ({plan.cost} coins to unlock {', '.join(plan.unlocks)})."
 
+    @metrics.timed("gui_move")
     def move_to_room(self, room_name):
         """
         Move to the selected room and update the GUI.
@@ -392,7 +509,7 @@ class CasinoGUI(ctk.CTk):
         if room:
             if room.locked:  # Prevent moving to locked rooms
                 self.result_label.configure(
-                    text=f"{room_name} is locked. Unlock cost: {room.unlock_cost} coins.",
+                    text=f"{room_name} is locked. Unlock cost: {room.unlock_cost} coins.\n{self.unlock_route_text(room_name)}",
                     text_color="red"
                 )
                 return
@@ -405,17 +522,9 @@ class CasinoGUI(ctk.CTk):
             )
 
             self.loading_screen.pack(fill="both", expand=True)  # Show the loading screen
+            # The room list, game buttons and story are refreshed once in enter_room
 
-            # Update the current room and GUI
-            self.game.current_room = room
-            self.update_room_list()
-            self.update_game_buttons()
-            self.display_story(room.description)
-            self.result_label.configure(
-                text=f"You have entered {room.name}.",
-                text_color="green"
-            )
-
+    @metrics.timed("gui_enter_room")
     def enter_room(self, room):
         """
         Enter the specified room after the loading screen.
@@ -426,7 +535,8 @@ class CasinoGUI(ctk.CTk):
         self.main_game_screen.pack(fill="both", expand=True)  # Show the main game screen
 
         # Update the current room and GUI
-        self.game.current_room = room
+        with self.rounds.session_lock(self.game):
+            self.game.move_to_room(room.name)  # Recorded in the game's action log
         self.update_room_list()  # Update the room list to reflect the current room
         self.update_game_buttons()  # Update the game buttons for the new room
         self.display_story(room.description)  # Update the story display with the room description
@@ -438,34 +548,142 @@ class CasinoGUI(ctk.CTk):
     def update_game_buttons(self):
         """
         Update the game buttons for the current room.
-        Adds a button to play the game available in the current room.
+        Shows a button to play the game available in the current room. The button is
+        created once and reconfigured for each room, rooms without a game hide it.
         """
-        for widget in self.game_buttons:
-            widget.destroy()  # Clear all existing game buttons
-        self.game_buttons.clear()
-
         current_room = self.game.current_room
         if current_room and current_room.game:  # Check if the current room has a game
-            game_button = ctk.CTkButton(
-                self.game_buttons_frame,
-                text=f"Play {current_room.game.name}",  # Button text includes the game name
-                command=lambda: self.play_game(current_room.game.name),  # Play the game when clicked
-                fg_color="gold",
-                hover_color="darkred"
+            game_name = current_room.game.name
+            if self.game_button is None:
+                self.game_button = ctk.CTkButton(self.game_buttons_frame, fg_color="gold", hover_color="darkred")
+            self.game_button.configure(
+                text=f"Play {game_name}",  # Button text includes the game name
+                command=lambda: self.play_game(game_name)  # Play the game when clicked
             )
-            game_button.pack(pady=2, fill='x')  # Add padding and make the button fill horizontally
-            self.game_buttons.append(game_button)
+            self.game_button.pack(pady=2, fill='x')  # Add padding and make the button fill horizontally
+            self.update_choice_entry(current_room.game)
+
+            if self.odds_label is None:
+                self.odds_label = ctk.CTkLabel(self.game_buttons_frame, font=("Arial", 12), text_color="white")
+            self.odds_label.pack(pady=2)
+            self.update_odds_label()
+        elif self.game_button is not None:
+            self.game_button.pack_forget()
+            if self.odds_label is not None:
+                self.odds_label.pack_forget()
+            self.update_choice_entry(None)
+
+        self.update_game_image()
+
+    def update_choice_entry(self, casino_game):
+        """
+        Show the choice prompt and entry above the Play button for games that need a choice
+        (the horse to back, the roulette bet slip), hide them for all other games.
+        :param casino_game: The game of the current room, or None.
+        """
+        if casino_game is None or not casino_game.choice_prompt:
+            if self.choice_entry is not None:
+                self.choice_label.pack_forget()
+                self.choice_entry.pack_forget()
+            return
+        if self.choice_entry is None:
+            self.choice_label = ctk.CTkLabel(self.game_buttons_frame, font=("Arial", 12), text_color="white", wraplength=300)
+            self.choice_entry = ctk.CTkEntry(self.game_buttons_frame, width=300)
+            self.choice_entry.bind("<KeyRelease>", lambda event: self.update_odds_label())
+        self.choice_label.configure(text=casino_game.choice_prompt.strip())
+        self.choice_label.pack(pady=2, before=self.game_button)
+        self.choice_entry.pack(pady=2, before=self.game_button)
+
+    def update_odds_label(self):
+        """
+        Show the win chance and return to player of the current room's game, and the odds
+        of every horse next to the horse race prompt.
+        Odds are computed once per game type in the background (games that can't be
+        enumerated are simulated, which takes a few seconds), until then this polls.
+        For the backed horse and the roulette slip typed in so far the odds of that bet are
+        shown, other choices show the odds of the game's default bet, labelled as such.
+        Simulated odds are shown as estimates.
+        """
+        if self.odds_poll is not None:
+            self.after_cancel(self.odds_poll)
+            self.odds_poll = None
+        current_room = self.game.current_room
+        if not (current_room and current_room.game) or self.odds_label is None:
+            return
+        casino_game = current_room.game
+        pending = False
+
+        if isinstance(casino_game, classes.HorseRace) and self.choice_label is not None:
+            field_future = casino_game.request_odds()
+            if field_future.done():
+                quotes = " | ".join(f"{name} {quote:.2f}" for name, quote in zip(casino_game.horses, field_future.result().decimal_odds))
+                self.choice_label.configure(text=f"{casino_game.choice_prompt.strip()}\nOdds: {quotes}")
+            else:
+                pending = True
 
-    def play_game(self, game_name):
+        choice = self.choice_entry.get().strip() if casino_game.choice_prompt and self.choice_entry is not None else None
+        if choice and not pending:
+            try:
+                bet = int(self.bet_entry.get().strip())
+            except ValueError:
+                bet = casino_game.min_bet
+            try:
+                bet_odds = odds.choice_odds(casino_game, bet, choice)
+            except ValueError:
+                bet_odds = None  # Not a valid bet yet, the Play button explains why
+            if bet_odds is not None:
+                self.odds_label.configure(text=f"Your bet: {self.describe_odds(bet_odds)}")
+                return
+
+        future = odds.request(type(casino_game))
+        if future.done():
+            text = self.describe_odds(future.result())
+            default = odds.default_choice(casino_game)
+            if default is not None:
+                text = f"Default bet ({default}): {text}"
+            self.odds_label.configure(text=text)
+        else:
+            self.odds_label.configure(text="Calculating odds...")
+            pending = True
+
+        if pending:
+            self.odds_poll = self.after(200, self.update_odds_label)
+
+    @staticmethod
+    def describe_odds(game_odds):
         """
-        Start the game logic in a separate thread to avoid blocking the GUI
+        One line with the win chance and return to player, simulated odds marked as estimates.
+        :param game_odds: The odds.Odds to describe.
         """
-        threading.Thread(target=self._play_game_logic, args=(game_name,), daemon=True).start()
+        if game_odds.exact:
+            return f"Win chance {game_odds.win_probability:.1%} | Return to player {game_odds.rtp:.1%}"
+        return f"Win chance ≈{game_odds.win_probability:.1%} | Return to player ≈{game_odds.rtp:.1%} (simulated estimate)"
+
+    def update_game_image(self):
+        """
+        Show the picture of the current room's game, or no picture if the room has no game.
+        The image comes from the background asset cache and is only applied if the player
+        is still in a room with that game when it arrives.
+        """
+        current_room = self.game.current_room
+        game_name = current_room.game.name if current_room and current_room.game else None
+        if game_name not in assets.GAME_IMAGES:
+            self.game_image_label.configure(image=None)
+            self.game_image_label.image = None
+            return
+
+        def on_ready(image):
+            room = self.game.current_room
+            if room and room.game and room.game.name == game_name:
+                self.show_image(self.game_image_label, image)
 
-    def _play_game_logic(self, game_name):
+        self.assets.request(self, assets.GAME_IMAGES[game_name], assets.GAME_IMAGE_SIZE, on_ready)
+
+    @metrics.timed("gui_play_click")
+    def play_game(self, game_name):
         """
-        Handle the game logic for playing a game.
-        Deducts the player's bet, plays the game, and updates the UI with the result.
+        Queue a round of the game on the worker pool to avoid blocking the GUI.
+        The bet is read here on the UI thread, the worker only runs the game logic.
         :param game_name: The name of the game to play.
         """
         bet = self.get_bet()  # Get the player's bet
@@ -473,30 +691,93 @@ class CasinoGUI(ctk.CTk):
             self.result_label.configure(text="Invalid bet! Please try again.", text_color="red")
             return
 
+        choice = None
         current_room = self.game.current_room
-        if current_room and current_room.game:  # Check if the current room has a game
-            try:
-                # Deduct the bet and play the game
-                result = current_room.game.play(self.player, bet)  # Pass the bet to the play method
-
-                # Add the result to the bet history
-                self.bet_history.append(f"{game_name}: {bet} coins - {result}")
-                self.update_bet_history()  # Update the bet history display
-
-                # Update the player's money display
-                self.update_money_display()
-
-                # Display the result in the result label
-                self.result_label.configure(text=result, text_color="gold")
-            except ValueError as e:  # Handle invalid bets
-                self.result_label.configure(text=str(e), text_color="red")
-            except Exception as e:  # Handle unexpected errors
-                import traceback
-                error_message = traceback.format_exc()  # Get the full stack trace
-                print(error_message)  # Print the error to the console for debugging
-                self.result_label.configure(text=f"Error: {str(e)}", text_color="red")
-        else:
+        if current_room and current_room.game and current_room.game.choice_prompt and self.choice_entry is not None:
+            choice = self.choice_entry.get().strip()  # The horse, the bet slip, ...
+
+        if self.round_wait is not None:  # A newer click replaces a round that is still waiting
+            self.after_cancel(self.round_wait)
+            self.round_wait = None
+        self.submit_round(current_room, game_name, bet, choice)
+
+    def submit_round(self, room, game_name, bet, choice):
+        """
+        Queue a round once the room's game is ready, until then check again every 200 ms.
+        The round is dropped if the player left the room in the meantime.
+        :param room: The room the round was asked for in.
+        """
+        self.round_wait = None
+        if self.game.current_room is not room:
+            return
+        if room and room.game and not room.game.ready():
+            self.result_label.configure(text=f"{room.game.name} is still being prepared, your round starts in a moment...",
+                                         text_color="orange")
+            self.round_wait = self.after(200, self.submit_round, room, game_name, bet, choice)
+            return
+        if not self.rounds.submit(self.game, self._play_game_logic, game_name, bet, choice):
+            # Back-pressure: rounds are queued faster than they resolve
+            self.result_label.configure(text="Rounds are still being played, please wait a moment.", text_color="orange")
+
+    def _play_game_logic(self, game_name, bet, choice=None):
+        """
+        Handle the game logic for playing a game. Runs on a worker thread while holding
+        the session lock, so it must not touch any widget.
+        :param game_name: The name of the game to play.
+        :param bet: The bet read from the bet entry.
+        :param choice: The text of the choice entry for games that need a choice.
+        :return: The result text and the BetRecord of the round (None if the bet was refused),
+                 or None if there is no game.
+        """
+        if not (self.game.current_room and self.game.current_room.game):  # Check if the current room has a game
+            return None
+        history = self.game.bet_history
+        rounds_before = history.total
+        result = self.game.play_current_room_game(bet, choice)  # Deducts the bet and plays the game
+        narration = self.game.output.drain()  # Collect what the game narrated during the round
+        if narration:
+            result = f"{narration.strip()}\n{result.strip()}"
+        record = history.recent(1)[0] if history.total > rounds_before else None
+        if record and self.stats:
+            self.stats.record_round(self.stats_session, record, self.player.jackpot_wins)  # Only queued, written in the background
+        return result, record
+
+    def poll_round_results(self):
+        """
+        Apply the results of finished rounds to the UI. Runs on the Tk main thread
+        and reschedules itself.
+        """
+        self.rounds.drain(self.show_round_result)
+        self.after(20, self.poll_round_results)
+
+    @metrics.timed("gui_round_result")
+    def show_round_result(self, outcome, error):
+        """
+        Show the outcome of one round in the UI.
+        :param outcome: The (result, record) returned by _play_game_logic.
+        :param error: The exception raised by the round, if any.
+        """
+        if error is not None:
+            if isinstance(error, ValueError):  # Handle invalid bets
+                self.result_label.configure(text=str(error), text_color="red")
+            else:  # Handle unexpected errors
+                traceback.print_exception(error)  # Print the error to the console for debugging
+                self.result_label.configure(text=f"Error: {str(error)}", text_color="red")
+            return
+        if outcome is None:
             self.result_label.configure(text="No game available in this room!", text_color="red")
+            return
+
+        result, record = outcome
+        if record:
+            self.update_bet_history(record)  # Add the round to the bet history display
+            self.update_leaderboard()
+
+        # Update the player's money display
+        self.update_money_display()
+
+        # Display the result in the result label
+        self.result_label.configure(text=result, text_color="gold")
 
     def update_money_display(self):
         """
@@ -504,13 +785,51 @@ class CasinoGUI(ctk.CTk):
         """
         self.money_label.configure(text=f"Coins: {self.player.money}")
 
-    def update_bet_history(self):
+    @metrics.timed("gui_update_bet_history")
+    def update_bet_history(self, record):
         """
-        Update the bet history display with the last 10 bets made by the player.
+        Append one bet to the bet history display, which shows the last 10 bets made by the player.
+        Only the new line is inserted and the oldest one removed, the box is never redrawn.
+        :param record: The BetRecord of the round that was just played.
         """
-        self.history_listbox.delete("1.0", ctk.END)  # Clear the history listbox
-        for bet in self.bet_history[-10:]:  # Show only the last 10 bets
-            self.history_listbox.insert(ctk.END, f"{bet}\n")
+        self.history_listbox.insert(ctk.END, f"{record.describe()}\n")
+        self.history_lines += 1
+        if self.history_lines > HISTORY_LINES:
+            self.history_listbox.delete("1.0", "2.0")  # Drop the oldest line
+            self.history_lines -= 1
+
+    def update_leaderboard(self):
+        """
+        Refresh the leaderboards. The queries run on the stats store's reader thread and the
+        text is shown once it is back; rounds queued in the last half second may not be written yet.
+        """
+        if not self.stats:
+            return
+        if self.leaderboard_future is not None:
+            self.leaderboard_stale = True  # A query is still running, ask again once it is back
+            return
+        self.leaderboard_future = self.stats.request_describe()
+        self.after(20, self.show_leaderboard)
+
+    @metrics.timed("gui_update_leaderboard")
+    def show_leaderboard(self):
+        """
+        Show the leaderboard text once the query is done, until then this polls.
+        """
+        future = self.leaderboard_future
+        if not future.done():
+            self.after(20, self.show_leaderboard)
+            return
+        self.leaderboard_future = None
+        try:
+            text = future.result()
+        except sqlite3.Error as e:
+            text = f"Leaderboard unavailable: {e}"
+        self.leaderboard_textbox.delete("1.0", ctk.END)
+        self.leaderboard_textbox.insert(ctk.END, text)
+        if self.leaderboard_stale:
+            self.leaderboard_stale = False
+            self.update_leaderboard()
 
     def get_bet(self):
         """
@@ -540,6 +859,14 @@ class CasinoGUI(ctk.CTk):
         """
         Quit the game and close the application window.
         """
+        self.assets.shutdown()  # Stop background image loading
+        self.rounds.shutdown()  # Drop rounds that haven't started yet
+        if self.game:
+            self.game.bet_history.close()  # Flush archived bets to disk
+        if self.stats:
+            self.stats.end_session(self.stats_session, self.player.money, self.player.jackpot_wins)
+            self.stats.close()  # Writes what is still queued
+        metrics.export_to_env_file()  # Dump the session's metrics if CASINO_METRICS_FILE is set
         self.destroy()  # Close the application window
         
     def return_to_game(self):
@@ -0,0 +1,121 @@
+import json
+import os
+from collections import deque
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+
+class BetRecord(NamedTuple):
+    """
+    One played round: the stake, what came back (0 on a loss) and the balance afterwards.
+    Extra stakes of the round (blackjack doubles and splits) are subtracted from the payout,
+    so it can be negative.
+    """
+    game: str
+    bet: int
+    payout: int
+    balance: int
+
+    def describe(self) -> str:
+        """
+        One-line text for history displays.
+        """
+        if self.payout > self.bet:
+            outcome = f"won {self.payout - self.bet}"
+        elif self.payout == self.bet:
+            outcome = "stake refunded"
+        else:
+            outcome = f"lost {self.bet - self.payout}"
+        return f"{self.game}: {self.bet} coins - {outcome} (balance {self.balance})"
+
+
+def rotate_archive(path: str) -> str:
+    """
+    Prepare the archive file of a new session: the previous session's archive is kept
+    as path + ".1" (replacing an older one), so the archive only ever holds the bets of
+    the current session. Creates the directory if needed and returns path.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if os.path.exists(path):
+        os.replace(path, path + ".1")
+    return path
+
+
+class BetHistory:
+    """
+    Bounded bet history.
+    The newest records live in an in-memory ring of fixed capacity. Records that fall out
+    of the ring are appended to a JSON-lines archive file if one is configured, otherwise
+    they are dropped. Memory and time per round stay constant however long a session runs.
+    """
+    __slots__ = ("capacity", "archive_path", "archived", "_ring", "_archive_file")
+
+    def __init__(self, capacity: int = 100, archive_path: Optional[str] = None):
+        self.capacity = capacity
+        self.archive_path = archive_path
+        self.archived = 0
+        # An empty deque already allocates a block of 64 slots, so the ring is only
+        # created with the first record (many server sessions never play a round)
+        self._ring = ()
+        self._archive_file = None
+
+    def append(self, record: BetRecord):
+        if not self._ring:
+            self._ring = deque(maxlen=self.capacity)
+        elif len(self._ring) == self.capacity:
+            self._archive(self._ring[0])
+        self._ring.append(record)
+
+    def extend(self, records: Iterable[BetRecord]):
+        for record in records:
+            self.append(record)
+
+    def recent(self, count: int) -> List[BetRecord]:
+        """
+        Return up to the last count records, oldest first.
+        """
+        start = max(0, len(self._ring) - count)
+        return [self._ring[index] for index in range(start, len(self._ring))]
+
+    @property
+    def total(self) -> int:
+        """
+        Number of rounds recorded, including archived ones.
+        """
+        return self.archived + len(self._ring)
+
+    def archived_records(self) -> Iterator[BetRecord]:
+        """
+        Stream the archived records from disk, oldest first.
+        """
+        if not self.archive_path or not os.path.exists(self.archive_path):
+            return
+        self.flush()
+        with open(self.archive_path, "r", encoding="utf-8") as archive:
+            for line in archive:
+                if line.strip():
+                    yield BetRecord(*json.loads(line))
+
+    def flush(self):
+        if self._archive_file:
+            self._archive_file.flush()
+
+    def close(self):
+        if self._archive_file:
+            self._archive_file.close()
+            self._archive_file = None
+
+    def _archive(self, record: BetRecord):
+        self.archived += 1
+        if not self.archive_path:
+            return
+        if self._archive_file is None:
+            self._archive_file = open(self.archive_path, "a", encoding="utf-8")
+        self._archive_file.write(json.dumps(list(record), ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def __iter__(self) -> Iterator[BetRecord]:
+        return iter(self._ring)
+
+    def __len__(self) -> int:
+        return len(self._ring)
@@ -0,0 +1,166 @@
+"""
+Horse race simulator.
+Every horse has a top speed and a stamina: it runs near its top speed for stamina seconds
+and then tires, losing FATIGUE of its top speed per further second. Each second (tick)
+adds random pace noise. Speed per tick then only depends on the tick, not on the distance
+run, so a whole race is one array of paces per tick and horse and the positions are its
+cumulative sum, for one race or ten thousand at once.
+
+Odds are fair odds from a pre-simulation of many races per field, less the house margin.
+They are memoized per field and can be computed on a background thread, see request_odds().
+"""
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+DISTANCE = 1200.0  # Metres
+MAX_TICKS = 100  # Seconds, the slowest tired horse still finishes well within
+FATIGUE = 0.01  # Share of the top speed lost per second run beyond the stamina
+MIN_PACE = 0.4  # Tired horses never drop below this share of their top speed
+PACE_NOISE = 0.12  # Standard deviation of the pace per tick, relative to the top speed
+
+ODDS_RACES = 100_000  # Races simulated per field for its odds
+ODDS_SEED = 20_240_601  # Fixed, so every session pays the same odds for the same field
+HOUSE_MARGIN = 0.25  # Like the old flat 3x payout on four equally likely horses
+BATCH_RACES = 10_000  # Keeps one batch of positions around 16 MB
+
+
+class Horse(NamedTuple):
+    name: str
+    speed: float  # Top speed in metres per second
+    stamina: float  # Seconds the horse holds its top speed
+
+
+FIELD = (
+    Horse("Blitz", 18.0, 46.0),  # A sprinter that fades over the last 400 m
+    Horse("Donner", 17.5, 60.0),
+    Horse("Wind", 17.7, 52.0),
+    Horse("Sturm", 17.35, 70.0),  # The stayer
+)
+
+
+def _field_arrays(field: Tuple[Horse, ...]) -> Tuple[np.ndarray, np.ndarray]:
+    return (np.array([horse.speed for horse in field], dtype=np.float32),
+            np.array([horse.stamina for horse in field], dtype=np.float32))
+
+
+def race_positions(field: Tuple[Horse, ...], races: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Distance covered by every horse after every tick, shape (races, ticks, horses).
+    """
+    speed, stamina = _field_arrays(field)
+    ticks = np.arange(1, MAX_TICKS + 1, dtype=np.float32)[:, None]
+    # Pace without noise, the same for every race: (ticks, horses)
+    tiredness = np.maximum(1 - FATIGUE * np.maximum(ticks - stamina, 0), MIN_PACE)
+    base_pace = speed * tiredness
+    noise = rng.standard_normal((races, MAX_TICKS, len(field)), dtype=np.float32)
+    pace = base_pace * (1 + PACE_NOISE * noise)
+    np.maximum(pace, 0, out=pace)
+    return np.cumsum(pace, axis=1, out=pace)
+
+
+def finish_times(positions: np.ndarray) -> np.ndarray:
+    """
+    Time in seconds at which every horse crosses the line, interpolated within its last tick,
+    shape (races, horses).
+    """
+    crossed = positions >= DISTANCE
+    last_tick = positions.shape[1] - 1
+    # First tick at or beyond the line, horses that never get there finish after the last tick
+    tick = np.where(crossed.any(axis=1), crossed.argmax(axis=1), last_tick)
+    after = np.take_along_axis(positions, tick[:, None, :], axis=1)[:, 0, :]
+    before = np.where(tick > 0, np.take_along_axis(positions, np.maximum(tick - 1, 0)[:, None, :], axis=1)[:, 0, :], 0)
+    run = np.maximum(after - before, 1e-6)
+    return tick + np.clip((DISTANCE - before) / run, 0, 1)
+
+
+def winners(field: Tuple[Horse, ...], races: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Index of the winning horse of many races.
+    """
+    result = np.empty(races, dtype=np.int8)
+    for start in range(0, races, BATCH_RACES):
+        size = min(BATCH_RACES, races - start)
+        result[start:start + size] = finish_times(race_positions(field, size, rng)).argmin(axis=1)
+    return result
+
+
+class Race(NamedTuple):
+    field: Tuple[Horse, ...]
+    positions: np.ndarray  # Distance per tick and horse, up to the tick the last horse finished
+    order: Tuple[int, ...]  # Horse indexes from first to last past the line
+
+    @property
+    def winner(self) -> Horse:
+        return self.field[self.order[0]]
+
+
+def run_race(field: Tuple[Horse, ...], rng: np.random.Generator,
+             on_tick: Optional[Callable[[int, Tuple[float, ...]], None]] = None) -> Race:
+    """
+    Run one race.
+    :param on_tick: Called with the tick number and the distance of every horse after each
+                    tick, e.g. to animate the race. Positions are capped at the finish line.
+    """
+    positions = race_positions(field, 1, rng)[0]
+    times = finish_times(positions[None])[0]
+    ticks = min(int(np.ceil(times.max())), MAX_TICKS)
+    positions = np.minimum(positions[:ticks], DISTANCE)
+    if on_tick is not None:
+        for tick, row in enumerate(positions.tolist(), start=1):
+            on_tick(tick, tuple(row))
+    return Race(field, positions, tuple(int(index) for index in np.argsort(times, kind="stable")))
+
+
+class FieldOdds(NamedTuple):
+    probabilities: Tuple[float, ...]  # Chance of each horse to win
+    decimal_odds: Tuple[float, ...]  # Coins paid per coin staked on a winner, stake included
+
+    def payout(self, index: int, bet: int) -> int:
+        # Odds are quoted in hundredths, so whole coins are paid without float rounding
+        return bet * round(self.decimal_odds[index] * 100) // 100
+
+
+_preloaded: Dict[Tuple[Horse, ...], FieldOdds] = {}
+
+
+def preload(table: Dict[Tuple[Horse, ...], FieldOdds]):
+    """
+    Use field odds computed elsewhere, e.g. handed to a worker process by its parent, so
+    the races aren't pre-simulated again in every process.
+    """
+    _preloaded.update(table)
+
+
+@functools.lru_cache(maxsize=64)
+def odds_for_field(field: Tuple[Horse, ...] = FIELD) -> FieldOdds:
+    """
+    Odds of a field from a seeded pre-simulation of ODDS_RACES races, computed once per field.
+    The house keeps HOUSE_MARGIN of the fair odds, quoted odds are rounded down to hundredths.
+    """
+    if field in _preloaded:
+        return _preloaded[field]
+    wins = np.bincount(winners(field, ODDS_RACES, np.random.default_rng(ODDS_SEED)), minlength=len(field))
+    probabilities = tuple(float(count) / ODDS_RACES for count in wins)
+    decimal_odds = tuple(max(1.0, int((1 - HOUSE_MARGIN) / max(probability, 1e-6) * 100) / 100)
+                         for probability in probabilities)
+    return FieldOdds(probabilities, decimal_odds)
+
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="horse-odds")
+_requests: Dict[Tuple[Horse, ...], Future] = {}
+_requests_lock = threading.Lock()
+
+
+def request_odds(field: Tuple[Horse, ...] = FIELD) -> Future:
+    """
+    Odds of a field computed on a background thread, repeated calls share the same future.
+    """
+    with _requests_lock:
+        future = _requests.get(field)
+        if future is None:
+            future = _requests[field] = _executor.submit(odds_for_field, field)
+        return future
@@ -0,0 +1,69 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from modules import horserace
+
+# The sprinter and the stayer alone, so the odds tests don't share a cache entry with the real field
+FIELD = (horserace.FIELD[0], horserace.FIELD[3])
+
+
+class RaceTest(unittest.TestCase):
+    def test_race_is_seeded(self):
+        first = horserace.run_race(horserace.FIELD, np.random.default_rng(4))
+        second = horserace.run_race(horserace.FIELD, np.random.default_rng(4))
+        self.assertEqual(first.order, second.order)
+        self.assertEqual(sorted(first.order), list(range(len(horserace.FIELD))))
+        self.assertTrue((first.positions[-1] <= horserace.DISTANCE).all())
+        self.assertEqual(first.positions[-1].max(), horserace.DISTANCE)
+
+    def test_ticks_are_reported(self):
+        ticks = []
+        race = horserace.run_race(horserace.FIELD, np.random.default_rng(4), lambda tick, row: ticks.append(tick))
+        self.assertEqual(ticks, list(range(1, len(race.positions) + 1)))
+
+
+class OddsTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(horserace, "ODDS_RACES", 4000)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_odds_model(self):
+        odds = horserace.odds_for_field.__wrapped__(FIELD)
+        self.assertAlmostEqual(sum(odds.probabilities), 1)
+        self.assertGreater(odds.probabilities[1], odds.probabilities[0])  # The stayer over 1200 m
+        self.assertLess(odds.decimal_odds[1], odds.decimal_odds[0])
+        for probability, quote in zip(odds.probabilities, odds.decimal_odds):
+            self.assertGreaterEqual(quote, 1.0)
+            self.assertAlmostEqual(quote * 100, round(quote * 100))  # Quoted in hundredths
+            # Rounded down from the fair odds less the margin, the house keeps at least HOUSE_MARGIN
+            self.assertLessEqual(probability * quote, 1 - horserace.HOUSE_MARGIN + 1e-9)
+            self.assertGreater(probability * quote, 1 - horserace.HOUSE_MARGIN - 0.01 * probability)
+        self.assertEqual(horserace.odds_for_field.__wrapped__(FIELD), odds)  # Seeded
+
+    def test_payout_pays_whole_coins(self):
+        odds = horserace.FieldOdds((0.5, 0.5), (3.88, 1.5))
+        self.assertEqual(odds.payout(0, 100), 388)  # 3.88 is not exact in binary
+        self.assertEqual(odds.payout(1, 5), 7)
+
+    def test_odds_are_cached(self):
+        with mock.patch.object(horserace, "winners", wraps=horserace.winners) as winners:
+            odds = horserace.odds_for_field(FIELD)
+            self.assertIs(horserace.odds_for_field(FIELD), odds)
+        self.assertLessEqual(winners.call_count, 1)  # None if an earlier test already cached the field
+
+        preloaded = horserace.FieldOdds((0.25, 0.75), (3.0, 1.0))
+        field = FIELD[::-1]
+        with mock.patch.dict(horserace._preloaded, {field: preloaded}):
+            self.assertEqual(horserace.odds_for_field.__wrapped__(field), preloaded)
+
+    def test_request_odds(self):
+        future = horserace.request_odds(FIELD)
+        self.assertIs(horserace.request_odds(FIELD), future)
+        self.assertEqual(future.result(timeout=60), horserace.odds_for_field(FIELD))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+"""
+Lightweight in-process metrics for the game engine and the GUI.
+Counters and timers live in one registry that can be dumped as JSON or written as a
+Prometheus text file. Recording is off by default and then costs a single attribute
+check per instrumented call. Enable it with registry.enable() or CASINO_METRICS=1;
+CASINO_METRICS_FILE names the file export_to_env_file() writes (.json or Prometheus text).
+"""
+import functools
+import json
+import os
+import threading
+import time
+from typing import Dict, Tuple
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class MetricsRegistry:
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        # name, labels -> [count, total seconds, max seconds]
+        self._timers: Dict[Tuple[str, Labels], list] = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._timers.clear()
+
+    def inc(self, name: str, value: float = 1, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            timer = self._timers.get(key)
+            if timer is None:
+                self._timers[key] = [1, seconds, seconds]
+            else:
+                timer[0] += 1
+                timer[1] += seconds
+                if seconds > timer[2]:
+                    timer[2] = seconds
+
+    def record_round(self, game: str, bet: int, payout: int):
+        """
+        Count one played round and the coins that changed hands, per game.
+        """
+        if not self.enabled:
+            return
+        outcome = "win" if payout > bet else "push" if payout == bet else "loss"
+        self.inc("casino_rounds_total", game=game, outcome=outcome)
+        self.inc("casino_coins_wagered_total", bet, game=game)
+        self.inc("casino_coins_paid_total", payout, game=game)
+
+    def to_dict(self) -> dict:
+        """
+        Snapshot of all metrics, including the observed house edge per game.
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            timers = {key: list(value) for key, value in self._timers.items()}
+
+        def label_text(labels: Labels) -> str:
+            return ",".join(f"{key}={value}" for key, value in labels)
+
+        snapshot = {"counters": {}, "timers": {}, "house_edge": {}}
+        for (name, labels), value in counters.items():
+            snapshot["counters"].setdefault(name, {})[label_text(labels)] = value
+        for (name, labels), (count, total, maximum) in timers.items():
+            snapshot["timers"].setdefault(name, {})[label_text(labels)] = {
+                "count": count, "total_seconds": total, "mean_seconds": total / count, "max_seconds": maximum,
+            }
+        wagered = snapshot["counters"].get("casino_coins_wagered_total", {})
+        paid = snapshot["counters"].get("casino_coins_paid_total", {})
+        for labels, coins in wagered.items():
+            if coins:
+                snapshot["house_edge"][labels] = 1 - paid.get(labels, 0) / coins
+        return snapshot
+
+    def prometheus_text(self) -> str:
+        """
+        The metrics in the Prometheus text exposition format. Timers become summaries
+        (_count and _sum) plus a separate _max gauge.
+        """
+        with self._lock:
+            counters = sorted(self._counters.items())
+            timers = sorted((key, list(value)) for key, value in self._timers.items())
+
+        def series(name: str, labels: Labels, value: float) -> str:
+            label_text = ",".join(f'{key}="{value}"' for key, value in labels)
+            return f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}"
+
+        lines = []
+        declared = set()
+
+        def declare(name: str, kind: str):
+            if name not in declared:
+                lines.append(f"# TYPE {name} {kind}")
+                declared.add(name)
+
+        for (name, labels), value in counters:
+            declare(name, "counter")
+            lines.append(series(name, labels, value))
+        for (name, labels), (count, total, maximum) in timers:
+            declare(name, "summary")
+            lines.append(series(f"{name}_count", labels, count))
+            lines.append(series(f"{name}_sum", labels, total))
+        for (name, labels), (count, total, maximum) in timers:
+            declare(f"{name}_max", "gauge")
+            lines.append(series(f"{name}_max", labels, maximum))
+        return "\n".join(lines) + "\n"
+
+    def dump_json(self, path: str):
+        self._write(path, json.dumps(self.to_dict(), indent=2))
+
+    def write_prometheus(self, path: str):
+        self._write(path, self.prometheus_text())
+
+    @staticmethod
+    def _write(path: str, text: str):
+        # Write atomically so a scraper never sees half a file
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as metrics_file:
+            metrics_file.write(text)
+        os.replace(temp_path, path)
+
+
+registry = MetricsRegistry(enabled=os.environ.get("CASINO_METRICS", "") not in ("", "0"))
+
+
+def export_to_env_file():
+    """
+    Write the registry to the file named by CASINO_METRICS_FILE, if metrics are enabled.
+    Files ending in .json get JSON, everything else the Prometheus text format.
+    """
+    path = os.environ.get("CASINO_METRICS_FILE")
+    if not registry.enabled or not path:
+        return
+    if path.endswith(".json"):
+        registry.dump_json(path)
+    else:
+        registry.write_prometheus(path)
+
+
+def timed(action: str, metric: str = "casino_action_seconds"):
+    """
+    Decorator that counts and times every call of a function as one action.
+    When the registry is disabled the wrapped function runs without any timing.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                registry.observe(metric, time.perf_counter() - started, action=action)
+        return wrapper
+    return decorator
@@ -0,0 +1,340 @@
+"""
+Odds of the casino games under their current rules, exact wherever a round can be enumerated.
+Instead of restating the rules, the calculator drives a game's real play() with a scripted
+random stream and walks every path the round can take: each randint() or choice() call is
+branched over all of its values, so the outcome distribution is exact and follows any rule
+change automatically. Games whose rounds have too many paths (or draw continuous numbers)
+fall back to a large batch simulation, so their odds are estimates (Odds.exact is False)
+and front ends should label them as such. Results are memoized per game class, which is one
+rule set (tables with another minimum bet are their own class, see CasinoGame.shared).
+
+Run from the repository root:  python -m modules.odds
+"""
+import functools
+import inspect
+import sys
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from fractions import Fraction
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from modules import classes, horserace
+
+MAX_OUTCOMES = 200_000  # Paths per round above which a game is simulated instead
+SIMULATED_ROUNDS = 500_000
+
+
+class TooManyOutcomes(Exception):
+    """
+    Raised while enumerating a round that can't be enumerated exactly.
+    """
+
+
+class ScriptedRandom:
+    """
+    Stand-in for random.Random that returns a scripted sequence of choices.
+    Call i returns option script[i] (option 0 once the script runs out) and records how
+    many options it had, so the caller can step through every combination.
+    """
+
+    def __init__(self, script: List[int]):
+        self.script = script
+        self.values: List[int] = []
+        self.sizes: List[int] = []
+
+    def _pick(self, size: int) -> int:
+        if size <= 0:
+            raise ValueError("Empty range.")
+        position = len(self.values)
+        value = self.script[position] if position < len(self.script) else 0
+        self.values.append(value)
+        self.sizes.append(size)
+        return value
+
+    def randrange(self, start: int, stop: Optional[int] = None, step: int = 1) -> int:
+        if stop is None:
+            start, stop = 0, start
+        return start + step * self._pick(len(range(start, stop, step)))
+
+    def randint(self, a: int, b: int) -> int:
+        return a + self._pick(b - a + 1)
+
+    def choice(self, sequence):
+        return sequence[self._pick(len(sequence))]
+
+    def random(self) -> float:
+        raise TooManyOutcomes("The round draws continuous random numbers.")
+
+    def getrandbits(self, k: int) -> int:
+        raise TooManyOutcomes("The round seeds another random generator.")
+
+    def shuffle(self, sequence):
+        raise TooManyOutcomes("The round shuffles a deck.")
+
+    def sample(self, population, k):
+        raise TooManyOutcomes("The round deals from a deck.")
+
+    uniform = gauss = random
+
+
+class Odds(NamedTuple):
+    """
+    Distribution of the gross payout per coin staked (0 for a lost round, 1 for a refund).
+    Probabilities are exact fractions when exact is True, simulated frequencies otherwise.
+    """
+    game: str
+    outcomes: Dict[Tuple[Fraction, bool], Fraction]  # (multiplier, jackpot) -> probability
+    paths: int
+    exact: bool
+
+    @property
+    def rtp(self) -> float:
+        """Return to player: expected coins paid out per coin staked."""
+        return float(sum(multiplier * probability for (multiplier, _), probability in self.outcomes.items()))
+
+    @property
+    def house_edge(self) -> float:
+        return 1 - self.rtp
+
+    @property
+    def variance(self) -> float:
+        """Variance of the payout per coin staked."""
+        mean = sum(multiplier * probability for (multiplier, _), probability in self.outcomes.items())
+        return float(sum((multiplier - mean) ** 2 * probability for (multiplier, _), probability in self.outcomes.items()))
+
+    @property
+    def win_probability(self) -> float:
+        return float(sum(probability for (multiplier, _), probability in self.outcomes.items() if multiplier > 1))
+
+    @property
+    def push_probability(self) -> float:
+        return float(sum(probability for (multiplier, _), probability in self.outcomes.items() if multiplier == 1))
+
+    @property
+    def jackpot_probability(self) -> float:
+        return float(sum(probability for (_, jackpot), probability in self.outcomes.items() if jackpot))
+
+    def summary(self) -> dict:
+        return {
+            "game": self.game,
+            "exact": self.exact,
+            "paths": self.paths,
+            "rtp": self.rtp,
+            "house_edge": self.house_edge,
+            "variance": self.variance,
+            "win_probability": self.win_probability,
+            "push_probability": self.push_probability,
+            "jackpot_probability": self.jackpot_probability,
+        }
+
+
+def default_choice(casino_game: classes.CasinoGame):
+    """
+    The fixed decision the odds of a game are computed for, None for games without one.
+    Front ends showing these odds next to another choice should say they are the default bet's,
+    or use choice_odds() where it applies.
+    """
+    if isinstance(casino_game, classes.HorseRace):
+        return casino_game.horses[0]
+    if isinstance(casino_game, classes.Roulette):
+        return 17
+    if isinstance(casino_game, classes.Baccarat):
+        return casino_game.bet_on(None)
+    return None
+
+
+def _rounds(casino_game: classes.CasinoGame, bet: int, choice):
+    """
+    Play every possible path of one round once.
+    Yields the scripted random stream of each path and the player after the round.
+    """
+    output = classes.NullSink()
+    script: List[int] = []
+    while True:
+        rng = ScriptedRandom(script)
+        player = classes.Player("Odds", starting_money=bet)
+        casino_game.play(player, bet, choice, output, rng)
+        yield rng, player
+
+        # Advance the rightmost call that still has options left, like an odometer;
+        # calls after it start again from option 0 (their number may differ per path)
+        position = len(rng.values) - 1
+        while position >= 0 and rng.values[position] + 1 == rng.sizes[position]:
+            position -= 1
+        if position < 0:
+            return
+        script = rng.values[:position] + [rng.values[position] + 1]
+
+
+def enumerate_odds(casino_game: classes.CasinoGame, choice=None) -> Odds:
+    """
+    Exact outcome distribution of one round, raises TooManyOutcomes if it has too many paths.
+    """
+    bet = casino_game.min_bet
+    choice = choice if choice is not None else default_choice(casino_game)
+    error = casino_game.check_bet(classes.Player("Odds", starting_money=bet), bet, choice)
+    if error:
+        raise ValueError(error)
+
+    outcomes: Dict[Tuple[Fraction, bool], Fraction] = {}
+    paths = 0
+    for rng, player in _rounds(casino_game, bet, choice):
+        paths += 1
+        if paths > MAX_OUTCOMES:
+            raise TooManyOutcomes(f"{casino_game.name} has more than {MAX_OUTCOMES} paths per round.")
+        weight = 1
+        for size in rng.sizes:
+            weight *= size
+        key = (Fraction(player.money, bet), player.jackpot_wins > 0)
+        outcomes[key] = outcomes.get(key, 0) + Fraction(1, weight)
+    return Odds(casino_game.name, outcomes, paths, exact=True)
+
+
+def simulated_odds(casino_game: classes.CasinoGame, rounds: int = SIMULATED_ROUNDS) -> Odds:
+    """
+    Outcome frequencies from a seeded batch simulation, for games that can't be enumerated.
+    """
+    result = casino_game.simulate(rounds, casino_game.min_bet, rng=0)
+    counts = Counter(zip(result.payouts.tolist(), result.jackpots.tolist()))
+    outcomes = {(Fraction(payout, result.bet), jackpot): Fraction(count, rounds) for (payout, jackpot), count in counts.items()}
+    return Odds(casino_game.name, outcomes, rounds, exact=False)
+
+
+def choice_odds(casino_game: classes.CasinoGame, bet: int, choice) -> Optional[Odds]:
+    """
+    Odds of one particular bet where they are cheap to get: the backed horse (from the field
+    odds, so an estimate) or a roulette bet slip (exact). None for games whose odds only
+    come for the default choice. Raises ValueError if the choice can't be played for bet.
+    The horse race simulates its field odds on first use, wait for its request_odds() first.
+    """
+    if not isinstance(casino_game, (classes.HorseRace, classes.Roulette)):
+        return None
+    error = casino_game.check_bet(classes.Player("Odds", starting_money=bet), bet, choice)
+    if error:
+        raise ValueError(error)
+
+    if isinstance(casino_game, classes.Roulette):
+        slip = casino_game.bet_slip(bet, choice)
+        outcomes: Dict[Tuple[Fraction, bool], Fraction] = {}
+        for returned in slip.returns:
+            key = (Fraction(returned, bet), False)
+            outcomes[key] = outcomes.get(key, 0) + Fraction(1, len(slip.returns))
+        return Odds(casino_game.name, outcomes, len(slip.returns), exact=True)
+
+    index = casino_game.horses.index(str(choice).strip())
+    field_odds = casino_game.odds()
+    probability = Fraction(field_odds.probabilities[index]).limit_denominator(horserace.ODDS_RACES)
+    outcomes = {(Fraction(field_odds.payout(index, bet), bet), False): probability}
+    if probability < 1:
+        outcomes[(Fraction(0), False)] = 1 - probability
+    return Odds(casino_game.name, outcomes, horserace.ODDS_RACES, exact=False)
+
+
+_preloaded: Dict[Tuple[str, int], Odds] = {}
+
+
+def table_key(game_type: type) -> Tuple[str, int]:
+    """
+    Key of a game class in a preload table: its name and minimum bet. The variant classes
+    of CasinoGame.shared() are made at runtime and can't be pickled, their keys can.
+    """
+    return game_type.__name__, game_type.min_bet
+
+
+def preload(table: Dict[Tuple[str, int], Odds]):
+    """
+    Use odds computed elsewhere, e.g. handed to a worker process by its parent, so
+    simulated games aren't sampled again in every process. The table is keyed by table_key().
+    """
+    _preloaded.update(table)
+
+
+@functools.lru_cache(maxsize=None)
+def odds_for(game_type: type) -> Odds:
+    """
+    Odds of a game class, computed once per class: exact if a round has at most MAX_OUTCOMES
+    paths, otherwise estimated from SIMULATED_ROUNDS simulated rounds (exact is False).
+    """
+    key = table_key(game_type)
+    if key in _preloaded:
+        return _preloaded[key]
+    casino_game = game_type.shared()
+    try:
+        return enumerate_odds(casino_game)
+    except TooManyOutcomes:
+        return simulated_odds(casino_game)
+
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="odds")
+_requests: Dict[type, Future] = {}
+_requests_lock = threading.Lock()
+
+
+def request(game_type: type) -> Future:
+    """
+    Odds of a game class computed on a background thread, for front ends that must not
+    block while a simulated game is being sampled. Returns the same future for every call.
+    """
+    with _requests_lock:
+        future = _requests.get(game_type)
+        if future is None:
+            future = _requests[game_type] = _executor.submit(odds_for, game_type)
+        return future
+
+
+def unreachable_lines(game_type: type) -> List[Tuple[int, str]]:
+    """
+    Lines of a game's play() that no possible round of a valid bet executes.
+    The early return of rejected bets is left out, only valid bets are enumerated.
+    """
+    play = game_type.play
+    code = play.__code__
+    source, first_line = inspect.getsourcelines(play)
+    executed = set()
+
+    def tracer(frame, event, arg):
+        if frame.f_code is not code:
+            return None
+        if event == "line":
+            executed.add(frame.f_lineno)
+        return tracer
+
+    casino_game = game_type.shared()
+    previous = sys.gettrace()
+    sys.settrace(tracer)
+    try:
+        for _ in _rounds(casino_game, casino_game.min_bet, default_choice(casino_game)):
+            pass
+    finally:
+        sys.settrace(previous)
+
+    body_lines = {line for _, _, line in code.co_lines() if line is not None and line > code.co_firstlineno}
+    unreachable = []
+    for line in sorted(body_lines - executed):
+        text = source[line - first_line].strip()
+        if text != "return error":
+            unreachable.append((line, text))
+    return unreachable
+
+
+def main():
+    game_types = list(classes.WorldTemplate.GAME_TYPES.values())
+    print(f"{'game':<12} {'win':>8} {'push':>8} {'jackpot':>8} {'RTP':>8} {'edge':>8} {'variance':>9}  method")
+    for game_type in game_types:
+        odds = odds_for(game_type)
+        method = f"exact, {odds.paths} paths" if odds.exact else f"simulated, {odds.paths:,} rounds"
+        print(f"{odds.game:<12} {odds.win_probability:>8.2%} {odds.push_probability:>8.2%} {odds.jackpot_probability:>8.2%} "
+              f"{odds.rtp:>8.2%} {odds.house_edge:>8.2%} {odds.variance:>9.3f}  {method}")
+    for game_type in game_types:
+        if not odds_for(game_type).exact:
+            continue
+        lines = unreachable_lines(game_type)
+        if lines:
+            print(f"\nUnreachable code in {game_type.__name__}.play():")
+            for line, text in lines:
+                print(f"  line {line}: {text}")
+
+
+if __name__ == "__main__":
+    main()
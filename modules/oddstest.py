@@ -0,0 +1,79 @@
+import unittest
+from fractions import Fraction
+from unittest import mock
+
+from modules import classes, odds
+
+
+class EnumerateTest(unittest.TestCase):
+    def test_slots(self):
+        slots = odds.enumerate_odds(classes.Slots())
+        self.assertTrue(slots.exact)
+        self.assertEqual(slots.paths, 5 ** 5)
+        self.assertEqual(sum(slots.outcomes.values()), 1)
+        # Four or five different symbols lose: 5 * 240 + 120 of the 3125 reel combinations
+        losing = Fraction(1320, 3125)
+        self.assertEqual(slots.outcomes, {(Fraction(0), False): losing, (Fraction(2), False): 1 - losing})
+        self.assertAlmostEqual(slots.rtp, float(2 * (1 - losing)))
+        self.assertEqual(slots.jackpot_probability, 0)
+
+    def test_roulette_keeps_the_zero(self):
+        roulette = odds.enumerate_odds(classes.Roulette())
+        self.assertEqual(roulette.paths, 37)
+        self.assertEqual(sum(roulette.outcomes.values()), 1)
+        self.assertAlmostEqual(roulette.rtp, 36 / 37)
+        self.assertLessEqual(roulette.rtp, 1)
+        self.assertAlmostEqual(roulette.house_edge, 1 / 37)
+
+    def test_invalid_choice(self):
+        with self.assertRaises(ValueError):
+            odds.enumerate_odds(classes.Roulette(), "purple")
+
+
+class FallbackTest(unittest.TestCase):
+    def test_too_many_paths_are_simulated(self):
+        with mock.patch.object(odds, "MAX_OUTCOMES", 100):
+            with self.assertRaises(odds.TooManyOutcomes):
+                odds.enumerate_odds(classes.Slots())
+            simulated = odds.odds_for.__wrapped__(classes.Slots)  # Past the cache of the exact odds
+        self.assertFalse(simulated.exact)
+        self.assertEqual(simulated.paths, odds.SIMULATED_ROUNDS)
+        self.assertEqual(sum(simulated.outcomes.values()), 1)
+        self.assertAlmostEqual(simulated.rtp, odds.odds_for(classes.Slots).rtp, delta=0.01)
+        self.assertEqual(odds.simulated_odds(classes.Slots(), 1000), odds.simulated_odds(classes.Slots(), 1000))
+
+    def test_preloaded_odds_are_used(self):
+        game_type = type(classes.Slots.shared(3))
+        preloaded = odds.Odds("Slots", {(Fraction(1), False): Fraction(1)}, 1, exact=True)
+        with mock.patch.dict(odds._preloaded, {("Slots", 3): preloaded}):
+            self.assertEqual(odds.odds_for.__wrapped__(game_type), preloaded)
+
+
+class ChoiceTest(unittest.TestCase):
+    def test_horse_odds(self):
+        race = classes.HorseRace()
+        field = race.odds()
+        for index, horse in enumerate(race.horses):
+            horse_odds = odds.choice_odds(race, 10, horse)
+            self.assertFalse(horse_odds.exact)
+            self.assertEqual(sum(horse_odds.outcomes.values()), 1)
+            self.assertAlmostEqual(horse_odds.win_probability, field.probabilities[index])
+            self.assertLessEqual(horse_odds.rtp, 1)
+        self.assertIsNone(odds.choice_odds(classes.Slots(), 2, None))
+        with self.assertRaises(ValueError):
+            odds.choice_odds(race, 10, "Pegasus")
+
+
+class UnreachableLinesTest(unittest.TestCase):
+    def test_slots_branches_after_the_two_of_a_kind_win(self):
+        # At most three symbols wins first, so the jackpot (one symbol) and two symbols never pay
+        lines = [text for _, text in odds.unreachable_lines(classes.Slots)]
+        self.assertIn("winnings = bet * 10", lines)
+        self.assertIn("player.increment_jackpot_wins()", lines)
+        self.assertIn("winnings = bet * 5", lines)
+        self.assertNotIn("winnings = bet * 2", lines)
+        self.assertNotIn("player.deduct_money(bet)", lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
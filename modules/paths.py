@@ -0,0 +1,9 @@
+"""
+Where the game keeps its files outside the repository, shared by the GUI and the headless modules.
+"""
+import os
+
+# Player data that outlives a session: the stats database and the bet history archive
+DATA_DIR = os.path.join(os.path.expanduser("~"), ".local", "share", "golden_casino_requiem")
+# Files the game can rebuild: poker lookup tables and resized images
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "golden_casino_requiem")
@@ -0,0 +1,305 @@
+"""
+Lookup-table poker hand evaluator for five- and seven-card hands.
+Cards are numbered 0-51: rank = card // 4 (0 is a deuce, 12 an ace), suit = card % 4.
+A hand's value runs from 1 (the weakest five-card hand) to 7462 (a royal flush); a higher
+value beats a lower one and equally strong hands have the same value.
+
+Without a flush a hand's value only depends on its ranks. Every rank has a weight chosen
+so that the weight sums of all rank multisets of one hand size are distinct, which makes
+the sum a perfect hash into a table of values. The suits are counted three bits per suit
+in the same key: a hand of at most seven cards has a flush in at most one suit, and the
+flush is then looked up by the 13-bit rank mask of that suit. Evaluating a hand is one
+sum over its cards plus two table lookups, and evaluate_batch() does that for a whole
+NumPy array of hands at once.
+
+The tables take a few seconds to build and are cached on disk, see tables().
+"""
+import functools
+import logging
+import os
+import threading
+from itertools import combinations
+from typing import Dict, Iterator, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from modules.paths import CACHE_DIR
+
+log = logging.getLogger(__name__)
+
+TABLE_VERSION = 1
+
+RANK_NAMES = ("2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A")
+SUIT_NAMES = ("♣", "♦", "♥", "♠")
+CATEGORY_NAMES = ("High Card", "Pair", "Two Pair", "Three of a Kind", "Straight",
+                  "Flush", "Full House", "Four of a Kind", "Straight Flush")
+HIGH_CARD, PAIR, TWO_PAIR, THREE_OF_A_KIND, STRAIGHT, FLUSH, FULL_HOUSE, FOUR_OF_A_KIND, STRAIGHT_FLUSH = range(9)
+
+# Rank weights (deuce to ace) whose sums are distinct for every multiset of 5 and of 7 ranks
+RANK_WEIGHTS = {
+    5: (0, 4, 21, 93, 311, 991, 2421, 5623, 12521, 19997, 43257, 79414, 148431),
+    7: (0, 1, 5, 22, 98, 453, 2031, 8698, 22854, 83661, 262349, 636345, 1479181),
+}
+SUIT_BITS = 3  # Suit counts packed into the low 12 bits of a key, seven cards never overflow
+SUIT_MASK = (1 << 4 * SUIT_BITS) - 1
+
+
+class Tables(NamedTuple):
+    card_keys: Dict[int, np.ndarray]  # Hand size -> key of each card: rank weight << 12 | suit count bit
+    ranks: Dict[int, np.ndarray]  # Hand size -> value by rank weight sum, for hands without a flush
+    flush_suit: np.ndarray  # Suit count key -> suit holding five or more cards, -1 if none
+    flushes: np.ndarray  # Rank mask of the flush suit -> value
+    category_starts: Tuple[int, ...]  # Lowest value of each category
+
+
+def _strength(counts: Sequence[int], flush: bool = False) -> Tuple[int, ...]:
+    """
+    Category and tie-breaking ranks of the best five-card hand among the given ranks
+    (counts per rank, at least five cards), as a tuple that compares like hand strength.
+    """
+    present = [rank for rank in range(12, -1, -1) if counts[rank]]
+    straight = -1
+    for top in range(12, 2, -1):
+        # A straight of five ranks ending in top, the ace also plays low under the five
+        if all(counts[rank % 13] for rank in range(top - 4, top + 1) if rank >= 0) and (top > 3 or counts[12]):
+            straight = top
+            break
+    if flush:
+        return (STRAIGHT_FLUSH, straight) if straight >= 0 else (FLUSH, *present[:5])
+
+    groups = sorted(((counts[rank], rank) for rank in present), reverse=True)
+    (first_count, first), rest = groups[0], groups[1:]
+    if first_count == 4:
+        return FOUR_OF_A_KIND, first, max(rank for _, rank in rest)
+    if first_count == 3 and rest[0][0] >= 2:
+        return FULL_HOUSE, first, rest[0][1]
+    if straight >= 0:
+        return STRAIGHT, straight
+    kickers = sorted((rank for _, rank in rest), reverse=True)
+    if first_count == 3:
+        return (THREE_OF_A_KIND, first, *kickers[:2])
+    if first_count == 2 and rest[0][0] == 2:
+        second = rest[0][1]
+        return TWO_PAIR, first, second, max(rank for rank in kickers if rank != second)
+    if first_count == 2:
+        return (PAIR, first, *kickers[:3])
+    return (HIGH_CARD, *present[:5])
+
+
+def _rank_multisets(size: int) -> Iterator[Tuple[int, ...]]:
+    """
+    Counts per rank of every multiset of size ranks with at most four cards per rank.
+    """
+    def extend(counts: List[int], rank: int, left: int):
+        if rank == 13:
+            if not left:
+                yield tuple(counts)
+            return
+        for count in range(min(4, left) + 1):
+            counts.append(count)
+            yield from extend(counts, rank + 1, left - count)
+            counts.pop()
+    yield from extend([], 0, size)
+
+
+def build_tables() -> Tables:
+    """
+    Compute the lookup tables from the rules, every hand value is ranked among the 7462
+    distinct five-card hands.
+    """
+    five_card = [_strength(counts) for counts in _rank_multisets(5)]
+    five_card += [_strength([mask >> rank & 1 for rank in range(13)], flush=True)
+                  for mask in range(1 << 13) if bin(mask).count("1") == 5]
+    ordered = sorted(set(five_card))
+    value_of = {strength: value for value, strength in enumerate(ordered, start=1)}
+    category_starts = tuple(next(value_of[strength] for strength in ordered if strength[0] == category)
+                            for category in range(len(CATEGORY_NAMES)))
+
+    card_keys, ranks = {}, {}
+    for size, weights in RANK_WEIGHTS.items():
+        keys = {}
+        for counts in _rank_multisets(size):
+            key = sum(count * weight for count, weight in zip(counts, weights))
+            if key in keys:
+                raise ValueError(f"Rank weights for {size} cards are not a perfect hash.")
+            keys[key] = value_of[_strength(counts)]
+        table = np.zeros(max(keys) + 1, dtype=np.uint16)
+        table[list(keys)] = list(keys.values())
+        ranks[size] = table
+        card_keys[size] = np.array([weights[card // 4] << 4 * SUIT_BITS | 1 << SUIT_BITS * (card % 4)
+                                    for card in range(52)], dtype=np.int64)
+
+    flush_suit = np.full(SUIT_MASK + 1, -1, dtype=np.int8)
+    for key in range(SUIT_MASK + 1):
+        for suit in range(4):
+            if key >> SUIT_BITS * suit & (1 << SUIT_BITS) - 1 >= 5:
+                flush_suit[key] = suit
+    flushes = np.zeros(1 << 13, dtype=np.uint16)
+    for mask in range(1 << 13):
+        if bin(mask).count("1") >= 5:
+            flushes[mask] = value_of[_strength([mask >> rank & 1 for rank in range(13)], flush=True)]
+    return Tables(card_keys, ranks, flush_suit, flushes, category_starts)
+
+
+def cache_path() -> str:
+    return os.path.join(CACHE_DIR, f"poker_tables_v{TABLE_VERSION}.npz")
+
+
+def _load(path: str) -> Tables:
+    with np.load(path) as data:
+        sizes = tuple(RANK_WEIGHTS)
+        return Tables({size: data[f"card_keys_{size}"] for size in sizes},
+                      {size: data[f"ranks_{size}"] for size in sizes},
+                      data["flush_suit"], data["flushes"], tuple(int(value) for value in data["category_starts"]))
+
+
+def _save(path: str, tables: Tables):
+    arrays = {"flush_suit": tables.flush_suit, "flushes": tables.flushes,
+              "category_starts": np.array(tables.category_starts)}
+    for size in RANK_WEIGHTS:
+        arrays[f"card_keys_{size}"] = tables.card_keys[size]
+        arrays[f"ranks_{size}"] = tables.ranks[size]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(temp_path, "wb") as table_file:
+        np.savez_compressed(table_file, **arrays)
+    os.replace(temp_path, path)  # Atomic, a crash never leaves half a file behind
+
+
+@functools.lru_cache(maxsize=None)
+def tables() -> Tables:
+    """
+    The lookup tables, loaded from the on-disk cache or built (and cached) on first use.
+    """
+    path = cache_path()
+    if os.path.exists(path):
+        try:
+            return _load(path)
+        except (OSError, KeyError, ValueError):
+            pass  # Broken cache file, rebuild it below
+    built = build_tables()
+    try:
+        _save(path, built)
+    except OSError as e:
+        log.warning("Could not cache the poker tables: %s", e)
+    return built
+
+
+@functools.lru_cache(maxsize=None)
+def _small_tables() -> Tuple[Dict[int, Tuple[int, ...]], Tuple[int, ...]]:
+    # The card keys and flush suits as plain ints, indexing NumPy arrays one value at a time is slow
+    table = tables()
+    return {size: tuple(keys.tolist()) for size, keys in table.card_keys.items()}, tuple(table.flush_suit.tolist())
+
+
+def evaluate(cards: Sequence[int]) -> int:
+    """
+    Value of a five- or seven-card hand.
+    """
+    card_keys, flush_suits = _small_tables()
+    card_keys = card_keys[len(cards)]
+    key = 0
+    for card in cards:
+        key += card_keys[card]
+    suit = flush_suits[key & SUIT_MASK]
+    if suit < 0:
+        return int(tables().ranks[len(cards)][key >> 4 * SUIT_BITS])
+    mask = 0
+    for card in cards:
+        if card % 4 == suit:
+            mask |= 1 << card // 4
+    return int(tables().flushes[mask])
+
+
+def evaluate_batch(hands: np.ndarray) -> np.ndarray:
+    """
+    Values of many hands at once.
+    :param hands: Integer array of shape (hands, 5) or (hands, 7) holding card numbers.
+    """
+    table = tables()
+    size = hands.shape[1]
+    card_keys = table.card_keys[size]
+    # Summing column by column keeps every intermediate array one value per hand
+    keys = card_keys[hands[:, 0]]
+    for column in range(1, size):
+        keys += card_keys[hands[:, column]]
+    values = table.ranks[size][keys >> 4 * SUIT_BITS]
+    suits = table.flush_suit[keys & SUIT_MASK]
+    flushed = np.flatnonzero(suits >= 0)
+    if flushed.size:
+        # Flushes are rare (about 3 % of seven-card hands), only their rows are looked at again
+        flush_hands = hands[flushed]
+        in_suit = (flush_hands & 3) == suits[flushed, None]
+        masks = np.where(in_suit, 1 << (flush_hands >> 2).astype(np.int32), 0).sum(axis=1)
+        values[flushed] = table.flushes[masks]
+    return values
+
+
+def category(value: int) -> int:
+    starts = tables().category_starts
+    return max(number for number, start in enumerate(starts) if start <= value)
+
+
+def describe_value(value: int) -> str:
+    return CATEGORY_NAMES[category(value)]
+
+
+def card_name(card: int) -> str:
+    return f"{RANK_NAMES[card // 4]}{SUIT_NAMES[card % 4]}"
+
+
+def describe_cards(cards: Sequence[int]) -> str:
+    return " ".join(card_name(card) for card in cards)
+
+
+def best_five(cards: Sequence[int]) -> Tuple[int, ...]:
+    """
+    The five cards of a seven-card hand that make up its value.
+    """
+    return max(combinations(cards, 5), key=evaluate)
+
+
+def deal_batch(rng: np.random.Generator, rounds: int, cards: int) -> np.ndarray:
+    """
+    Deal the first cards of a freshly shuffled deck for many rounds at once,
+    a partial Fisher-Yates shuffle of one deck per round. Returns an array of shape (rounds, cards).
+    """
+    decks = np.tile(np.arange(52, dtype=np.uint8), rounds)
+    starts = np.arange(0, rounds * 52, 52)
+    dealt = np.empty((cards, rounds), dtype=np.uint8)
+    for position in range(cards):
+        swap = starts + rng.integers(position, 52, size=rounds)
+        dealt[position] = decks[swap]
+        decks[swap] = decks[starts + position]
+    return dealt.T
+
+
+class Showdown(NamedTuple):
+    """
+    One hold'em hand against the dealer: both hole cards, the board and the hand values.
+    """
+    player: Tuple[int, int]
+    dealer: Tuple[int, int]
+    board: Tuple[int, ...]
+    player_value: int
+    dealer_value: int
+
+
+def deal_showdown(rng) -> Showdown:
+    """
+    Deal two hole cards each and a five-card board from a random.Random stream.
+    """
+    cards = rng.sample(range(52), 9)
+    player, dealer, board = tuple(cards[0:2]), tuple(cards[2:4]), tuple(cards[4:])
+    return Showdown(player, dealer, board, evaluate(player + board), evaluate(dealer + board))
+
+
+def showdown_batch(rng: np.random.Generator, rounds: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Values of the player's and the dealer's hands for many dealt rounds.
+    """
+    cards = deal_batch(rng, rounds, 9)
+    board = cards[:, 4:]
+    player = evaluate_batch(np.concatenate((cards[:, 0:2], board), axis=1))
+    dealer = evaluate_batch(np.concatenate((cards[:, 2:4], board), axis=1))
+    return player, dealer
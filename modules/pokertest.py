@@ -0,0 +1,70 @@
+import random
+import unittest
+from itertools import chain, combinations
+
+import numpy as np
+
+from modules import poker
+
+
+def cards(text: str) -> list:
+    """
+    Card numbers of a hand written like "As Kd 10h 2c".
+    """
+    suits = {"c": 0, "d": 1, "h": 2, "s": 3}
+    return [poker.RANK_NAMES.index(card[:-1].upper()) * 4 + suits[card[-1]] for card in text.split()]
+
+
+class FiveCardTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        hands = np.fromiter(chain.from_iterable(combinations(range(52), 5)), dtype=np.uint8).reshape(-1, 5)
+        cls.values = poker.evaluate_batch(hands)
+
+    def test_category_counts(self):
+        categories = np.searchsorted(poker.tables().category_starts, self.values, side="right") - 1
+        counts = np.bincount(categories, minlength=9).tolist()
+        self.assertEqual(counts, [1302540, 1098240, 123552, 54912, 10200, 5108, 3744, 624, 40])
+
+    def test_distinct_values(self):
+        distinct = np.unique(self.values)
+        self.assertEqual(len(distinct), 7462)
+        self.assertEqual((distinct.min(), distinct.max()), (1, 7462))
+
+
+class EvaluateTest(unittest.TestCase):
+    def test_ordering(self):
+        ordered = ["7c 5d 4h 3s 2c", "Ac Kd Qh Js 9c", "2c 2d 3h 4s 5c", "Ac Ad Kh Ks 2c",
+                   "Ac 2d 3h 4s 5c", "2c 3d 4h 5s 6c", "Ac Kd Qh Js 10c", "2h 3h 4h 5h 7h",
+                   "Ah Kh Qh Jh 9h", "2c 2d 2h 3s 3c", "Ac Ad Ah As 2c", "Ah 2h 3h 4h 5h", "Ah Kh Qh Jh 10h"]
+        values = [poker.evaluate(cards(hand)) for hand in ordered]
+        self.assertEqual(values, sorted(values))
+        self.assertEqual(len(set(values)), len(values))
+        self.assertEqual(values[0], 1)
+        self.assertEqual(values[-1], 7462)
+
+    def test_suits_do_not_matter_without_flush(self):
+        self.assertEqual(poker.evaluate(cards("Ac Kd Qh Js 9c")), poker.evaluate(cards("As Kh Qd Jc 9s")))
+
+    def test_seven_cards_take_best_five(self):
+        hand = cards("Ah Kh 2c 7h 9h 3d Qh")
+        self.assertEqual(poker.describe_value(poker.evaluate(hand)), "Flush")
+        self.assertEqual(poker.evaluate(hand), poker.evaluate(poker.best_five(hand)))
+        self.assertEqual(sorted(poker.best_five(hand)), sorted(cards("Ah Kh 7h 9h Qh")))
+
+    def test_batch_matches_single_hands(self):
+        rng = random.Random(1)
+        for size in (5, 7):
+            hands = [rng.sample(range(52), size) for _ in range(2000)]
+            batch = poker.evaluate_batch(np.array(hands, dtype=np.uint8)).tolist()
+            self.assertEqual(batch, [poker.evaluate(hand) for hand in hands])
+
+    def test_seven_card_flush_frequency(self):
+        values = poker.evaluate_batch(poker.deal_batch(np.random.default_rng(1), 200_000, 7))
+        categories = np.searchsorted(poker.tables().category_starts, values, side="right") - 1
+        # Seven-card flush probability (straight flushes excluded) is 3.03 %
+        self.assertAlmostEqual(np.mean(categories == poker.FLUSH), 0.0303, delta=0.002)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Deterministic session replay.
+A Game records a compact action log (room moves, unlocks, bets and choices) and draws
+all randomness from streams seeded by its session seed. Replaying the log on a fresh
+headless Game with the same seed must end in exactly the same player state.
+"""
+import argparse
+import json
+import time
+from typing import List, Optional
+
+from modules import classes
+
+LOG_FORMAT = "golden-casino-session"
+LOG_VERSION = 1
+
+
+def session_log(game: classes.Game) -> dict:
+    """
+    Build the replayable log of a session: seed, starting state, actions and final state.
+    """
+    return {
+        "format": LOG_FORMAT,
+        "version": LOG_VERSION,
+        "seed": game.seed,
+        "story": game.story_file,
+        "start": game.start_state,
+        "actions": [list(action) for action in game.actions],
+        "final": final_state(game),
+    }
+
+
+def final_state(game: classes.Game) -> dict:
+    state = game.get_state()
+    return {key: state[key] for key in ("money", "jackpot_wins", "room", "unlocked")}
+
+
+def replay(log: dict, output: Optional[classes.OutputSink] = None) -> classes.Game:
+    """
+    Re-run a logged session headlessly and return the resulting Game.
+    """
+    if log.get("format") != LOG_FORMAT or log.get("version") != LOG_VERSION:
+        raise ValueError("Not a supported session log.")
+    start = log["start"]
+    game = classes.Game(start["player"], log["story"], start["mode"], output or classes.NullSink(), seed=log["seed"])
+    game.create_rooms()
+    game.apply_state(start)
+
+    actions = {
+        "move": game.move_to_room,
+        "go": game.move_player,
+        "unlock": game.unlock_room,
+        "play": game.play_current_room_game,
+        "bonus": game.give_bonus,
+    }
+    for name, *args in log["actions"]:
+        actions[name](*args)
+    return game
+
+
+def verify(log: dict) -> List[str]:
+    """
+    Replay a session and compare its final state with the logged one.
+    Returns a list of mismatches, empty if the replay matches.
+    """
+    replayed = final_state(replay(log))
+    return [f"{key}: logged {log['final'][key]!r}, replayed {replayed[key]!r}"
+            for key in replayed if replayed[key] != log["final"].get(key)]
+
+
+def save_log(game: classes.Game, filename: str):
+    with open(filename, "w", encoding="utf-8") as log_file:
+        json.dump(session_log(game), log_file, ensure_ascii=False, separators=(",", ":"))
+
+
+def load_log(filename: str) -> dict:
+    with open(filename, "r", encoding="utf-8") as log_file:
+        return json.load(log_file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay and verify a recorded casino session")
+    parser.add_argument("log", help="Session log written by replay.save_log")
+    parser.add_argument("--times", type=int, default=1, help="Replay the session this many times (profiling)")
+    args = parser.parse_args()
+
+    log = load_log(args.log)
+    started = time.perf_counter()
+    for _ in range(args.times):
+        mismatches = verify(log)
+    elapsed = time.perf_counter() - started
+    actions = len(log["actions"]) * args.times
+    print(f"Replayed {actions} actions in {elapsed:.3f} s ({actions / elapsed:,.0f} actions/s)")
+    if mismatches:
+        print("Replay does NOT match:")
+        for mismatch in mismatches:
+            print(f"  {mismatch}")
+        raise SystemExit(1)
+    print("Replay matches the logged final state.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from modules import bots, classes, replay
+
+
+class ReplayTest(unittest.TestCase):
+    def play(self, seed: int, rounds: int) -> classes.Game:
+        game = bots.new_session(seed)
+        bots.play_session(bots.FlatBet(), game, rounds)
+        return game
+
+    def test_session_replays_to_same_state(self):
+        game = self.play(3, 300)
+        log = replay.session_log(game)
+        self.assertEqual(replay.verify(log), [])
+        self.assertEqual(replay.final_state(replay.replay(log)), log["final"])
+
+    def test_tampered_log_is_detected(self):
+        log = replay.session_log(self.play(3, 300))
+        log["final"]["money"] += 1
+        self.assertNotEqual(replay.verify(log), [])
+
+    def test_decision_functions_are_not_logged(self):
+        game = bots.new_session(3)
+        game.give_bonus(100)
+        game.unlock_room("Blackjack Room")
+        game.move_to_room("Blackjack Room")
+        money = game.player.money
+        message = game.play_current_room_game(10, lambda *args: "stand")
+        self.assertIn("play() directly", message)
+        self.assertEqual(game.player.money, money)
+        log = replay.session_log(game)
+        json.dumps(log)
+        self.assertEqual(replay.verify(log), [])
+
+    def test_action_log_is_checkpointed_at_limit(self):
+        with mock.patch.object(classes.Game, "ACTION_LOG_LIMIT", 40):
+            game = self.play(5, 300)
+        self.assertLessEqual(len(game.actions), 40)
+        self.assertEqual(replay.verify(replay.session_log(game)), [])
+
+    def test_save_checkpoints_action_log(self):
+        game = self.play(7, 100)
+        with tempfile.TemporaryDirectory() as directory:
+            game.save_game(os.path.join(directory, "test.sav"))
+        self.assertEqual(game.actions, [])
+        self.assertEqual(game.start_state, game.get_state())
+        bots.play_session(bots.FlatBet(), game, 100)
+        self.assertEqual(replay.verify(replay.session_log(game)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+Compiled index of the room graph of a world.
+Rooms are numbered once, exits become adjacency tuples and all-pairs hop distances are
+precomputed, so distance and reachability queries are O(1) and a shortest path costs
+O(path length). Unlock planning runs Dijkstra over unlock costs and memoizes its answers
+per starting room, target and set of locked rooms.
+"""
+import functools
+import heapq
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+UNREACHABLE = -1
+
+
+class UnlockPlan(NamedTuple):
+    """
+    The cheapest way to reach a room: coins to pay, rooms to unlock (in walking order)
+    and the rooms walked through, start and target included.
+    """
+    cost: int
+    unlocks: Tuple[str, ...]
+    path: Tuple[str, ...]
+
+
+class RoomGraph:
+    def __init__(self, names: Tuple[str, ...], unlock_costs: Tuple[int, ...],
+                 exits: Tuple[Tuple[Tuple[str, Optional[int]], ...], ...], start: str):
+        """
+        Built once per world by WorldTemplate, see modules/classes.py.
+        :param exits: Per room the (direction, target index) pairs, None for a target outside the world.
+        """
+        self.names = names
+        self.index: Dict[str, int] = {name: number for number, name in enumerate(names)}
+        self.unlock_costs = unlock_costs
+        self.exits = exits
+        self.start = self.index[start]
+        self.neighbours: Tuple[Tuple[int, ...], ...] = tuple(
+            tuple(sorted({target for _, target in room_exits if target is not None})) for room_exits in exits)
+        self.distances, self.next_hop = self._all_pairs()
+        self.problems = self._find_problems()
+        self.unlock_plan_between = functools.lru_cache(maxsize=4096)(self._unlock_plan)
+
+    def _all_pairs(self) -> Tuple[Tuple[Tuple[int, ...], ...], Tuple[Tuple[int, ...], ...]]:
+        """
+        Breadth-first search from every room: hop distances and the first hop of a shortest path.
+        """
+        size = len(self.names)
+        distances, next_hop = [], []
+        for source in range(size):
+            distance = [UNREACHABLE] * size
+            first = [UNREACHABLE] * size
+            distance[source] = 0
+            first[source] = source
+            queue = deque([source])
+            while queue:
+                room = queue.popleft()
+                for target in self.neighbours[room]:
+                    if distance[target] == UNREACHABLE:
+                        distance[target] = distance[room] + 1
+                        first[target] = target if room == source else first[room]
+                        queue.append(target)
+            distances.append(tuple(distance))
+            next_hop.append(tuple(first))
+        return tuple(distances), tuple(next_hop)
+
+    def _find_problems(self) -> List[str]:
+        problems = []
+        for number, room_exits in enumerate(self.exits):
+            for direction, target in room_exits:
+                if target is None:
+                    problems.append(f"{self.names[number]}: exit '{direction}' leads to a room outside the world.")
+                elif target == number:
+                    problems.append(f"{self.names[number]}: exit '{direction}' leads back into the room itself.")
+        for number, name in enumerate(self.names):
+            if self.distances[self.start][number] == UNREACHABLE:
+                problems.append(f"{name} cannot be reached from {self.names[self.start]}.")
+        return problems
+
+    def validate(self):
+        """
+        Raise ValueError listing every broken exit and unreachable room.
+        """
+        if self.problems:
+            raise ValueError("Invalid room graph:\n" + "\n".join(self.problems))
+
+    def distance(self, source: str, target: str) -> int:
+        """
+        Number of exits on the shortest walk between two rooms, UNREACHABLE if there is none.
+        """
+        return self.distances[self.index[source]][self.index[target]]
+
+    def reachable(self, source: str, target: str) -> bool:
+        return self.distance(source, target) != UNREACHABLE
+
+    def shortest_path(self, source: str, target: str) -> Optional[Tuple[str, ...]]:
+        """
+        Rooms on a shortest walk between two rooms, both included, ignoring locks.
+        """
+        room, goal = self.index[source], self.index[target]
+        if self.distances[room][goal] == UNREACHABLE:
+            return None
+        path = [room]
+        while room != goal:
+            room = self.next_hop[room][goal]
+            path.append(room)
+        return tuple(self.names[number] for number in path)
+
+    def unlock_plan(self, source: str, target: str, locked_mask: int) -> Optional[UnlockPlan]:
+        """
+        Cheapest sequence of unlocks to walk from source to target.
+        Entering a locked room costs its unlock cost, ties are broken by fewer steps.
+        Returns None if the target cannot be reached at all.
+        """
+        return self.unlock_plan_between(self.index[source], self.index[target], locked_mask)
+
+    def _unlock_plan(self, source: int, target: int, locked_mask: int) -> Optional[UnlockPlan]:
+        def step_cost(room: int) -> int:
+            return self.unlock_costs[room] if locked_mask >> room & 1 else 0
+
+        best = {source: (0, 0)}
+        previous = {source: source}
+        heap = [(0, 0, source)]
+        while heap:
+            cost, steps, room = heapq.heappop(heap)
+            if best[room] < (cost, steps):
+                continue
+            if room == target:
+                break
+            for neighbour in self.neighbours[room]:
+                candidate = (cost + step_cost(neighbour), steps + 1)
+                if neighbour not in best or candidate < best[neighbour]:
+                    best[neighbour] = candidate
+                    previous[neighbour] = room
+                    heapq.heappush(heap, (*candidate, neighbour))
+        if target not in best:
+            return None
+
+        path = [target]
+        while path[-1] != source:
+            path.append(previous[path[-1]])
+        path.reverse()
+        unlocks = tuple(self.names[room] for room in path if locked_mask >> room & 1)
+        return UnlockPlan(best[target][0], unlocks, tuple(self.names[room] for room in path))
+
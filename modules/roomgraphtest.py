@@ -0,0 +1,85 @@
+import json
+import os
+import tempfile
+import unittest
+
+from modules import bots, classes, roomgraph
+
+
+def graph(exits: dict, costs: dict = None, start: str = "A") -> roomgraph.RoomGraph:
+    names = tuple(exits)
+    index = {name: number for number, name in enumerate(names)}
+    return roomgraph.RoomGraph(names, tuple((costs or {}).get(name, 0) for name in names),
+                               tuple(tuple((target, index.get(target)) for target in exits[name]) for name in names),
+                               start)
+
+
+class PathTest(unittest.TestCase):
+    def setUp(self):
+        # A - B - D is short but B is expensive, A - C - E - D is longer and cheap; F is a dead end
+        self.graph = graph({"A": ("B", "C"), "B": ("A", "D"), "C": ("A", "E"), "D": ("B", "E", "F"),
+                            "E": ("C", "D"), "F": ()}, {"B": 100, "E": 10, "F": 5})
+
+    def test_distances_and_paths(self):
+        self.assertEqual(self.graph.distance("A", "D"), 2)
+        self.assertEqual(self.graph.shortest_path("A", "D"), ("A", "B", "D"))
+        self.assertEqual(self.graph.shortest_path("A", "A"), ("A",))
+        self.assertEqual(self.graph.distance("F", "A"), roomgraph.UNREACHABLE)
+        self.assertFalse(self.graph.reachable("F", "A"))
+        self.assertIsNone(self.graph.shortest_path("F", "A"))
+
+    def test_unlock_plans(self):
+        locked = sum(1 << self.graph.index[name] for name in "BCEF")
+        self.assertEqual(self.graph.unlock_plan("A", "D", locked),
+                         roomgraph.UnlockPlan(10, ("C", "E"), ("A", "C", "E", "D")))
+        self.assertEqual(self.graph.unlock_plan("A", "D", 0), roomgraph.UnlockPlan(0, (), ("A", "B", "D")))
+        self.assertEqual(self.graph.unlock_plan("A", "F", locked).cost, 15)
+        self.assertIsNone(self.graph.unlock_plan("F", "A", locked))
+
+
+class ValidateTest(unittest.TestCase):
+    def test_problems_are_listed(self):
+        broken = graph({"A": ("B", "Nowhere"), "B": ("A", "B"), "C": ("A",)})
+        with self.assertRaises(ValueError) as raised:
+            broken.validate()
+        message = str(raised.exception)
+        self.assertIn("A: exit 'Nowhere' leads to a room outside the world.", message)
+        self.assertIn("B: exit 'B' leads back into the room itself.", message)
+        self.assertIn("C cannot be reached from A.", message)
+
+    def test_broken_exits_are_caught_at_load_time(self):
+        with open(classes.Story(bots.STORY_FILE).file_path, encoding="utf-8") as story_file:
+            story = json.load(story_file)
+        story["rooms"][1]["exits"].append({"direction": "cellar", "room": "Wine Cellar"})
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "story.json")
+            with open(path, "w", encoding="utf-8") as story_file:
+                json.dump(story, story_file)
+            with self.assertRaisesRegex(ValueError, "exit 'cellar' leads to a room outside the world"):
+                classes.WorldTemplate.for_story(classes.Story(path))
+
+
+class ShippedWorldTest(unittest.TestCase):
+    def setUp(self):
+        self.game = bots.new_session(1)
+
+    def test_world_is_valid(self):
+        self.assertEqual(self.game.room_graph.problems, [])
+
+    def test_unlock_plan_costs(self):
+        plan = self.game.unlock_plan("Roulette Room")
+        self.assertEqual(plan.cost, 50 + 100 + 120 + 150 + 175)
+        self.assertEqual(plan.unlocks, ("Blackjack Room", "Horse Race Room", "Baccarat Room", "Poker Room",
+                                        "Roulette Room"))
+        self.assertEqual(plan.path[0], "Lobby")
+        self.assertEqual(self.game.unlock_plan("VIP Lounge").cost, plan.cost + 999)
+
+        self.game.give_bonus(100)
+        self.assertTrue(bots.walk_to(self.game, "Blackjack Room"))
+        self.assertEqual(self.game.unlock_plan("Horse Race Room"), roomgraph.UnlockPlan(
+            100, ("Horse Race Room",), ("Blackjack Room", "Horse Race Room")))
+        self.assertEqual(self.game.unlock_plan("Lobby").cost, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
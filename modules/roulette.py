@@ -0,0 +1,198 @@
+"""
+Single-zero roulette bets and bet slips.
+Every bet the table offers is precomputed once as a 37-bit mask of the numbers it covers
+(bit n stands for number n) together with its payout ratio. A bet slip compiles its chips
+into the coins it returns for each of the 37 numbers, so settling a spin is one lookup
+however many chips are on the table, and simulate_slip() settles millions of spins with
+one NumPy indexing operation.
+
+Selections are written like the table calls them: "17", "split 17-18", "street 13-14-15",
+"corner 13-14-16-17", "dozen 2", "column 3", "red", "black", "odd", "even", "low", "high".
+A slip is one selection (the whole bet goes on it) or several entries with chips each,
+e.g. "10 on red, 5 on 17, 5 on split 17-18".
+"""
+import functools
+import re
+from typing import Dict, Iterable, NamedTuple, Tuple, Union
+
+import numpy as np
+
+NUMBERS = 37
+RED = frozenset((1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36))
+
+# Payout ratios, a winning bet returns its chips times (ratio + 1)
+PAYOUTS = {"straight": 35, "split": 17, "street": 11, "corner": 8,
+           "dozen": 2, "column": 2, "red": 1, "black": 1, "odd": 1, "even": 1, "low": 1, "high": 1}
+INSIDE_SIZES = {1: "straight", 2: "split", 3: "street", 4: "corner"}
+ALIASES = {"1-18": "low", "19-36": "high", "rouge": "red", "noir": "black"}
+
+
+class Bet(NamedTuple):
+    name: str
+    mask: int
+    payout: int
+
+    @property
+    def numbers(self) -> Tuple[int, ...]:
+        return tuple(number for number in range(NUMBERS) if self.mask >> number & 1)
+
+
+def _mask(numbers: Iterable[int]) -> int:
+    mask = 0
+    for number in numbers:
+        mask |= 1 << number
+    return mask
+
+
+def _inside_bets() -> Iterable[Tuple[int, ...]]:
+    # The layout has 12 rows of three numbers, row r holds 3r+1 to 3r+3
+    for number in range(NUMBERS):
+        yield (number,)
+    for number in (1, 2, 3):
+        yield 0, number
+    for number in range(1, 37):
+        if number % 3:
+            yield number, number + 1
+        if number <= 33:
+            yield number, number + 3
+    for first in range(1, 37, 3):
+        yield first, first + 1, first + 2
+    for number in range(1, 33):
+        if number % 3:
+            yield number, number + 1, number + 3, number + 4
+
+
+def _outside_bets() -> Dict[str, Tuple[int, ...]]:
+    bets = {
+        "red": tuple(sorted(RED)),
+        "black": tuple(number for number in range(1, 37) if number not in RED),
+        "odd": tuple(range(1, 37, 2)),
+        "even": tuple(range(2, 37, 2)),
+        "low": tuple(range(1, 19)),
+        "high": tuple(range(19, 37)),
+    }
+    for third in (1, 2, 3):
+        bets[f"dozen {third}"] = tuple(range(12 * third - 11, 12 * third + 1))
+        bets[f"column {third}"] = tuple(range(third, 37, 3))
+    return bets
+
+
+def _bet_table() -> Dict[Union[str, Tuple[int, ...]], Bet]:
+    """
+    Every bet of the table, inside bets keyed by their sorted numbers, outside bets by name.
+    """
+    table: Dict[Union[str, Tuple[int, ...]], Bet] = {}
+    for numbers in _inside_bets():
+        kind = INSIDE_SIZES[len(numbers)]
+        name = f"{kind} {'-'.join(map(str, numbers))}" if kind != "straight" else str(numbers[0])
+        table[numbers] = Bet(name, _mask(numbers), PAYOUTS[kind])
+    for name, numbers in _outside_bets().items():
+        table[name] = Bet(name, _mask(numbers), PAYOUTS[name.split()[0]])
+    return table
+
+
+BETS = _bet_table()
+
+
+def parse_selection(text: str) -> Bet:
+    """
+    Look up the bet a selection names, raises ValueError for anything the table doesn't offer.
+    """
+    selection = " ".join(str(text).lower().split())
+    selection = ALIASES.get(selection, selection)
+    if selection in BETS:
+        return BETS[selection]
+    words = re.split(r"[\s\-/]+", selection)
+    kind = words[0] if words and not words[0].isdigit() else None
+    numbers = words[1:] if kind else words
+    if kind and kind not in PAYOUTS:
+        raise ValueError(f"Unknown bet '{text}'.")
+    if kind in ("dozen", "column") and len(numbers) == 1:
+        bet = BETS.get(f"{kind} {numbers[0]}")
+        if bet:
+            return bet
+        raise ValueError(f"There are three {kind}s, choose {kind} 1, 2 or 3.")
+    if not numbers or not all(number.isdigit() for number in numbers):
+        raise ValueError(f"Unknown bet '{text}'.")
+    covered = tuple(sorted(int(number) for number in numbers))
+    bet = BETS.get(covered)
+    if bet is None or (kind and kind != INSIDE_SIZES.get(len(covered))):
+        if len(covered) == 1:
+            raise ValueError("Invalid number. Please choose a number between 0 and 36.")
+        raise ValueError(f"{'-'.join(numbers)} is not a {kind or INSIDE_SIZES.get(len(covered), 'valid')} bet on this table.")
+    return bet
+
+
+class BetSlip:
+    """
+    The chips placed on one spin and the coins they return for every number.
+    """
+    __slots__ = ("bets", "total", "returns")
+
+    def __init__(self, bets: Tuple[Tuple[Bet, int], ...]):
+        self.bets = bets
+        self.total = sum(chips for _, chips in bets)
+        returns = [0] * NUMBERS
+        for bet, chips in bets:
+            coins = chips * (bet.payout + 1)
+            mask = bet.mask
+            while mask:  # Visit the set bits only, an outside bet covers 12 or 18 numbers
+                lowest = mask & -mask
+                returns[lowest.bit_length() - 1] += coins
+                mask ^= lowest
+        self.returns = tuple(returns)
+
+    def settle(self, number: int) -> int:
+        """
+        Coins returned when the ball lands on number, winning stakes included.
+        """
+        return self.returns[number]
+
+    def winning_bets(self, number: int) -> Tuple[Tuple[Bet, int], ...]:
+        return tuple((bet, chips) for bet, chips in self.bets if bet.mask >> number & 1)
+
+    def describe(self) -> str:
+        if len(self.bets) == 1:
+            return self.bets[0][0].name
+        return ", ".join(f"{chips} on {bet.name}" for bet, chips in self.bets)
+
+
+def _parse_entry(entry: str) -> Tuple[str, Union[int, None]]:
+    match = re.fullmatch(r"\s*(\d+)\s+on\s+(.+?)\s*", entry)
+    return (match.group(2), int(match.group(1))) if match else (entry, None)
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_slip(choice: Union[str, int, Tuple[Tuple[str, int], ...]], total: int) -> BetSlip:
+    """
+    Build the bet slip of a choice for a total bet, raises ValueError explaining what is wrong.
+    :param choice: A selection (the whole bet goes on it), a slip like "10 on red, 5 on 17"
+                   or (selection, chips) pairs. The chips have to add up to the total bet.
+    """
+    if isinstance(choice, (str, int)):
+        entries = [_parse_entry(entry) for entry in str(choice).split(",") if entry.strip()]
+    else:
+        entries = [(str(selection), int(chips)) for selection, chips in choice]
+    if not entries:
+        raise ValueError("Please place a bet, e.g. 17, red or '10 on red, 5 on 17'.")
+    if len(entries) == 1 and entries[0][1] is None:
+        entries = [(entries[0][0], total)]
+    if any(chips is None for _, chips in entries):
+        raise ValueError("Give the chips of every bet, e.g. '10 on red, 5 on 17'.")
+    if any(chips <= 0 for _, chips in entries):
+        raise ValueError("Every bet needs at least one chip.")
+    slip = BetSlip(tuple((parse_selection(selection), chips) for selection, chips in entries))
+    if slip.total != total:
+        raise ValueError(f"The chips on the slip add up to {slip.total} coins, but the bet is {total} coins.")
+    return slip
+
+
+def colour(number: int) -> str:
+    return "green" if number == 0 else "red" if number in RED else "black"
+
+
+def simulate_slip(slip: BetSlip, spins: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Coins the slip returns on each of many spins.
+    """
+    return np.asarray(slip.returns, dtype=np.int64)[rng.integers(0, NUMBERS, size=spins)]
@@ -0,0 +1,81 @@
+import random
+import unittest
+
+import numpy as np
+
+from modules import classes, odds, roulette
+
+
+class ParseTest(unittest.TestCase):
+    def test_selections(self):
+        self.assertEqual(roulette.parse_selection("17").payout, 35)
+        self.assertEqual(roulette.parse_selection("Red").payout, 1)
+        self.assertEqual(roulette.parse_selection("noir"), roulette.parse_selection("black"))
+        self.assertEqual(roulette.parse_selection("1-18"), roulette.parse_selection("low"))
+        self.assertEqual(roulette.parse_selection("dozen 2").payout, 2)
+        self.assertEqual(roulette.parse_selection("split 18-17"), roulette.parse_selection("17/18"))
+        self.assertEqual(roulette.parse_selection("corner 1 2 4 5").payout, 8)
+
+    def test_invalid_selections(self):
+        for text in ("37", "purple", "dozen 4", "split 1-5", "street 1-2", "corner 1 2 3 4", ""):
+            with self.assertRaises(ValueError, msg=text):
+                roulette.parse_selection(text)
+
+    def test_slip_totals_must_match_bet(self):
+        self.assertEqual(roulette.parse_slip("10 on red, 5 on 17", 15).total, 15)
+        self.assertEqual(roulette.parse_slip((("red", 10), ("17", 5)), 15).total, 15)
+        for choice, total in (("10 on red, 5 on 17", 20), ("10 on red, 17", 15), ("0 on red, 15 on 17", 15), ("", 10)):
+            with self.assertRaises(ValueError, msg=choice):
+                roulette.parse_slip(choice, total)
+
+
+class SlipTest(unittest.TestCase):
+    def test_returns(self):
+        slip = roulette.parse_slip("10 on red, 5 on 17, 6 on split 17-18", 21)
+        self.assertEqual(slip.settle(17), 5 * 36 + 6 * 18)  # 17 is black
+        self.assertEqual(slip.settle(18), 10 * 2 + 6 * 18)
+        self.assertEqual(slip.settle(1), 10 * 2)
+        self.assertEqual(slip.settle(0), 0)
+        self.assertEqual([bet.name for bet, _ in slip.winning_bets(18)], [roulette.parse_selection("red").name,
+                                                                         roulette.parse_selection("split 17-18").name])
+
+    def test_every_bet_has_the_single_zero_edge(self):
+        for bet in set(roulette.BETS.values()):
+            slip = roulette.BetSlip(((bet, 1),))
+            self.assertEqual(sum(slip.returns), 36, bet.name)
+
+    def test_simulated_returns_follow_the_slip(self):
+        slip = roulette.parse_slip("dozen 1", 1)
+        returns = roulette.simulate_slip(slip, 370_000, np.random.default_rng(1))
+        self.assertAlmostEqual(returns.mean(), 36 / 37, delta=0.02)
+        self.assertEqual(set(returns.tolist()), {0, 3})
+
+
+class RouletteGameTest(unittest.TestCase):
+    def test_round_pays_the_slip(self):
+        game = classes.Roulette()
+        rng = random.Random(5)
+        number = random.Random(5).randint(0, 36)
+        player = classes.Player("Test", starting_money=100)
+        game.play(player, 12, f"{number}", classes.NullSink(), rng)
+        self.assertEqual(player.money, 100 - 12 + 12 * 36)
+
+    def test_invalid_slip_takes_no_money(self):
+        player = classes.Player("Test", starting_money=100)
+        message = classes.Roulette().play(player, 12, "6 on red", classes.NullSink(), random.Random(1))
+        self.assertTrue(message.startswith("Invalid input."))
+        self.assertEqual(player.money, 100)
+
+    def test_odds_follow_the_slip(self):
+        game = classes.Roulette()
+        slip_odds = odds.choice_odds(game, 15, "10 on red, 5 on 17")
+        self.assertTrue(slip_odds.exact)
+        self.assertEqual(slip_odds.win_probability, 19 / 37)  # The reds and 17, which is black
+        self.assertAlmostEqual(slip_odds.rtp, 36 / 37)
+        self.assertEqual(odds.choice_odds(game, 12, "dozen 2").win_probability, 12 / 37)
+        with self.assertRaises(ValueError):
+            odds.choice_odds(game, 20, "10 on red")
+
+
+if __name__ == "__main__":
+    unittest.main()
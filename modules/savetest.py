@@ -0,0 +1,63 @@
+import json
+import os
+import tempfile
+import unittest
+
+from modules import classes
+
+
+class SaveGameTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "test.sav")
+        self.output = classes.BufferSink()
+
+    def new_game(self) -> classes.Game:
+        game = classes.Game("Tester", "story.json", "normal", self.output, seed=11)
+        game.create_rooms()
+        return game
+
+    def test_round_trip(self):
+        game = self.new_game()
+        game.move_to_room("Slots Room")
+        game.give_bonus(500)
+        game.unlock_room("Blackjack Room")
+        game.move_to_room("Blackjack Room")
+        for _ in range(20):
+            game.play_current_room_game(5)
+        self.assertEqual(len(game.bet_history), 20)
+        game.save_game(self.path)
+
+        loaded = classes.Game.load_game(self.path, self.output)
+        self.assertIsNotNone(loaded)
+        self.assertEqual(loaded.get_state(), game.get_state())
+        self.assertEqual(list(loaded.bet_history), list(game.bet_history))
+        self.assertFalse(loaded.rooms["Blackjack Room"].locked)
+        self.assertTrue(loaded.rooms["Horse Race Room"].locked)
+        self.assertIs(loaded.current_room, loaded.rooms["Blackjack Room"])
+
+    def test_file_is_json_lines(self):
+        self.new_game().save_game(self.path)
+        with open(self.path, encoding="utf-8") as save_file:
+            lines = [json.loads(line) for line in save_file]
+        self.assertEqual(lines[0], {"format": classes.Game.SAVE_FORMAT, "version": classes.Game.SAVE_VERSION})
+        self.assertEqual(lines[1]["player"], "Tester")
+
+    def test_rejects_other_files(self):
+        for header in ({"format": "something else", "version": 1},
+                       {"format": classes.Game.SAVE_FORMAT, "version": classes.Game.SAVE_VERSION + 1}):
+            with open(self.path, "w", encoding="utf-8") as save_file:
+                save_file.write(json.dumps(header) + "\n{}\n")
+            self.assertIsNone(classes.Game.load_game(self.path, self.output))
+
+        with open(self.path, "wb") as save_file:
+            save_file.write(b"\x80\x04\x95 not json")
+        self.assertIsNone(classes.Game.load_game(self.path, self.output))
+
+    def test_missing_file(self):
+        self.assertIsNone(classes.Game.load_game(self.path + ".missing", self.output))
+
+
+if __name__ == "__main__":
+    unittest.main()
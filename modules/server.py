@@ -0,0 +1,289 @@
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+import traceback
+from collections import OrderedDict, deque
+from typing import Dict, Optional
+
+from modules import classes
+from modules import metrics
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_SESSIONS = 10_000  # The least recently used session is dropped beyond this
+SESSION_IDLE_SECONDS = 30 * 60  # Sessions without a request for this long are dropped
+
+
+class CommandStats:
+    """
+    Request counter and latency window for one command.
+    Keeps the most recent latencies only, so memory stays bounded under load.
+    """
+    def __init__(self, window: int = 10000):
+        self.count = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=window)
+
+    def record(self, seconds: float, ok: bool):
+        self.count += 1
+        if not ok:
+            self.errors += 1
+        self.latencies.append(seconds)
+
+    def percentile(self, fraction: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def summary(self, elapsed: float) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "requests_per_second": self.count / elapsed if elapsed > 0 else 0.0,
+            "p50_ms": self.percentile(0.50) * 1000,
+            "p99_ms": self.percentile(0.99) * 1000,
+        }
+
+
+class GameServer:
+    """
+    Hosts many classes.Game sessions in one process behind a line-based JSON protocol.
+    Every request is one JSON object per line, e.g.
+    {"id": 1, "cmd": "play_current_room_game", "session": "s1", "bet": 5}
+    and gets exactly one JSON line back with "ok" and either "result" or "error".
+    Sessions are kept in least recently used order; idle sessions and the oldest ones
+    beyond max_sessions are dropped, so abandoned clients don't pile up.
+    """
+
+    def __init__(self, story_file: str = "story.json", max_sessions: int = MAX_SESSIONS,
+                 idle_seconds: float = SESSION_IDLE_SECONDS):
+        self.story_file = story_file
+        self.max_sessions = max_sessions
+        self.idle_seconds = idle_seconds
+        self.sessions: "OrderedDict[str, classes.Game]" = OrderedDict()
+        self.last_used: Dict[str, float] = {}
+        self.evicted = 0
+        self.stats: Dict[str, CommandStats] = {}
+        self.started = time.perf_counter()
+        self._session_ids = itertools.count(1)
+        for casino_game in classes.WorldTemplate.for_story(classes.Story(story_file)).games:
+            if casino_game:
+                casino_game.ready()  # Start preparing the games in the background right away
+        self.commands = {
+            "new_session": self.new_session,
+            "close_session": self.close_session,
+            "move_to_room": self.move_to_room,
+            "unlock_room": self.unlock_room,
+            "play_current_room_game": self.play_current_room_game,
+            "get_current_room_details": self.get_current_room_details,
+            "get_player_money": self.get_player_money,
+            "stats": self.get_stats,
+            "metrics": self.get_metrics,
+        }
+
+    # --- Commands ---
+
+    def new_session(self, request: dict) -> dict:
+        game = classes.Game(request.get("name", "Player"), self.story_file, request.get("mode", "normal"),
+                            output=classes.BufferSink())
+        game.create_rooms()
+        session_id = f"s{next(self._session_ids)}"
+        self.evict_sessions(reserve=1)
+        self.sessions[session_id] = game
+        self.last_used[session_id] = time.monotonic()
+        return {"session": session_id}
+
+    def close_session(self, request: dict) -> bool:
+        session_id = self._session_id(request)
+        self.last_used.pop(session_id, None)
+        return self.sessions.pop(session_id, None) is not None
+
+    def move_to_room(self, request: dict) -> str:
+        return self._session(request).move_to_room(request["room"])
+
+    def unlock_room(self, request: dict) -> dict:
+        game = self._session(request)
+        return {"result": game.unlock_room(request["room"]), "money": game.get_player_money()}
+
+    def play_current_room_game(self, request: dict) -> dict:
+        game = self._session(request)
+        casino_game = game.current_room.game if game.current_room else None
+        if casino_game and not casino_game.ready():
+            # Rounds run on the event loop, so they must not wait for the odds themselves
+            raise ValueError(f"{casino_game.name} is still being prepared, please try again in a moment.")
+        result = game.play_current_room_game(int(request["bet"]), request.get("choice"))
+        return {"result": result, "narration": game.output.drain(), "money": game.get_player_money()}
+
+    def get_current_room_details(self, request: dict) -> str:
+        return self._session(request).get_current_room_details()
+
+    def get_player_money(self, request: dict) -> int:
+        return self._session(request).get_player_money()
+
+    def get_stats(self, request: dict) -> dict:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "sessions": len(self.sessions),
+            "evicted_sessions": self.evicted,
+            "uptime_seconds": elapsed,
+            "commands": {name: stats.summary(elapsed) for name, stats in self.stats.items()},
+        }
+
+    def get_metrics(self, request: dict):
+        """
+        Engine metrics; Prometheus text if the request asks for "format": "prometheus".
+        """
+        if request.get("format") == "prometheus":
+            return metrics.registry.prometheus_text()
+        return metrics.registry.to_dict()
+
+    def _session_id(self, request: dict) -> str:
+        session_id = request.get("session")
+        if not session_id:
+            raise ValueError("Missing 'session'.")
+        return session_id
+
+    def _session(self, request: dict) -> classes.Game:
+        self.evict_sessions()
+        session_id = self._session_id(request)
+        if session_id not in self.sessions:
+            raise ValueError(f"Unknown session '{session_id}'.")
+        self.sessions.move_to_end(session_id)
+        self.last_used[session_id] = time.monotonic()
+        return self.sessions[session_id]
+
+    def evict_sessions(self, reserve: int = 0):
+        """
+        Drop sessions that have been idle too long, and the least recently used ones until
+        reserve more sessions fit. The oldest session is always first, so this stops at the
+        first session that stays.
+        """
+        expired = time.monotonic() - self.idle_seconds
+        while self.sessions:
+            session_id = next(iter(self.sessions))
+            if self.last_used[session_id] > expired and len(self.sessions) + reserve <= self.max_sessions:
+                break
+            del self.sessions[session_id]
+            del self.last_used[session_id]
+            self.evicted += 1
+
+    # --- Protocol ---
+
+    def handle_line(self, line: bytes) -> dict:
+        """
+        Execute one request line and build the response object.
+        """
+        started = time.perf_counter()
+        command = None
+        response = {}
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object.")
+            response["id"] = request.get("id")
+            command = request.get("cmd")
+            if command not in self.commands:
+                raise ValueError(f"Unknown command '{command}'.")
+            response["ok"] = True
+            response["result"] = self.commands[command](request)
+        except (ValueError, KeyError, TypeError) as e:
+            response["ok"] = False
+            response["error"] = str(e) if not isinstance(e, KeyError) else f"Missing {e}."
+        except Exception as e:  # A bug in a command must not drop the client without an answer
+            traceback.print_exc()
+            response["ok"] = False
+            response["error"] = f"Internal error: {type(e).__name__}: {e}"
+        if command in self.commands:
+            self.stats.setdefault(command, CommandStats()).record(time.perf_counter() - started, response["ok"])
+        return response
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                response = self.handle_line(line)
+                writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix_path: Optional[str] = None):
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle_client, path=unix_path)
+        else:
+            server = await asyncio.start_server(self.handle_client, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+async def _request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, **request) -> dict:
+    writer.write(json.dumps(request).encode("utf-8") + b"\n")
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+async def run_load(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, clients: int = 100,
+                   rounds: int = 100, unix_path: Optional[str] = None) -> dict:
+    """
+    Drive a running server with many concurrent sessions and return its stats.
+    Each client opens its own session and mixes all game commands.
+    """
+    async def client(number: int):
+        if unix_path:
+            reader, writer = await asyncio.open_unix_connection(unix_path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        response = await _request(reader, writer, cmd="new_session", name=f"Bot {number}")
+        session = response["result"]["session"]
+        await _request(reader, writer, cmd="move_to_room", session=session, room="Slots Room")
+        for _ in range(rounds):
+            await _request(reader, writer, cmd="play_current_room_game", session=session, bet=random.randint(2, 5))
+            await _request(reader, writer, cmd="get_player_money", session=session)
+            await _request(reader, writer, cmd="get_current_room_details", session=session)
+        await _request(reader, writer, cmd="close_session", session=session)
+        writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(number) for number in range(clients)))
+    elapsed = time.perf_counter() - started
+
+    if unix_path:
+        reader, writer = await asyncio.open_unix_connection(unix_path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    stats = (await _request(reader, writer, cmd="stats"))["result"]
+    writer.close()
+    stats["load_seconds"] = elapsed
+    stats["load_requests_per_second"] = clients * (3 * rounds + 3) / elapsed
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Golden Casino Requiem game server")
+    parser.add_argument("mode", choices=["serve", "load"], help="Run the server or drive one with load")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="Listen on / connect to a unix socket instead of TCP")
+    parser.add_argument("--clients", type=int, default=100, help="Concurrent sessions for load mode")
+    parser.add_argument("--rounds", type=int, default=100, help="Rounds per session for load mode")
+    args = parser.parse_args()
+
+    if args.mode == "serve":
+        asyncio.run(GameServer().serve(args.host, args.port, args.unix))
+    else:
+        stats = asyncio.run(run_load(args.host, args.port, args.clients, args.rounds, args.unix))
+        print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import json
+import unittest
+from unittest import mock
+
+from modules import classes, server
+
+
+class GameServerTest(unittest.TestCase):
+    def setUp(self):
+        self.server = server.GameServer(max_sessions=2)
+
+    def request(self, **request) -> dict:
+        return self.server.handle_line(json.dumps(request).encode("utf-8"))
+
+    def new_session(self) -> str:
+        return self.request(cmd="new_session")["result"]["session"]
+
+    def test_dispatch(self):
+        session = self.new_session()
+        response = self.request(id=7, cmd="move_to_room", session=session, room="Slots Room")
+        self.assertEqual(response, {"id": 7, "ok": True, "result": "You moved to Slots Room."})
+        played = self.request(cmd="play_current_room_game", session=session, bet=5)["result"]
+        self.assertTrue(played["result"])
+        self.assertEqual(self.server.sessions[session].bet_history.recent(1)[0].bet, 5)
+        self.assertEqual(self.request(cmd="get_player_money", session=session)["result"], played["money"])
+
+        stats = self.request(cmd="stats")["result"]
+        self.assertEqual(stats["sessions"], 1)
+        self.assertEqual(stats["commands"]["play_current_room_game"]["count"], 1)
+
+    def test_errors(self):
+        session = self.new_session()
+        self.request(cmd="move_to_room", session=session, room="Slots Room")
+        self.assertEqual(self.request(cmd="play_current_room_game", session=session),
+                         {"id": None, "ok": False, "error": "Missing 'bet'."})  # KeyError
+        response = self.request(cmd="play_current_room_game", session=session, bet=None)  # TypeError
+        self.assertFalse(response["ok"])
+        self.assertIn("int()", response["error"])
+        self.assertEqual(self.request(cmd="get_player_money")["error"], "Missing 'session'.")
+        self.assertEqual(self.request(cmd="get_player_money", session="s99")["error"], "Unknown session 's99'.")
+        self.assertEqual(self.request(cmd="jump")["error"], "Unknown command 'jump'.")
+        self.assertEqual(self.server.handle_line(b"[1]"), {"ok": False, "error": "Request must be a JSON object."})
+        self.assertFalse(self.server.handle_line(b"{not json")["ok"])
+        self.assertEqual(self.server.stats["play_current_room_game"].errors, 2)
+
+        with mock.patch.object(classes.Game, "get_player_money", side_effect=RuntimeError("boom")), \
+                mock.patch("traceback.print_exc"):
+            response = self.request(id=3, cmd="get_player_money", session=session)
+        self.assertEqual(response, {"id": 3, "ok": False, "error": "Internal error: RuntimeError: boom"})
+
+    def test_least_recently_used_session_is_evicted(self):
+        first, second = self.new_session(), self.new_session()
+        self.request(cmd="get_player_money", session=first)  # second is now the least recently used
+        third = self.new_session()
+        self.assertEqual(list(self.server.sessions), [first, third])
+        self.assertEqual(self.server.evicted, 1)
+        self.assertFalse(self.request(cmd="get_player_money", session=second)["ok"])
+
+    def test_idle_sessions_are_evicted(self):
+        self.server.idle_seconds = 0
+        session = self.new_session()
+        response = self.request(cmd="get_player_money", session=session)
+        self.assertEqual(response["error"], f"Unknown session '{session}'.")
+        self.assertEqual(self.server.sessions, {})
+        self.assertEqual(self.server.evicted, 1)
+
+    def test_horse_race_waits_for_its_odds(self):
+        session = self.new_session()
+        game = self.server.sessions[session]
+        game.give_bonus(1000)
+        self.request(cmd="unlock_room", session=session, room="Horse Race Room")
+        self.request(cmd="move_to_room", session=session, room="Horse Race Room")
+        money = game.get_player_money()
+        with mock.patch.object(classes.HorseRace, "ready", return_value=False):
+            response = self.request(cmd="play_current_room_game", session=session, bet=10,
+                                    choice=game.current_room.game.horses[0])
+        self.assertFalse(response["ok"])
+        self.assertIn("still being prepared", response["error"])
+        self.assertEqual(game.get_player_money(), money)
+        self.assertEqual(len(game.bet_history), 0)
+
+    def test_close_session(self):
+        session = self.new_session()
+        self.assertEqual(self.request(cmd="close_session", session=session)["result"], True)
+        self.assertEqual(self.request(cmd="close_session", session=session)["result"], False)
+        self.assertNotIn(session, self.server.last_used)
+        self.assertFalse(self.request(cmd="get_player_money", session=session)["ok"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,369 @@
+"""
+Local SQLite store of players, sessions, rounds and unlocks, with leaderboard queries.
+The database runs in WAL mode, so leaderboards can be read while rounds are being written.
+The game loop never waits for the disk: the record_*() methods only queue a row, and a
+background writer thread inserts whatever has queued up in one transaction per batch
+(up to BATCH_SIZE rows, at least every FLUSH_SECONDS).
+
+Leaderboards only walk indexes: top balances read sessions by money, biggest wins read
+rounds by (game, payout - bet) one game at a time, so they answer in milliseconds with
+millions of rounds stored.
+
+Run from the repository root to fill a scratch database and time the leaderboards:
+python -m modules.stats --rounds 2000000
+"""
+import argparse
+import itertools
+import os
+import queue
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional
+
+from modules.history import BetRecord
+from modules.paths import DATA_DIR
+
+STATS_FILE = os.path.join(DATA_DIR, "casino_stats.db")
+SCHEMA_VERSION = 1
+BATCH_SIZE = 5000  # Rows per transaction at most
+FLUSH_SECONDS = 0.5  # Queued rows wait at most this long for more to batch with
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    player_id INTEGER NOT NULL REFERENCES players(id),
+    mode TEXT NOT NULL,
+    seed INTEGER,
+    started REAL NOT NULL,
+    ended REAL,
+    money INTEGER NOT NULL,
+    jackpot_wins INTEGER NOT NULL DEFAULT 0,
+    rounds INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS sessions_money ON sessions(money);
+CREATE INDEX IF NOT EXISTS sessions_jackpots ON sessions(player_id, jackpot_wins) WHERE jackpot_wins > 0;
+CREATE TABLE IF NOT EXISTS rounds (
+    id INTEGER PRIMARY KEY,
+    session_id INTEGER NOT NULL REFERENCES sessions(id),
+    game TEXT NOT NULL,
+    bet INTEGER NOT NULL,
+    payout INTEGER NOT NULL,
+    balance INTEGER NOT NULL,
+    played REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS rounds_game_win ON rounds(game, payout - bet);
+CREATE TABLE IF NOT EXISTS unlocks (
+    session_id INTEGER NOT NULL REFERENCES sessions(id),
+    room TEXT NOT NULL,
+    cost INTEGER NOT NULL,
+    unlocked REAL NOT NULL,
+    PRIMARY KEY (session_id, room)
+) WITHOUT ROWID;
+"""
+
+INSERT_PLAYER = "INSERT INTO players (name) VALUES (?) ON CONFLICT (name) DO NOTHING"
+INSERT_SESSION = ("INSERT INTO sessions (id, player_id, mode, seed, started, money) "
+                  "VALUES (?, (SELECT id FROM players WHERE name = ?), ?, ?, ?, ?)")
+INSERT_ROUND = "INSERT INTO rounds (session_id, game, bet, payout, balance, played) VALUES (?, ?, ?, ?, ?, ?)"
+UPDATE_AFTER_ROUNDS = "UPDATE sessions SET money = ?, jackpot_wins = ?, rounds = rounds + ? WHERE id = ?"
+INSERT_UNLOCK = "INSERT OR IGNORE INTO unlocks (session_id, room, cost, unlocked) VALUES (?, ?, ?, ?)"
+UPDATE_MONEY = "UPDATE sessions SET money = ? WHERE id = ?"
+END_SESSION = "UPDATE sessions SET ended = ?, money = ?, jackpot_wins = ? WHERE id = ?"
+
+# Distinct games as a skip scan over rounds_game_win: one index seek per game instead of a full scan
+GAMES = """
+WITH RECURSIVE games (game) AS (
+    SELECT MIN(game) FROM rounds
+    UNION ALL
+    SELECT (SELECT MIN(game) FROM rounds WHERE game > games.game) FROM games WHERE game IS NOT NULL
+)
+SELECT game FROM games WHERE game IS NOT NULL
+"""
+TOP_BALANCES = """
+SELECT players.name, sessions.money, sessions.rounds FROM sessions
+JOIN players ON players.id = sessions.player_id
+ORDER BY sessions.money DESC LIMIT ?
+"""
+BIGGEST_WINS = """
+SELECT players.name, rounds.bet, rounds.payout FROM rounds
+JOIN sessions ON sessions.id = rounds.session_id
+JOIN players ON players.id = sessions.player_id
+WHERE rounds.game = ? AND rounds.payout - rounds.bet > 0
+ORDER BY rounds.payout - rounds.bet DESC LIMIT ?
+"""
+JACKPOT_COUNTS = """
+SELECT players.name, SUM(sessions.jackpot_wins) AS jackpots FROM sessions
+JOIN players ON players.id = sessions.player_id
+WHERE sessions.jackpot_wins > 0
+GROUP BY sessions.player_id ORDER BY jackpots DESC LIMIT ?
+"""
+
+
+class Balance(NamedTuple):
+    player: str
+    money: int
+    rounds: int
+
+
+class BigWin(NamedTuple):
+    player: str
+    bet: int
+    payout: int
+
+    @property
+    def won(self) -> int:
+        return self.payout - self.bet
+
+
+class JackpotCount(NamedTuple):
+    player: str
+    jackpots: int
+
+
+class StatsStore:
+    """
+    Player stats in one SQLite file.
+    Writes go through a queue to a single writer thread; reads use one connection per
+    calling thread, which WAL lets run alongside the writer. Front ends that must not
+    block read on the store's reader thread, see request_describe().
+    """
+
+    def __init__(self, path: str = STATS_FILE):
+        self.path = path
+        self.errors = 0  # Batches that failed to write, the last error is kept for display
+        self.last_error: Optional[Exception] = None
+        self._queue: queue.Queue = queue.Queue()
+        self._local = threading.local()
+        self._reader_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stats-reader")
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = self._connect()
+        with connection:
+            connection.executescript(SCHEMA)
+            connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        connection.close()
+
+        self._writer = threading.Thread(target=self._write_loop, name="stats-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=10)
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")  # Durable at checkpoints, safe against corruption in WAL mode
+        return connection
+
+    def _reader(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = self._connect()
+            connection.execute("PRAGMA query_only = ON")
+        return connection
+
+    def _close_reader(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    # Writing
+
+    def start_session(self, player_name: str, mode: str, money: int, seed: Optional[int] = None) -> int:
+        """
+        Register a new session and return its id.
+        Ids are random, so processes writing to the same file never hand out the same one.
+        """
+        session_id = random.randrange(1, 2 ** 63)
+        self._queue.put(("session", session_id, player_name, mode, seed, time.time(), money))
+        return session_id
+
+    def record_round(self, session_id: int, record: BetRecord, jackpot_wins: int):
+        """
+        Queue one played round, with the player's jackpot count after it.
+        """
+        self._queue.put(("round", session_id, record.game, record.bet, record.payout, record.balance, time.time(),
+                         jackpot_wins))
+
+    def record_unlock(self, session_id: int, room_name: str, cost: int, money: int):
+        self._queue.put(("unlock", session_id, room_name, cost, time.time(), money))
+
+    def end_session(self, session_id: int, money: int, jackpot_wins: int):
+        self._queue.put(("end", session_id, time.time(), money, jackpot_wins))
+
+    def flush(self):
+        """
+        Block until everything queued so far is written.
+        """
+        self._queue.put(("flush",))
+        self._queue.join()
+
+    def close(self):
+        """
+        Write what is still queued and stop the writer thread.
+        """
+        if self._writer.is_alive():
+            self._queue.put(("close",))
+            self._writer.join()
+        self._reader_pool.submit(self._close_reader)
+        self._reader_pool.shutdown(wait=True)
+        self._close_reader()
+
+    def _write_loop(self):
+        connection = self._connect()
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + FLUSH_SECONDS
+            while len(batch) < BATCH_SIZE and batch[-1][0] not in ("flush", "close"):
+                timeout = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write(connection, [op for op in batch if op[0] not in ("flush", "close")])
+            finally:
+                # Even if the batch failed, so flush() and close() never wait forever
+                for _ in batch:
+                    self._queue.task_done()
+            if batch[-1][0] == "close":
+                break
+        connection.close()
+
+    def _write(self, connection: sqlite3.Connection, ops: List[tuple]):
+        if not ops:
+            return
+        try:
+            with connection:  # One transaction per batch
+                # Consecutive operations of a kind become one executemany, their order is kept
+                for kind, group in itertools.groupby(ops, key=lambda op: op[0]):
+                    rows = [op[1:] for op in group]
+                    if kind == "session":
+                        connection.executemany(INSERT_PLAYER, [(row[1],) for row in rows])
+                        connection.executemany(INSERT_SESSION, rows)
+                    elif kind == "round":
+                        connection.executemany(INSERT_ROUND, [row[:6] for row in rows])
+                        latest: Dict[int, list] = {}
+                        for session_id, _, _, _, balance, _, jackpot_wins in rows:
+                            state = latest.setdefault(session_id, [0, 0, 0])
+                            state[0], state[1] = balance, jackpot_wins
+                            state[2] += 1
+                        connection.executemany(UPDATE_AFTER_ROUNDS, [(*state, session_id) for session_id, state in latest.items()])
+                    elif kind == "unlock":
+                        connection.executemany(INSERT_UNLOCK, [row[:4] for row in rows])
+                        connection.executemany(UPDATE_MONEY, [(row[4], row[0]) for row in rows])
+                    elif kind == "end":
+                        connection.executemany(END_SESSION, [(*row[1:], row[0]) for row in rows])
+        except Exception as e:  # A bad row must not kill the writer, the batch is dropped and counted
+            self.errors += 1
+            self.last_error = e
+
+    # Leaderboards
+
+    def top_balances(self, limit: int = 10) -> List[Balance]:
+        return [Balance(*row) for row in self._reader().execute(TOP_BALANCES, (limit,))]
+
+    def games(self) -> List[str]:
+        return [game for game, in self._reader().execute(GAMES)]
+
+    def biggest_wins(self, limit: int = 3) -> Dict[str, List[BigWin]]:
+        """
+        The biggest net wins of every game that has been played.
+        """
+        reader = self._reader()
+        return {game: [BigWin(*row) for row in reader.execute(BIGGEST_WINS, (game, limit))] for game in self.games()}
+
+    def jackpot_counts(self, limit: int = 10) -> List[JackpotCount]:
+        return [JackpotCount(*row) for row in self._reader().execute(JACKPOT_COUNTS, (limit,))]
+
+    def describe(self, limit: int = 5) -> str:
+        """
+        The leaderboards as text, for the GUI.
+        """
+        lines = ["Top balances:"]
+        lines += [f"  {rank}. {entry.player}: {entry.money} coins ({entry.rounds} rounds)"
+                  for rank, entry in enumerate(self.top_balances(limit), start=1)]
+        lines.append("\nBiggest wins:")
+        for game, wins in self.biggest_wins(1).items():
+            lines += [f"  {game}: {win.player} won {win.won} on a {win.bet} coin bet" for win in wins]
+        lines.append("\nJackpots:")
+        lines += [f"  {entry.player}: {entry.jackpots}" for entry in self.jackpot_counts(limit)]
+        if self.errors:
+            lines.append(f"\n{self.errors} batches of stats could not be saved, last error: {self.last_error}")
+        return "\n".join(lines)
+
+    def request_describe(self, limit: int = 5) -> Future:
+        """
+        describe() run on the store's reader thread, for front ends that must not block.
+        """
+        return self._reader_pool.submit(self.describe, limit)
+
+
+def _fill(store: StatsStore, rounds: int, seed: int, games: List[str], rounds_per_session: int = 1000):
+    rng = random.Random(seed)
+    session_id = None
+    money = jackpots = 0
+    for index in range(rounds):
+        if index % rounds_per_session == 0:
+            if session_id is not None:
+                store.end_session(session_id, money, jackpots)
+            money, jackpots = 100, 0
+            session_id = store.start_session(f"Bot {rng.randrange(1000)}", "normal", money)
+        bet = rng.randint(1, 50)
+        payout = bet * rng.choice((0, 0, 0, 1, 2, 2, 3, 5, 10, 50))
+        if payout >= bet * 50:
+            jackpots += 1
+        money = max(0, money - bet + payout)
+        store.record_round(session_id, BetRecord(rng.choice(games), bet, payout, money), jackpots)
+    if session_id is not None:
+        store.end_session(session_id, money, jackpots)
+
+
+def _best_ms(query, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        query()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    from modules import classes
+
+    parser = argparse.ArgumentParser(description="Fill a scratch stats database and time the leaderboards")
+    parser.add_argument("--db", default=os.path.join(tempfile.gettempdir(), "casino_stats_bench.db"))
+    parser.add_argument("--rounds", type=int, default=1_000_000, help="Synthetic rounds to add before timing")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    store = StatsStore(args.db)
+    started = time.perf_counter()
+    _fill(store, args.rounds, args.seed, list(classes.WorldTemplate.GAME_TYPES))
+    store.flush()
+    seconds = time.perf_counter() - started
+    if args.rounds:
+        print(f"Wrote {args.rounds:,} rounds in {seconds:.1f} s ({args.rounds / seconds:,.0f} rounds/s)")
+    if store.errors:
+        print(f"{store.errors} batches failed, last error: {store.last_error}")
+
+    stored = store._reader().execute("SELECT COUNT(*) FROM rounds").fetchone()[0]
+    print(f"{stored:,} rounds stored in {args.db}")
+    for name, query in (("top balances", store.top_balances), ("biggest wins per game", store.biggest_wins),
+                        ("jackpot counts", store.jackpot_counts)):
+        print(f"{name:<22} {_best_ms(query):8.2f} ms")
+    print()
+    print(store.describe())
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from modules import stats
+from modules.history import BetRecord
+
+
+class StatsStoreTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store = stats.StatsStore(os.path.join(directory.name, "stats.db"))
+        self.addCleanup(self.store.close)
+
+    def flush(self):
+        # flush() must return even if the writer hit an error, don't let a regression hang the suite
+        flusher = threading.Thread(target=self.store.flush, daemon=True)
+        flusher.start()
+        flusher.join(timeout=10)
+        self.assertFalse(flusher.is_alive(), "flush() did not return")
+
+    def play(self, name: str, rounds):
+        session = self.store.start_session(name, "normal", 100)
+        for game, bet, payout, balance in rounds:
+            self.store.record_round(session, BetRecord(game, bet, payout, balance), 0)
+        return session
+
+    def test_leaderboards(self):
+        self.play("Ada", [("Slots", 10, 0, 90), ("Slots", 10, 100, 180)])
+        bob = self.play("Bob", [("Roulette", 12, 432, 520)])
+        self.store.end_session(bob, 520, 1)
+        self.flush()
+
+        self.assertEqual(self.store.top_balances(2), [stats.Balance("Bob", 520, 1), stats.Balance("Ada", 180, 2)])
+        self.assertEqual(self.store.biggest_wins(1), {"Roulette": [stats.BigWin("Bob", 12, 432)],
+                                                      "Slots": [stats.BigWin("Ada", 10, 100)]})
+        self.assertEqual(self.store.jackpot_counts(), [stats.JackpotCount("Bob", 1)])
+        self.assertEqual(self.store.request_describe().result(timeout=10), self.store.describe())
+
+    def test_writer_survives_bad_rows(self):
+        self.store._queue.put(("session", 1))  # Broken in Python, not in SQLite
+        self.flush()
+        self.assertIsInstance(self.store.last_error, IndexError)
+        self.store._queue.put(("end", 1))  # Rejected by SQLite
+        self.flush()
+        self.assertEqual(self.store.errors, 2)
+        self.assertIsNotNone(self.store.last_error)
+        self.assertIn("could not be saved", self.store.describe())
+
+        self.play("Ada", [("Slots", 10, 20, 110)])
+        self.flush()
+        self.assertEqual(self.store.top_balances(), [stats.Balance("Ada", 110, 1)])
+
+    def test_creates_the_data_directory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = stats.StatsStore(os.path.join(directory, "data", "stats.db"))
+            store.close()
+            self.assertTrue(os.path.exists(os.path.join(directory, "data", "stats.db")))
+        self.assertEqual(os.path.dirname(stats.STATS_FILE), stats.DATA_DIR)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,285 @@
+"""
+Tournament runner that plays headless bot sessions on every core.
+The sessions of each strategy are split into chunks of consecutive seeds and fanned out to
+a ProcessPoolExecutor. Session i of a strategy always uses seed + i, whichever worker plays
+it, so a tournament gives the same results with any number of workers. Chunks stream back
+as soon as they are done and are merged into the distributions of final money, rooms
+unlocked and rounds to the story's win target.
+
+Odds that strategies look up, and the odds of the horse race fields that every race pays
+out, are computed once in the parent for the games of the story's world and handed to every
+worker, so simulated games aren't sampled again in each process.
+
+Run from the repository root:  python -m modules.tournament --sessions 2000
+Speed-up per added worker:     python -m modules.tournament --scaling
+"""
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from modules import bots, classes, horserace, odds
+
+CHUNKS_PER_WORKER = 8  # Small enough chunks to keep every worker busy until the end
+
+
+class Distribution:
+    """
+    Counts of integer values, merged across workers without keeping every sample.
+    """
+    __slots__ = ("counts",)
+
+    def __init__(self, values: Iterable[int] = ()):
+        self.counts = Counter(values)
+
+    def add(self, value: int):
+        self.counts[value] += 1
+
+    def merge(self, other: "Distribution"):
+        self.counts.update(other.counts)
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    @property
+    def mean(self) -> Optional[float]:
+        total = self.total
+        return sum(value * count for value, count in self.counts.items()) / total if total else None
+
+    def percentile(self, fraction: float) -> Optional[int]:
+        total = self.total
+        if not total:
+            return None
+        rank = min(total - 1, int(fraction * total))
+        seen = 0
+        for value in sorted(self.counts):
+            seen += self.counts[value]
+            if seen > rank:
+                return value
+        return None
+
+    def summary(self) -> dict:
+        return {"count": self.total, "mean": self.mean, "p10": self.percentile(0.10),
+                "p50": self.percentile(0.50), "p90": self.percentile(0.90)}
+
+
+class Standings:
+    """
+    Merged results of the sessions one strategy played so far.
+    """
+    def __init__(self, strategy: str):
+        self.strategy = strategy
+        self.sessions = 0
+        self.rounds = 0
+        self.seconds = 0.0  # Time spent playing, summed over all workers
+        self.outcomes: Counter = Counter()
+        self.final_money = Distribution()
+        self.unlocked = Distribution()
+        self.rounds_to_target = Distribution()
+
+    def record(self, result: dict, seconds: float):
+        self.sessions += 1
+        self.rounds += result["rounds"]
+        self.seconds += seconds
+        self.outcomes[result["outcome"]] += 1
+        self.final_money.add(result["money"])
+        self.unlocked.add(result["unlocked"])
+        if result["outcome"] == "target":
+            self.rounds_to_target.add(result["rounds"])
+
+    def merge(self, other: "Standings"):
+        self.sessions += other.sessions
+        self.rounds += other.rounds
+        self.seconds += other.seconds
+        self.outcomes.update(other.outcomes)
+        self.final_money.merge(other.final_money)
+        self.unlocked.merge(other.unlocked)
+        self.rounds_to_target.merge(other.rounds_to_target)
+
+    def rate(self, outcome: str) -> float:
+        return self.outcomes[outcome] / self.sessions if self.sessions else 0.0
+
+    def summary(self) -> dict:
+        return {
+            "strategy": self.strategy,
+            "sessions": self.sessions,
+            "rounds": self.rounds,
+            "rounds_per_cpu_second": self.rounds / self.seconds if self.seconds else 0.0,
+            "bankruptcy_rate": self.rate("bankrupt"),
+            "stuck_rate": self.rate("stuck"),
+            "target_rate": self.rate("target"),
+            "final_money": self.final_money.summary(),
+            "unlocked": dict(sorted(self.unlocked.counts.items())),
+            "rounds_to_target": self.rounds_to_target.summary(),
+        }
+
+
+def _start_worker(odds_table: Dict[Tuple[str, int], odds.Odds], fields: Dict[tuple, horserace.FieldOdds]):
+    odds.preload(odds_table)
+    horserace.preload(fields)
+
+
+def play_chunk(strategy_name: str, first_seed: int, sessions: int, max_rounds: int, mode: str) -> Standings:
+    """
+    Play sessions with seeds first_seed, first_seed + 1, ... in a worker process.
+    """
+    standings = Standings(strategy_name)
+    for seed in range(first_seed, first_seed + sessions):
+        game = bots.new_session(seed, mode)
+        started = time.perf_counter()
+        result = bots.play_session(bots.STRATEGIES[strategy_name](), game, max_rounds)
+        standings.record(result, time.perf_counter() - started)
+    return standings
+
+
+def world_game_types() -> List[type]:
+    """
+    Types of the games in the rooms of the story the bots play, see bots.new_session().
+    """
+    world = classes.WorldTemplate.for_story(classes.Story(bots.STORY_FILE))
+    return list(dict.fromkeys(type(game) for game in world.games if game))
+
+
+def odds_table(strategy_names: Iterable[str]) -> Dict[Tuple[str, int], odds.Odds]:
+    """
+    Odds of every game in the world if one of the strategies looks them up, for the workers,
+    keyed by odds.table_key().
+    """
+    if not any(bots.STRATEGIES[name]().uses_odds for name in strategy_names):
+        return {}
+    return {odds.table_key(game_type): odds.odds_for(game_type) for game_type in world_game_types()}
+
+
+def field_odds_table() -> Dict[tuple, horserace.FieldOdds]:
+    """
+    Odds of the horse race fields in the world, which every race needs to pay out, for the workers.
+    """
+    return {game_type.field: horserace.odds_for_field(game_type.field)
+            for game_type in world_game_types() if issubclass(game_type, classes.HorseRace)}
+
+
+def run_tournament(strategy_names: List[str], sessions: int = 1000, max_rounds: int = 5000, seed: int = 0,
+                   mode: str = "normal", workers: Optional[int] = None, chunk: Optional[int] = None,
+                   table: Optional[Dict[Tuple[str, int], odds.Odds]] = None,
+                   fields: Optional[Dict[tuple, horserace.FieldOdds]] = None,
+                   on_chunk: Optional[Callable[[Standings], None]] = None) -> Dict[str, Standings]:
+    """
+    Play sessions seeded seed to seed + sessions - 1 with every strategy, spread over worker processes.
+    :param workers: Worker processes, all cores by default.
+    :param chunk: Sessions per task, by default CHUNKS_PER_WORKER tasks per worker and strategy.
+    :param table: Odds for the workers, see odds_table(). Computed here if not given.
+    :param fields: Horse race odds for the workers, see field_odds_table(). Computed here if not given.
+    :param on_chunk: Called in this process with every chunk as it comes back, e.g. for progress.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunk = chunk or max(1, sessions // (workers * CHUNKS_PER_WORKER))
+    table = odds_table(strategy_names) if table is None else table
+    fields = field_odds_table() if fields is None else fields
+
+    standings = {name: Standings(name) for name in strategy_names}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_start_worker, initargs=(table, fields)) as pool:
+        futures = [pool.submit(play_chunk, name, seed + start, min(chunk, sessions - start), max_rounds, mode)
+                   for name in strategy_names for start in range(0, sessions, chunk)]
+        for future in as_completed(futures):
+            result = future.result()
+            standings[result.strategy].merge(result)
+            if on_chunk:
+                on_chunk(result)
+    return standings
+
+
+def measure_scaling(strategy_names: List[str], worker_counts: List[int], sessions: int, max_rounds: int,
+                    seed: int = 0, mode: str = "normal") -> List[dict]:
+    """
+    Wall time of the same tournament with each number of workers, and its speed-up over one worker.
+    The odds are computed once up front and left out of the timings.
+    """
+    table = odds_table(strategy_names)
+    fields = field_odds_table()
+    rows: List[dict] = []
+    reference = None
+    for workers in worker_counts:
+        started = time.perf_counter()
+        standings = run_tournament(strategy_names, sessions, max_rounds, seed, mode, workers, table=table, fields=fields)
+        seconds = time.perf_counter() - started
+        outcome = {name: result.final_money.counts for name, result in standings.items()}
+        if reference is None:
+            reference = outcome
+        first = rows[0] if rows else None
+        speed_up = first["seconds"] / seconds if first else 1.0
+        previous = rows[-1] if rows else None
+        rows.append({
+            "workers": workers,
+            "seconds": seconds,
+            "rounds_per_second": sum(result.rounds for result in standings.values()) / seconds,
+            "speed_up": speed_up,
+            "efficiency": speed_up * (first["workers"] if first else workers) / workers,
+            # Speed-up gained per worker added since the previous row
+            "gain_per_worker": (speed_up - previous["speed_up"]) / (workers - previous["workers"]) if previous else None,
+            "same_results": outcome == reference,
+        })
+    return rows
+
+
+def _format(value, spec: str) -> str:
+    return "-" if value is None else format(value, spec)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play bot tournaments across all cores")
+    parser.add_argument("--strategy", choices=["all"] + list(bots.STRATEGIES), default="all")
+    parser.add_argument("--sessions", type=int, default=1000, help="Sessions per strategy")
+    parser.add_argument("--max-rounds", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mode", choices=["normal", "easy"], default="normal")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk", type=int, default=None, help="Sessions per task")
+    parser.add_argument("--scaling", action="store_true", help="Time 1, 2, 4, ... workers up to --workers")
+    args = parser.parse_args()
+
+    names = list(bots.STRATEGIES) if args.strategy == "all" else [args.strategy]
+    if args.scaling:
+        counts = [1]
+        while counts[-1] * 2 < args.workers:
+            counts.append(counts[-1] * 2)
+        if counts[-1] != args.workers:
+            counts.append(args.workers)
+        print(f"{'workers':>7} {'seconds':>9} {'rounds/s':>11} {'speed-up':>9} {'efficiency':>11} {'gain/worker':>12}  same results")
+        for row in measure_scaling(names, counts, args.sessions, args.max_rounds, args.seed, args.mode):
+            print(f"{row['workers']:>7} {row['seconds']:>9.2f} {row['rounds_per_second']:>11,.0f} {row['speed_up']:>8.2f}x "
+                  f"{row['efficiency']:>11.0%} {_format(row['gain_per_worker'], '.2f'):>12}  {row['same_results']}")
+        return
+
+    total = len(names) * args.sessions
+    done = 0
+
+    def progress(result: Standings):
+        nonlocal done
+        done += result.sessions
+        print(f"\r{done}/{total} sessions", end="", file=sys.stderr, flush=True)
+
+    started = time.perf_counter()
+    standings = run_tournament(names, args.sessions, args.max_rounds, args.seed, args.mode,
+                               args.workers, args.chunk, on_chunk=progress)
+    seconds = time.perf_counter() - started
+    print(file=sys.stderr)
+
+    print(f"{'strategy':<14} {'bankrupt':>9} {'stuck':>7} {'target':>7} {'money p10/p50/p90':>20} {'rooms unlocked':>16} "
+          f"{'rounds to target p50/p90':>25}")
+    for name in names:
+        summary = standings[name].summary()
+        money, to_target = summary["final_money"], summary["rounds_to_target"]
+        money_text = "/".join(_format(money[key], "") for key in ("p10", "p50", "p90"))
+        target_text = "/".join(_format(to_target[key], "") for key in ("p50", "p90"))
+        print(f"{name:<14} {summary['bankruptcy_rate']:>9.1%} {summary['stuck_rate']:>7.1%} {summary['target_rate']:>7.1%} "
+              f"{money_text:>20} {_format(standings[name].unlocked.mean, '.2f'):>16} {target_text:>25}")
+    rounds = sum(result.rounds for result in standings.values())
+    print(f"\n{total:,} sessions, {rounds:,} rounds in {seconds:.1f} s on {args.workers} workers ({rounds / seconds:,.0f} rounds/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import json
+import os
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+
+from modules import bots, classes, odds, tournament
+
+
+class DistributionTest(unittest.TestCase):
+    def test_merge_and_percentiles(self):
+        first, second = tournament.Distribution([1, 2, 2]), tournament.Distribution([3, 10])
+        first.merge(second)
+        self.assertEqual(first.total, 5)
+        self.assertEqual(first.mean, 18 / 5)
+        self.assertEqual((first.percentile(0.1), first.percentile(0.5), first.percentile(0.9)), (1, 2, 10))
+        self.assertIsNone(tournament.Distribution().percentile(0.5))
+
+
+class TournamentTest(unittest.TestCase):
+    def results(self, workers: int, chunk: int) -> dict:
+        standings = tournament.run_tournament(["flat", "martingale"], sessions=6, max_rounds=300, seed=3,
+                                              workers=workers, chunk=chunk)
+        return {name: (result.sessions, result.rounds, result.outcomes, result.final_money.counts,
+                       result.unlocked.counts, result.rounds_to_target.counts)
+                for name, result in standings.items()}
+
+    def test_results_do_not_depend_on_workers(self):
+        # Session i always plays seed + i, whichever worker and chunk it lands in
+        reference = self.results(workers=1, chunk=6)
+        self.assertEqual(self.results(workers=2, chunk=1), reference)
+        self.assertEqual(self.results(workers=3, chunk=4), reference)
+
+    def test_matches_sessions_played_in_process(self):
+        money = sorted(bots.play_session(bots.FlatBet(), bots.new_session(3 + index), 300)["money"] for index in range(6))
+        standings = tournament.run_tournament(["flat"], sessions=6, max_rounds=300, seed=3, workers=2)
+        self.assertEqual(sorted(standings["flat"].final_money.counts.elements()), money)
+
+    def test_tables_cover_the_world_only(self):
+        world = classes.WorldTemplate.for_story(classes.Story(bots.STORY_FILE))
+        self.assertEqual(set(tournament.world_game_types()), {type(game) for game in world.games if game})
+        self.assertEqual(tournament.odds_table(["flat", "martingale"]), {})
+        fields = tournament.field_odds_table()
+        self.assertEqual(set(fields), {game_type.field for game_type in tournament.world_game_types()
+                                       if issubclass(game_type, classes.HorseRace)})
+
+
+class SessionOutcomeTest(unittest.TestCase):
+    def play(self, money: int, mode: str) -> dict:
+        game = bots.new_session(1, mode)
+        game.player.deduct_money(game.player.money - money)
+        return bots.play_session(bots.FlatBet(), game, 50)
+
+    def test_bankrupt_only_without_money(self):
+        self.assertEqual(self.play(0, "normal")["outcome"], "bankrupt")
+        self.assertEqual(self.play(1, "normal")["outcome"], "stuck")  # The console game lets this player go on
+
+    def test_easy_mode_rescues_like_the_console_game(self):
+        result = self.play(0, "easy")
+        self.assertEqual(result["outcome"], "max_rounds")
+        self.assertEqual(result["rounds"], 50)
+        self.assertEqual(self.play(1, "easy")["outcome"], "stuck")
+
+
+class TableVariantTest(unittest.TestCase):
+    """
+    A story table with another minimum bet than its game class plays a runtime variant class.
+    """
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        story_file = os.path.join(directory.name, "story.json")
+        story = {
+            "game": {"start_money": 100, "win_target": 400, "start_room": "Lobby"},
+            "rooms": [
+                {"name": "Lobby", "exits": [{"direction": "slots", "room": "Slots Room"}]},
+                {"name": "Slots Room", "exits": [{"direction": "lobby", "room": "Lobby"}],
+                 "game": {"type": "Slots", "min_bet": 7}},
+            ],
+        }
+        with open(story_file, "w", encoding="utf-8") as file:
+            json.dump(story, file)
+        patcher = mock.patch.object(bots, "STORY_FILE", story_file)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_odds_reach_the_workers(self):
+        table = tournament.odds_table(["kelly"])
+        self.assertEqual(list(table), [("Slots", 7)])
+        pickle.dumps(table)
+        self.assertEqual(odds.table_key(type(classes.Slots.shared(7))), ("Slots", 7))
+
+        results = [tournament.run_tournament(["kelly"], sessions=4, max_rounds=200, workers=workers, chunk=1,
+                                             table=table)["kelly"].final_money.counts for workers in (1, 2)]
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[0].total(), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
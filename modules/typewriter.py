@@ -0,0 +1,110 @@
+import time
+from typing import Callable, Optional
+
+import customtkinter as ctk
+
+
+class Typewriter:
+    """
+    Typing effect for a CTkTextbox that works in frames instead of one timer per character.
+    Every frame inserts all characters that are due since the last frame (paced by
+    chars_per_second) in a single insert, and scrolls once. If inserting takes longer than
+    the frame budget, the chunk size shrinks so the UI stays responsive.
+    """
+
+    def __init__(self, widget, textbox, chars_per_second: float = 40, frame_ms: int = 100, budget_ms: float = 8):
+        """
+        :param widget: Any Tk widget, used to schedule the frames with after().
+        :param textbox: The textbox the text is typed into.
+        :param chars_per_second: Typing speed.
+        :param frame_ms: Time between two frames.
+        :param budget_ms: Time one frame may spend inserting text.
+        """
+        self.widget = widget
+        self.textbox = textbox
+        self.chars_per_second = chars_per_second
+        self.frame_ms = frame_ms
+        self.budget = budget_ms / 1000
+        self.text = ""
+        self.typed = 0
+        self.max_chunk = 256
+        self.on_finish: Optional[Callable[[], None]] = None
+        self._started = 0.0
+        self._after_id = None
+
+    @property
+    def running(self) -> bool:
+        return self._after_id is not None
+
+    def start(self, text: str, clear: bool = True, start_delay_ms: int = 0, on_finish: Optional[Callable[[], None]] = None):
+        """
+        Start typing text, replacing whatever this typewriter was typing before.
+        :param clear: Clear the textbox before typing.
+        :param start_delay_ms: Wait this long before the first character appears.
+        :param on_finish: Called once the whole text is shown (also after skip_to_end).
+        """
+        self.cancel()
+        if clear:
+            self.textbox.delete("1.0", ctk.END)
+        self.text = text
+        self.typed = 0
+        self.on_finish = on_finish
+        self._after_id = self.widget.after(start_delay_ms, self._begin)
+
+    def skip_to_end(self):
+        """
+        Show the rest of the text at once.
+        """
+        if not self.running:
+            return
+        self.cancel()
+        self._insert(self.text[self.typed:])
+        self.typed = len(self.text)
+        self._finish()
+
+    def cancel(self):
+        """
+        Stop typing and drop the pending frame, the text typed so far stays.
+        """
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except ValueError:
+                pass
+            self._after_id = None
+
+    def _begin(self):
+        self._started = time.perf_counter()
+        self._frame()
+
+    def _frame(self):
+        self._after_id = None
+        if not self.textbox.winfo_exists():
+            return
+
+        due = int((time.perf_counter() - self._started) * self.chars_per_second) - self.typed
+        chunk = self.text[self.typed:self.typed + max(1, min(due, self.max_chunk))] if due > 0 else ""
+        if chunk:
+            frame_started = time.perf_counter()
+            self._insert(chunk)
+            self.typed += len(chunk)
+            # Adapt the chunk size to the frame budget
+            if time.perf_counter() - frame_started > self.budget:
+                self.max_chunk = max(16, self.max_chunk // 2)
+            elif len(chunk) == self.max_chunk:
+                self.max_chunk *= 2
+
+        if self.typed < len(self.text):
+            self._after_id = self.widget.after(self.frame_ms, self._frame)
+        else:
+            self._finish()
+
+    def _insert(self, chunk: str):
+        if chunk and self.textbox.winfo_exists():
+            self.textbox.insert(ctk.END, chunk)
+            self.textbox.see(ctk.END)
+
+    def _finish(self):
+        if self.on_finish:
+            callback, self.on_finish = self.on_finish, None
+            callback()
@@ -0,0 +1,72 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable
+
+
+class RoundWorkerPool:
+    """
+    Fixed pool of worker threads that resolves game rounds off the UI thread.
+    Rounds of the same session are serialised by a per-session lock, so two quick clicks
+    can never race on one player's balance. Finished rounds are put on a result queue that
+    the UI thread drains (e.g. from Tk's after()), workers never touch widgets.
+    At most max_pending rounds may be queued or running at once, submit() refuses more.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: int = 8):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rounds")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._session_locks: Dict[Hashable, threading.Lock] = {}
+        self._session_locks_lock = threading.Lock()
+        self.results: queue.Queue = queue.Queue()
+
+    def session_lock(self, session: Hashable) -> threading.Lock:
+        """
+        Return the lock that serialises everything done to one session.
+        The UI thread should hold it too when it changes the session's state directly.
+        """
+        with self._session_locks_lock:
+            if session not in self._session_locks:
+                self._session_locks[session] = threading.Lock()
+            return self._session_locks[session]
+
+    def submit(self, session: Hashable, task: Callable, *args) -> bool:
+        """
+        Queue a round for a session.
+        Returns False without queueing anything if too many rounds are already pending.
+        """
+        if not self._slots.acquire(blocking=False):
+            return False
+        try:
+            self._executor.submit(self._run, session, task, args)
+        except RuntimeError:  # Pool already shut down
+            self._slots.release()
+            return False
+        return True
+
+    def _run(self, session: Hashable, task: Callable, args: tuple):
+        try:
+            with self.session_lock(session):
+                outcome = (task(*args), None)
+        except Exception as e:
+            outcome = (None, e)
+        self.results.put(outcome)
+        self._slots.release()
+
+    def drain(self, handler: Callable, limit: int = 50) -> int:
+        """
+        Hand up to limit finished rounds to handler(result, error) on the calling thread.
+        Returns the number of rounds handled.
+        """
+        handled = 0
+        while handled < limit:
+            try:
+                result, error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            handler(result, error)
+            handled += 1
+        return handled
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)